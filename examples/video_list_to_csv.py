@@ -4,9 +4,9 @@
 import logging
 import os
 import csv
-import time
 import jwplatform
 from jwplatform.client import JWPlatformClient
+from jwplatform.ratelimit import RateLimiter
 
 def make_csv(secret, site_id, path_to_csv=None, result_limit=1000, query_params=None):
     """
@@ -21,54 +21,14 @@ def make_csv(secret, site_id, path_to_csv=None, result_limit=1000, query_params=
     """
 
     path_to_csv = path_to_csv or os.path.join(os.getcwd(), 'video_list.csv')
-    timeout_in_seconds = 2
-    max_retries = 3
-    retries = 0
-    page = 1
-    videos = list()
     if query_params is None:
         query_params = {}
     query_params["page_length"] = result_limit
 
-    jwplatform_client = JWPlatformClient(secret)
+    # Caption lookups are sent for every video, so pace them to stay under the API rate limit.
+    jwplatform_client = JWPlatformClient(secret, rate_limiter=RateLimiter())
     logging.info("Querying for video list.")
 
-    while True:
-        try:
-            query_params["page"] = page
-            response = jwplatform_client.Media.list(site_id=site_id, query_params=query_params)
-        except jwplatform.errors.TooManyRequestsError:
-            logging.error("Encountered rate limiting error. Backing off on request time.")
-            if retries == max_retries:
-                raise
-            timeout_in_seconds *= timeout_in_seconds  # Exponential back off for timeout in seconds. 2->4->8->etc.etc.
-            retries += 1
-            time.sleep(timeout_in_seconds)
-            continue
-        except jwplatform.errors.APIError as e:
-            logging.error("Encountered an error querying for videos list.\n{}".format(e))
-            raise e
-
-        # Reset retry flow-control variables upon a non successful query (AKA not rate limited)
-        retries = 0
-        timeout_in_seconds = 2
-
-        # Add all fetched video objects to our videos list.
-        next_videos = response.json_body["media"]
-        for video in next_videos:
-            csv_video = video["metadata"]
-            csv_video["id"] = video["id"]
-            csv_video['duration'] = video['duration']
-            csv_video['custom_params'] = video['custom_params']
-            captions = get_captions(api_client=jwplatform_client, site_id=site_id, media_id=video["id"])
-            csv_video['has_captions'] = bool(len(captions))
-            csv_video['captions'] = captions
-            videos.append(csv_video)
-        page += 1
-        logging.info("Accumulated {} videos.".format(len(videos)))
-        if len(next_videos) == 0:  # Condition which defines you've reached the end of the library
-            break
-
     # Section for writing video library to csv
     desired_fields = ['id', 'title', 'description', 'tags', 'publish_start_date', 'permalink', 'custom_params', 'duration', 'has_captions', 'captions']
     should_write_header = not os.path.isfile(path_to_csv)
@@ -77,7 +37,24 @@ def make_csv(secret, site_id, path_to_csv=None, result_limit=1000, query_params=
         writer = csv.DictWriter(path_to_csv, fieldnames=desired_fields, extrasaction='ignore')
         if should_write_header:
             writer.writeheader()
-        writer.writerows(videos)
+
+        # Videos are fetched page by page as they are written, so only one page is held in memory at a time.
+        video_count = 0
+        try:
+            for video in jwplatform_client.Media.iter_all(site_id=site_id, query_params=query_params):
+                csv_video = video["metadata"]
+                csv_video["id"] = video["id"]
+                csv_video['duration'] = video['duration']
+                csv_video['custom_params'] = video['custom_params']
+                captions = get_captions(api_client=jwplatform_client, site_id=site_id, media_id=video["id"])
+                csv_video['has_captions'] = bool(len(captions))
+                csv_video['captions'] = captions
+                writer.writerow(csv_video)
+                video_count += 1
+        except jwplatform.errors.APIError as e:
+            logging.error("Encountered an error querying for videos list.\n{}".format(e))
+            raise e
+        logging.info("Wrote {} videos.".format(video_count))
 
 def get_captions(api_client, site_id, media_id):
     captions = []
@@ -87,13 +64,6 @@ def get_captions(api_client, site_id, media_id):
             method='GET',
             path=f'https://api.jwplayer.com/v2/sites/{site_id}/media/{media_id}/text_tracks/'
         )
-    except jwplatform.errors.TooManyRequestsError:
-        logging.error("Encountered rate limiting error. Taking a 60 seconds break.")
-        time.sleep(60)
-        captions_response = api_client.request(
-            method='GET',
-            path=f'https://api.jwplayer.com/v2/sites/{site_id}/media/{media_id}/text_tracks/'
-        )
     except jwplatform.errors.APIError as e:
         logging.error("Encountered an error querying for text tracks list.\n{}".format(e))
         raise e
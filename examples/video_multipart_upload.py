@@ -20,8 +20,10 @@ def run_multipart_upload(site_id, video_file_path):
     media_client_instance = JWPlatformClient(JW_API_SECRET).Media
     upload_parameters = {
         'site_id': site_id,
-        'target_part_size': 5 * 1024 * 1024,
-        'retry_count': 3
+        'retry_count': 3,
+        # The part size and the number of parts uploaded at a time are picked from the file size, so that the part
+        # buffers take at most 256 MB.
+        'memory_budget': 256 * 1024 * 1024
     }
     with open(video_file_path, "rb") as file:
         upload_context = media_client_instance.create_media_and_get_upload_context(file, **upload_parameters)
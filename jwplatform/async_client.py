@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+from collections import deque
+from functools import partial
+from itertools import islice
+
+from neterr import StrictHTTPErrors
+
+from jwplatform.async_connection import AsyncHTTPConnectionPool, DEFAULT_ASYNC_POOL_SIZE
+from jwplatform.bulk import DEFAULT_BULK_WORKERS
+from jwplatform.circuit import circuit_attempt
+from jwplatform.client import JWPlatformClient, _MediaClient
+from jwplatform.connection import DEFAULT_IDLE_TIMEOUT
+from jwplatform.errors import APIError
+from jwplatform.pagination import PageCursor, last_page_number, next_page_query
+from jwplatform.ratelimit import route_for_url
+from jwplatform.response import APIResponse
+from jwplatform.upload import UploadContext, UploadStats
+
+__all__ = (
+    "AsyncJWPlatformClient",
+)
+
+
+class AsyncJWPlatformClient(JWPlatformClient):
+    """Asynchronous JW Platform API client.
+
+    Mirrors JWPlatformClient for use on an asyncio event loop: every request method, including the ones on scoped
+    clients such as `Media` or `Playlist.ManualPlaylist`, returns an awaitable, and `list_pages` returns an
+    asynchronous iterator. Requests are sent over a pool of keep-alive connections shared by all tasks on the loop.
+
+    Args:
+        secret (str): Secret value for your API key
+        host (str, optional): API server host name.
+                              Default is 'api.jwplayer.com'.
+        max_connections (int, optional): Maximum number of requests in flight at once. Default is 100.
+        pool_block (bool, optional): Whether a request waits for a free connection when all of them are in use.
+                                     When False, PoolExhaustedError is raised instead. Default is True.
+        pool_timeout (float, optional): Maximum number of seconds to wait for a free connection.
+                                        Default is to wait forever.
+        idle_timeout (float, optional): Number of seconds after which an idle connection is closed.
+                                        Default is 60.
+        rate_limiter (RateLimiter, optional): Paces the requests of the client without blocking the event loop.
+        retry_policy (RetryPolicy, optional): Decides which failed requests are retried and when. The client waits
+                                              between attempts without blocking the event loop.
+        circuit_breaker (CircuitBreaker, optional): Fails requests fast while the API host or an upload host keeps
+                                                    failing.
+        response_cache (ResponseCache, optional): Serves repeated GET requests from memory. Stale responses are
+                                                  refreshed in tasks on the event loop.
+        conditional_cache (ConditionalCache, optional): Sends GET requests again as conditional requests, and serves
+                                                        304 Not Modified responses from the stored response.
+        json_codec (optional): Encodes request bodies and decodes response bodies.
+        lean_responses (bool, optional): Whether responses keep only the decoded body, the status and the headers.
+
+    Examples:
+        async with AsyncJWPlatformClient('API_SECRET') as jwplatform_client:
+            response = await jwplatform_client.Media.get(site_id='SITE_ID', media_id='MEDIA_ID')
+    """
+
+    def __init__(self, secret=None, host=None, max_connections=DEFAULT_ASYNC_POOL_SIZE, pool_block=True,
+                 pool_timeout=None, idle_timeout=DEFAULT_IDLE_TIMEOUT, rate_limiter=None, retry_policy=None,
+                 circuit_breaker=None, response_cache=None, conditional_cache=None, json_codec=None,
+                 lean_responses=False):
+        super().__init__(secret=secret, host=host, max_connections=max_connections, pool_block=pool_block,
+                         pool_timeout=pool_timeout, idle_timeout=idle_timeout, rate_limiter=rate_limiter,
+                         retry_policy=retry_policy, circuit_breaker=circuit_breaker, response_cache=response_cache,
+                         conditional_cache=conditional_cache, json_codec=json_codec,
+                         lean_responses=lean_responses)
+        self.Media = _AsyncMediaClient(self)
+        self._refreshes = set()
+
+    def _create_pool(self, **kwargs):
+        return AsyncHTTPConnectionPool(**kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def raw_request(self, method, url, body=None, headers=None):
+        """
+        Sends the request without modifying it over a connection checked out of the client's connection pool.
+
+        Either returns an APIResponse or raises an APIError. A 304 Not Modified response to a conditional request is
+        returned rather than raised.
+        """
+        if headers is None:
+            headers = {}
+
+        with circuit_attempt(self._circuit_breaker, self._pool.host, route_for_url(url)) as circuit:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire_async(url)
+            response = await self._pool.request(method, url, body, headers)
+            circuit.record(response.status)
+        if self._rate_limiter is not None:
+            self._rate_limiter.update(url, response.status, response)
+        if 200 <= response.status <= 299 or response.status == 304:
+            return APIResponse(response, codec=self._json_codec, lean=self._lean_responses)
+
+        raise APIError.from_response(response, codec=self._json_codec, lean=self._lean_responses)
+
+    async def close(self):
+        """
+        Closes the idle connections held by the client.
+        """
+        await self._pool.close()
+
+    async def request(self, method, path, body=None, headers=None, query_params=None):
+        """
+        Sends a request using the client's configuration.
+
+        Args:
+            method (str): HTTP request method
+            path (str): Resource or endpoint to request
+            body (dict): Contents of the request body  that will be converted to JSON
+            headers (dict): Any additional HTTP headers
+            query_params (dict): Any additional query parameters to add to the URI
+        """
+        path, body, headers = self._prepare_request(path, body=body, headers=headers, query_params=query_params)
+        return await self._send_request(method, path, body, headers)
+
+    async def _send_request(self, method, url, body, headers, max_attempts=None):
+        raw_request = self.raw_request
+        if self._conditional_cache is not None and method.upper() == "GET":
+            raw_request = self._conditional_request
+        send = partial(self._retry_policy.call_async, method, partial(raw_request, method=method, url=url,
+                                                                      body=body, headers=headers),
+                       max_attempts=max_attempts)
+        cache = self._response_cache
+        if cache is None:
+            return await send()
+        if method.upper() != "GET":
+            try:
+                return await send()
+            finally:
+                cache.invalidate(url)
+        if not cache.is_cacheable(method, url):
+            return await send()
+
+        key = cache.key(method, url, headers)
+        response, refresh = cache.get(key)
+        if response is None:
+            generation = cache.generation
+            response = await send()
+            cache.put(key, response, generation)
+        elif refresh:
+            task = asyncio.ensure_future(self._refresh(key, send, cache.generation))
+            self._refreshes.add(task)
+            task.add_done_callback(self._refreshes.discard)
+        return response
+
+    async def _conditional_request(self, method, url, body=None, headers=None):
+        key, stored, headers = self._conditional_cache.prepare(url, headers)
+        response = await self.raw_request(method=method, url=url, body=body, headers=headers)
+        return self._conditional_cache.resolve(key, stored, response)
+
+    async def _refresh(self, key, send, generation):
+        try:
+            self._response_cache.put(key, await send(), generation)
+        except Exception as ex:
+            self._logger.warning(f"Failed to refresh the cached response to {key[1]}: {ex}")
+            self._response_cache.refresh_failed(key)
+
+    async def request_with_retry(self, method, path, body=None, headers=None, query_params=None,
+                                 retry_attempts=3):
+        """
+        Sends a request using the client's configuration, retrying it with the client's retry policy.
+
+        Args:
+            method (str): HTTP request method
+            path (str): Resource or endpoint to request
+            body (dict): Contents of the request body  that will be converted to JSON
+            headers (dict): Any additional HTTP headers
+            query_params (dict): Any additional query parameters to add to the URI
+            retry_attempts: The number of retry attempts that should be made for the request.
+        """
+        path, body, headers = self._prepare_request(path, body=body, headers=headers, query_params=query_params)
+        try:
+            return await self._send_request(method, path, body, headers, max_attempts=retry_attempts)
+        except StrictHTTPErrors:
+            self._logger.error(f"Exceeded maximum number of retries {retry_attempts}"
+                               f"while connecting to the host.")
+            raise
+
+    def _stream_resources(self, resource_name, method, path, query_params=None):
+        return _AsyncResourcesStream(partial(self.request, method, path, query_params=query_params), resource_name)
+
+    async def _send(self, response_factory, **kwargs):
+        return response_factory(await self.request(**kwargs))
+
+    async def _paginate(self, fetch_page, query_params=None, cursor=None):
+        if cursor is None:
+            cursor = PageCursor(query_params)
+        while True:
+            started = time.monotonic()
+            response = await fetch_page(query_params=cursor.next_query())
+            is_last = cursor.advance(response, time.monotonic() - started)
+            yield response
+            if is_last:
+                return
+
+    async def _prefetch_pages(self, fetch_page, query_params=None, prefetch=1):
+        cursor = PageCursor(query_params)
+        first_page = await fetch_page(query_params=cursor.next_query())
+        yield first_page
+        if cursor.advance(first_page, 0):
+            return
+
+        last_page = last_page_number(first_page)
+        if last_page is None:
+            async for response in self._paginate(fetch_page, cursor=cursor):
+                yield response
+            return
+
+        pages = iter(range(cursor.page + 1, last_page + 1))
+        pending = deque()
+        try:
+            for page in islice(pages, prefetch):
+                pending.append(asyncio.ensure_future(fetch_page(query_params=next_page_query(
+                    query_params, page, cursor.page_length))))
+            while pending:
+                response = await pending.popleft()
+                for page in islice(pages, 1):
+                    pending.append(asyncio.ensure_future(fetch_page(query_params=next_page_query(
+                        query_params, page, cursor.page_length))))
+                yield response
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _iterate_resources(self, fetch_page, query_params=None, page_sizer=None, prefetch=0):
+        if prefetch:
+            async for page in self._prefetch_pages(fetch_page, query_params, prefetch):
+                for resource in page:
+                    yield resource
+            return
+
+        cursor = PageCursor(query_params, page_sizer)
+        async for page in self._paginate(fetch_page, cursor=cursor):
+            for resource in islice(page, cursor.skip, None):
+                yield resource
+
+
+class _AsyncResourcesStream:
+    """
+    A page of a collection returned by `stream` on the scoped clients of AsyncJWPlatformClient, to be used as an
+    asynchronous context manager or iterator. The page is fetched and read in full when it is first entered or
+    iterated, and its resources are then yielded one at a time.
+
+    `json_body` holds the other fields of the page, such as `page` and `total`, once the page has been fetched.
+    """
+
+    def __init__(self, fetch_page, resource_name):
+        self.response = None
+        self.status = None
+        self.headers = None
+        self.json_body = {}
+        self._fetch_page = fetch_page
+        self._resource_name = resource_name
+        self._resources = None
+        self._count = 0
+
+    async def _open(self):
+        if self._resources is not None:
+            return
+        page = await self._fetch_page()
+        self.response = page.response
+        self.status = page.status
+        self.headers = page.headers
+        self.json_body = {key: value for key, value in page.json_body.items() if key != self._resource_name}
+        self._resources = iter(page.json_body[self._resource_name])
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await self._open()
+        for resource in self._resources:
+            self._count += 1
+            return resource
+        raise StopAsyncIteration
+
+    def __len__(self):
+        """
+        Returns the number of resources read so far.
+        """
+        return self._count
+
+    def close(self):
+        self._resources = iter(())
+
+    async def __aenter__(self):
+        await self._open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class _AsyncMediaClient(_MediaClient):
+    """
+    Media client whose upload methods can be awaited. The file transfer itself runs in the loop's default executor.
+    """
+
+    async def create_media_and_get_upload_context(self, file, body=None, query_params=None, **kwargs) -> UploadContext:
+        site_id = kwargs['site_id']
+        upload_plan = self._plan_upload(file, **kwargs)
+        body = self._build_create_payload(body, upload_plan.upload_method)
+
+        resp = await self.create(site_id, body, query_params)
+        return self._upload_context_from_response(resp, upload_plan)
+
+    async def upload(self, file, upload_context: UploadContext, **kwargs) -> UploadStats:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, partial(super().upload, file, upload_context, **kwargs))
+
+    async def bulk_upload(self, site_id, files, max_workers=DEFAULT_BULK_WORKERS, state_path=None, **kwargs):
+        # The bulk upload drives its own worker threads, which use a synchronous client with the same credentials.
+        media_client = JWPlatformClient(secret=self._client._api_secret, host=self._client._pool.host,
+                                        rate_limiter=self._client._rate_limiter,
+                                        retry_policy=self._client._retry_policy,
+                                        circuit_breaker=self._client._circuit_breaker,
+                                        response_cache=self._client._response_cache,
+                                        conditional_cache=self._client._conditional_cache,
+                                        json_codec=self._client._json_codec,
+                                        lean_responses=self._client._lean_responses).Media
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, partial(media_client.bulk_upload, site_id, files,
+                                                        max_workers=max_workers, state_path=state_path, **kwargs))
+
+    async def resume(self, file, upload_context: UploadContext, **kwargs) -> UploadStats:
+        if not upload_context:
+            raise ValueError("The provided context is None. Cannot resume the upload.")
+        if not upload_context.can_resume():
+            upload_context = await self.create_media_and_get_upload_context(file, **kwargs)
+        return await self.upload(file, upload_context, **kwargs)
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import http.client
+import io
+import logging
+import ssl
+import time
+
+from jwplatform.connection import DEFAULT_IDLE_TIMEOUT, PoolExhaustedError
+
+DEFAULT_ASYNC_POOL_SIZE = 100
+
+_NO_BODY_STATUSES = (204, 304)
+
+
+class AsyncHTTPResponse:
+    """
+    A fully read HTTP response that mirrors the parts of http.client.HTTPResponse used by APIResponse.
+    """
+
+    def __init__(self, status, reason, headers, body):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self._body = io.BytesIO(body)
+
+    def read(self, amt=None):
+        return self._body.read(amt)
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+    def isclosed(self):
+        return True
+
+
+class _AsyncConnection:
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    def close(self):
+        self.writer.close()
+
+    async def request(self, method, url, body, headers):
+        lines = [f"{method} {url} HTTP/1.1"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if body:
+            self.writer.write(body)
+        await self.writer.drain()
+        return await self._read_response(method)
+
+    async def _read_response(self, method):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise http.client.RemoteDisconnected("Remote end closed connection without response")
+        version, status, reason = (status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""])[:3]
+        status = int(status)
+
+        raw_headers = b""
+        while True:
+            line = await self.reader.readline()
+            raw_headers += line
+            if line in (b"\r\n", b"\n", b""):
+                break
+        headers = http.client.parse_headers(io.BytesIO(raw_headers))
+
+        keep_alive = version == "HTTP/1.1" and headers.get("Connection", "").lower() != "close"
+        if method == "HEAD" or status in _NO_BODY_STATUSES or 100 <= status < 200:
+            body = b""
+        elif headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = await self._read_chunked()
+        elif headers.get("Content-Length") is not None:
+            body = await self.reader.readexactly(int(headers["Content-Length"]))
+        else:
+            body = await self.reader.read()
+            keep_alive = False
+
+        return AsyncHTTPResponse(status, reason, headers, body), keep_alive
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size_line = await self.reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                # Skip the trailer section
+                while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+
+class AsyncHTTPConnectionPool:
+    """
+    A pool of keep-alive connections to a single host for use on an asyncio event loop.
+
+    Takes the same arguments as jwplatform.connection.HTTPConnectionPool. `maxsize` bounds the number of requests in
+    flight at once; any further request waits for a connection to be released.
+    """
+
+    def __init__(self, host, port=None, secure=True, maxsize=DEFAULT_ASYNC_POOL_SIZE, block=True, timeout=None,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, connection_timeout=None):
+        if maxsize < 1:
+            raise ValueError("The pool size has to be at least 1.")
+
+        self.host = host
+        self.port = port or (443 if secure else 80)
+        self.secure = secure
+        self.maxsize = maxsize
+        self.block = block
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.connection_timeout = connection_timeout
+
+        self._idle = []
+        self._semaphore = None
+        self._ssl_context = None
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def _host_header(self):
+        if self.port == (443 if self.secure else 80):
+            return self.host
+        return f"{self.host}:{self.port}"
+
+    async def _new_connection(self):
+        ssl_context = None
+        if self.secure:
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=ssl_context),
+            self.connection_timeout
+        )
+        return _AsyncConnection(reader, writer)
+
+    def _get_idle_connection(self):
+        expired_before = None if self.idle_timeout is None else time.monotonic() - self.idle_timeout
+        while self._idle:
+            connection = self._idle.pop()
+            if (expired_before is not None and connection.last_used < expired_before) \
+                    or connection.reader.at_eof():
+                connection.close()
+                continue
+            return connection
+        return None
+
+    async def _acquire(self):
+        # The semaphore is created lazily so that it binds to the running event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.maxsize)
+        if not self.block and self._semaphore.locked():
+            raise PoolExhaustedError(f"All {self.maxsize} connections to {self.host} are in use.")
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise PoolExhaustedError(f"Timed out waiting for a connection to {self.host}.") from None
+
+    async def request(self, method, url, body=None, headers=None):
+        """
+        Sends a request over a pooled connection.
+
+        A reused connection that turns out to have been closed by the server is replaced by a new connection and the
+        request is sent again.
+
+        Returns: An AsyncHTTPResponse whose body has been read in full.
+        """
+        headers = dict(headers or {})
+        headers.setdefault("Host", self._host_header)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if body is not None or method in ("POST", "PUT", "PATCH"):
+            headers.setdefault("Content-Length", str(len(body or b"")))
+
+        await self._acquire()
+        try:
+            while True:
+                connection = self._get_idle_connection()
+                reused = connection is not None
+                if connection is None:
+                    connection = await self._new_connection()
+                try:
+                    response, keep_alive = await connection.request(method, url, body, headers)
+                except (http.client.RemoteDisconnected, asyncio.IncompleteReadError, ConnectionError) as err:
+                    connection.close()
+                    if not reused:
+                        raise
+                    self._logger.debug(f"Reconnecting to {self.host} after a stale pooled connection: {err}")
+                    continue
+                except BaseException:
+                    connection.close()
+                    raise
+
+                if keep_alive:
+                    connection.last_used = time.monotonic()
+                    self._idle.append(connection)
+                else:
+                    connection.close()
+                return response
+        finally:
+            self._semaphore.release()
+
+    async def close(self):
+        """
+        Closes all idle connections.
+        """
+        while self._idle:
+            self._idle.pop().close()
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+
+from jwplatform.upload import UploadContext, UploadStats
+
+DEFAULT_BULK_WORKERS = 4
+
+_logger = logging.getLogger(__name__)
+
+
+class BulkUploadStatus:
+    """
+    The states of a file in a bulk upload.
+    """
+    uploading = "uploading"
+    completed = "completed"
+    failed = "failed"
+
+
+@dataclass
+class BulkUploadResult:
+    """
+    The outcome of the upload of one file of a bulk upload.
+
+    `skipped` is True for files that had already been uploaded by an earlier run with the same state file. `stats`
+    holds the UploadStats of the files uploaded by this run.
+    """
+    path: str
+    status: str
+    media_id: str = None
+    error: str = None
+    skipped: bool = False
+    stats: UploadStats = None
+
+
+class BulkUploadState:
+    """
+    A file that records the progress of every file of a bulk upload, so that a later run skips the files that were
+    uploaded and resumes or retries the others.
+
+    Every update is appended to the file as a JSON line, and the last line written for a file wins.
+
+    Args:
+        path (str): Path of the state file. It is created if it does not exist.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._files = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as state_file:
+                lines = state_file.readlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # The last line may have been cut short when the process died while writing it.
+                break
+            self._files[record["path"]] = record
+
+    def get(self, path):
+        """
+        Returns the last record of the given file, or None if the file was never started.
+        """
+        with self._lock:
+            return self._files.get(path)
+
+    def update(self, path, status, upload_context=None, error=None):
+        """
+        Records the status of a file.
+        """
+        record = {
+            "path": path,
+            "status": status,
+            "upload_context": upload_context.to_dict() if upload_context is not None else None,
+            "error": error,
+        }
+        with self._lock:
+            self._files[path] = record
+            with open(self.path, "a") as state_file:
+                state_file.write(json.dumps(record) + "\n")
+                state_file.flush()
+                os.fsync(state_file.fileno())
+
+
+def read_bulk_manifest(manifest_path):
+    """
+    Reads the files of a bulk upload from a manifest. Each line of the manifest is either a JSON object with a `path`
+    and an optional `body` that is passed to the media creation, or a plain file path.
+    """
+    with open(manifest_path, "r") as manifest_file:
+        for line in manifest_file:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                yield json.loads(line)
+            else:
+                yield {"path": line}
+
+
+def _normalize_item(item):
+    if isinstance(item, dict):
+        return item["path"], item.get("body")
+    return os.fspath(item), None
+
+
+def _upload_file(media_client, site_id, path, body, state, upload_kwargs):
+    record = state.get(path) if state is not None else None
+    if record is not None and record["status"] == BulkUploadStatus.completed:
+        upload_context = UploadContext.from_dict(record["upload_context"])
+        return BulkUploadResult(path, BulkUploadStatus.completed, media_id=upload_context.media_id, skipped=True)
+
+    upload_context = None
+    try:
+        with open(path, "rb") as file:
+            if record is not None and record["upload_context"] is not None:
+                # Resume the upload of an earlier run, which creates a new media if the upload cannot be resumed.
+                upload_context = UploadContext.from_dict(record["upload_context"])
+            if upload_context is None or not upload_context.can_resume():
+                upload_context = media_client.create_media_and_get_upload_context(file, body=body, site_id=site_id,
+                                                                                  **upload_kwargs)
+                if state is not None:
+                    state.update(path, BulkUploadStatus.uploading, upload_context=upload_context)
+            stats = media_client.upload(file, upload_context, site_id=site_id, **upload_kwargs)
+    except Exception as ex:
+        _logger.warning(f"Failed to upload {path}: {ex}")
+        if state is not None:
+            state.update(path, BulkUploadStatus.failed, upload_context=upload_context, error=str(ex))
+        return BulkUploadResult(path, BulkUploadStatus.failed,
+                                media_id=upload_context.media_id if upload_context is not None else None,
+                                error=str(ex))
+
+    if state is not None:
+        state.update(path, BulkUploadStatus.completed, upload_context=upload_context)
+    return BulkUploadResult(path, BulkUploadStatus.completed, media_id=upload_context.media_id, stats=stats)
+
+
+def bulk_upload(media_client, site_id, files, max_workers=DEFAULT_BULK_WORKERS, state_path=None, **upload_kwargs):
+    """
+    Creates a media for each file and uploads it, several files at a time.
+
+    Files are handed to the workers as they free up, so that only about `max_workers` files are in progress at once
+    however many are given. A failed file does not stop the others. With a state file, a later run skips the files
+    that were uploaded, resumes multi-part uploads where possible and retries the files that failed.
+
+    Args:
+        media_client: The media client of a JWPlatformClient.
+        site_id (str): The site to create the media in.
+        files: An iterable of file paths or of dictionaries with a `path` and an optional `body` for the media
+               creation, or the path of a manifest as read by read_bulk_manifest().
+        max_workers (int, optional): Number of files uploaded at the same time. Default is 4.
+        state_path (str, optional): Path of the state file that makes the bulk upload resumable.
+        **upload_kwargs: The upload parameters passed to every upload. `part_workers` sets the number of parts each
+                         multi-part upload sends at a time. Default is 1.
+
+    Returns: A list of BulkUploadResult, in the order of the files.
+    """
+    if isinstance(files, (str, os.PathLike)):
+        files = read_bulk_manifest(files)
+    state = BulkUploadState(state_path) if state_path else None
+    upload_kwargs['max_workers'] = upload_kwargs.pop('part_workers', 1)
+
+    items = enumerate(files)
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        def submit(index, item):
+            path, body = _normalize_item(item)
+            future = executor.submit(_upload_file, media_client, site_id, path, body, state, upload_kwargs)
+            pending[future] = index
+
+        pending = {}
+        for index, item in islice(items, 2 * max_workers):
+            submit(index, item)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+            for index, item in islice(items, len(done)):
+                submit(index, item)
+    return [results[index] for index in sorted(results)]
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+DEFAULT_CACHE_ENTRIES = 1024
+DEFAULT_CACHE_TTL = 60.0
+
+_logger = logging.getLogger(__name__)
+
+
+def resource_for_path(path):
+    """
+    Returns the resource type of an API path, such as `media` for /v2/sites/{site_id}/media/{media_id}/ or `sites`
+    for /v2/sites/{site_id}/.
+    """
+    segments = [segment for segment in urlparse(path).path.split("/") if segment]
+    if segments and segments[0] == "v2":
+        segments = segments[1:]
+    if len(segments) > 2 and segments[0] == "sites":
+        return segments[2]
+    return segments[0] if segments else ""
+
+
+def _resource_path(url):
+    path = urlparse(url).path
+    return path if path.endswith("/") else path + "/"
+
+
+def _is_success(response):
+    return 200 <= response.status <= 299
+
+
+class _CacheEntry:
+
+    def __init__(self, response, path, expires, stale_until):
+        self.response = response
+        self.path = path
+        self.expires = expires
+        self.stale_until = stale_until
+        self.refreshing = False
+
+
+class ResponseCache:
+    """
+    An in-memory cache of the responses to GET requests, keyed by method, path, query and credentials.
+
+    Entries are evicted in least recently used order once the cache holds `max_entries` responses. A response is
+    served from the cache for its time to live, which is `ttl` or the value of `ttls` for its resource type, such as
+    `media` or `players`. For `stale_ttl` more seconds, the stale response is still served while it is refreshed in
+    the background. A client that creates, updates or deletes a resource drops the cached responses of that resource
+    and of its collection.
+
+    Cached responses are shared by every caller that requests them, and must not be modified.
+
+    Args:
+        max_entries (int, optional): Maximum number of cached responses. Default is 1024.
+        ttl (float, optional): Number of seconds a response is served from the cache. Default is 60.
+        ttls (dict, optional): Number of seconds by resource type, overriding `ttl`. 0 disables the cache for a
+                               resource type.
+        stale_ttl (float, optional): Number of seconds an expired response is still served while it is refreshed.
+                                     Default is 0.
+
+    Examples:
+        response_cache = ResponseCache(ttls={'players': 300, 'media': 30}, stale_ttl=60)
+        jwplatform_client = JWPlatformClient('API_SECRET', response_cache=response_cache)
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_ENTRIES, ttl=DEFAULT_CACHE_TTL, ttls=None, stale_ttl=0.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(method, url, headers):
+        return method.upper(), url, headers.get("Authorization")
+
+    def _ttl(self, url):
+        return self.ttls.get(resource_for_path(url), self.ttl)
+
+    def is_cacheable(self, method, url):
+        return method.upper() == "GET" and self._ttl(url) > 0
+
+    def get(self, key):
+        """
+        Looks up a response.
+
+        Returns: A tuple of the cached response, or None, and whether the caller should refresh it. Only one caller
+        is asked to refresh a stale response.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            if now < entry.expires:
+                self._entries.move_to_end(key)
+                return entry.response, False
+            if now < entry.stale_until:
+                self._entries.move_to_end(key)
+                refresh = not entry.refreshing
+                entry.refreshing = True
+                return entry.response, refresh
+            del self._entries[key]
+            return None, False
+
+    @property
+    def generation(self):
+        """
+        A number that changes whenever responses are invalidated.
+        """
+        return self._generation
+
+    def put(self, key, response, generation=None):
+        """
+        Caches the response to a request, unless it is not a 2xx response, such as a 304 Not Modified response to
+        validators the caller sent. With the `generation` read before the request was sent, the response is not cached
+        if responses were invalidated in the meantime, since it may predate the change.
+        """
+        url = key[1]
+        ttl = self._ttl(url)
+        now = time.monotonic()
+        with self._lock:
+            if not _is_success(response) or generation is not None and generation != self._generation:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+                return
+            self._entries[key] = _CacheEntry(response, _resource_path(url), now + ttl, now + ttl + self.stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh_failed(self, key):
+        """
+        Lets a later caller retry the refresh of a stale response.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refreshing = False
+
+    def invalidate(self, url):
+        """
+        Drops the cached responses of the resource at the given URL, of the resources below it and of the collection
+        it belongs to.
+        """
+        path = _resource_path(url)
+        collection = path[:path.rstrip("/").rfind("/") + 1]
+        with self._lock:
+            self._generation += 1
+            for key in [key for key, entry in self._entries.items()
+                        if entry.path.startswith(path) or entry.path == collection]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def fetch(self, method, url, headers, send):
+        """
+        Returns the cached response to a request, or sends it with `send` and caches the response. A stale response
+        is returned right away and refreshed on a background thread.
+        """
+        if not self.is_cacheable(method, url):
+            return send()
+        key = self.key(method, url, headers)
+        response, refresh = self.get(key)
+        if response is None:
+            generation = self._generation
+            response = send()
+            self.put(key, response, generation)
+        elif refresh:
+            self._refresh_executor().submit(self._refresh, key, send, self._generation)
+        return response
+
+    def _refresh(self, key, send, generation):
+        try:
+            self.put(key, send(), generation)
+        except Exception as ex:
+            _logger.warning(f"Failed to refresh the cached response to {key[1]}: {ex}")
+            self.refresh_failed(key)
+
+    def _refresh_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jwplatform-cache")
+            return self._executor
+
+
+class ConditionalCache:
+    """
+    Keeps the last response to GET requests that carried an ETag or a Last-Modified header, so that the requests are
+    sent again as conditional requests with If-None-Match or If-Modified-Since. A 304 Not Modified response is then
+    replaced by the stored response, without the body being sent again.
+
+    Entries are evicted in least recently used order once the cache holds `max_entries` responses. Stored responses
+    are shared by every caller that requests them, and must not be modified.
+
+    Args:
+        max_entries (int, optional): Maximum number of stored responses. Default is 1024.
+
+    Examples:
+        jwplatform_client = JWPlatformClient('API_SECRET', conditional_cache=ConditionalCache())
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def prepare(self, url, headers):
+        """
+        Adds the validators of the stored response, if any, to the headers of a GET request.
+
+        Returns: A tuple of the key of the request, the stored response or None, and the headers to send.
+        """
+        key = url, headers.get("Authorization")
+        with self._lock:
+            stored = self._entries.get(key)
+        if stored is None:
+            return key, None, headers
+        headers = dict(headers)
+        etag = stored.getheader("ETag")
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        last_modified = stored.getheader("Last-Modified")
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+        return key, stored, headers
+
+    def resolve(self, key, stored, response):
+        """
+        Returns the stored response if the given one is a 304 Not Modified response to its validators, or stores and
+        returns the given one if it is a 2xx response that carries validators. A 304 Not Modified response to
+        validators the caller sent is returned as it is.
+        """
+        with self._lock:
+            if response.status == 304 and stored is not None:
+                self._entries[key] = stored
+                self._entries.move_to_end(key)
+                return stored
+            if not _is_success(response):
+                return response
+            if response.getheader("ETag") is None and response.getheader("Last-Modified") is None:
+                self._entries.pop(key, None)
+                return response
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return response
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+
+from neterr import StrictHTTPErrors
+
+ROUTE_STORAGE = "storage"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RECOVERY_TIMEOUT = 30.0
+FAILURE_STATUSES = frozenset((500, 502, 503, 504))
+
+_logger = logging.getLogger(__name__)
+
+
+class CircuitState:
+    """
+    The states of a circuit.
+    """
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    This class is used when a request is not sent because the circuit of its host and route is open.
+    """
+
+    def __init__(self, host, route, retry_after):
+        super().__init__(f"The circuit for {route} requests to {host} is open. Retry in {retry_after:.1f}s.")
+        self.host = host
+        self.route = route
+        self.retry_after = retry_after
+
+
+class _Circuit:
+    """
+    The state of the requests to one host and route.
+    """
+
+    def __init__(self, host, route, failure_threshold, recovery_timeout, half_open_max_calls):
+        self.host = host
+        self.route = route
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CircuitState.closed
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Raises CircuitOpenError unless a request may be sent.
+        """
+        with self._lock:
+            if self.state == CircuitState.open:
+                retry_after = self._opened_at + self.recovery_timeout - time.monotonic()
+                if retry_after > 0:
+                    raise CircuitOpenError(self.host, self.route, retry_after)
+                _logger.info(f"Probing {self.route} requests to {self.host}.")
+                self.state = CircuitState.half_open
+                self._probes = 0
+            if self.state == CircuitState.half_open:
+                if self._probes >= self.half_open_max_calls:
+                    raise CircuitOpenError(self.host, self.route, 0)
+                self._probes += 1
+
+    def release(self, success):
+        """
+        Records the outcome of a request. `success` is None when the request failed for a reason unrelated to the
+        health of the host, which gives back a half-open probe without changing the state.
+        """
+        with self._lock:
+            if self.state == CircuitState.half_open:
+                self._probes -= 1
+            if success is None:
+                return
+            if success:
+                if self.state != CircuitState.closed:
+                    _logger.info(f"Closing the circuit for {self.route} requests to {self.host}.")
+                self.state = CircuitState.closed
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == CircuitState.open:
+                # A request sent before the circuit opened does not extend the open period.
+                return
+            if self.state == CircuitState.half_open or self.failures >= self.failure_threshold:
+                _logger.warning(f"Opening the circuit for {self.route} requests to {self.host} after "
+                                f"{self.failures} failures.")
+                self.state = CircuitState.open
+                self._opened_at = time.monotonic()
+
+
+class _CircuitAttempt:
+    """
+    Context manager around one request. The response status is reported with record().
+    """
+
+    def __init__(self, circuit, failure_statuses):
+        self._circuit = circuit
+        self._failure_statuses = failure_statuses
+        self._recorded = False
+
+    def __enter__(self):
+        self._circuit.acquire()
+        return self
+
+    def record(self, status):
+        self._recorded = True
+        self._circuit.release(status not in self._failure_statuses)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self._recorded:
+            self._circuit.release(False if isinstance(exc_value, StrictHTTPErrors) else None)
+        return False
+
+
+class _NoCircuit:
+    """
+    Stands in for a _CircuitAttempt when there is no circuit breaker.
+    """
+
+    def __enter__(self):
+        return self
+
+    def record(self, status):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NO_CIRCUIT = _NoCircuit()
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a host and route that keep failing, so that callers fail fast with a CircuitOpenError
+    instead of waiting on timeouts.
+
+    Each host and route has its own circuit. A circuit opens after `failure_threshold` consecutive requests failed
+    with a connection error or a status in `failure_statuses`. After `recovery_timeout` seconds, up to
+    `half_open_max_calls` probe requests are let through: the circuit closes if they succeed and opens again if they
+    fail.
+
+    A circuit breaker can be shared by any number of clients and threads.
+
+    Args:
+        failure_threshold (int, optional): Number of consecutive failures that open a circuit. Default is 5.
+        recovery_timeout (float, optional): Number of seconds a circuit stays open before probing. Default is 30.
+        half_open_max_calls (int, optional): Number of probe requests sent at the same time. Default is 1.
+        failure_statuses (iterable, optional): Response statuses that count as failures. Default is 500, 502, 503
+                                               and 504.
+
+    Examples:
+        jwplatform_client = JWPlatformClient('API_SECRET', circuit_breaker=CircuitBreaker(recovery_timeout=10))
+    """
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, recovery_timeout=DEFAULT_RECOVERY_TIMEOUT,
+                 half_open_max_calls=1, failure_statuses=FAILURE_STATUSES):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_statuses = frozenset(failure_statuses)
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, host, route):
+        key = (host, route)
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                circuit = _Circuit(host, route, self.failure_threshold, self.recovery_timeout,
+                                   self.half_open_max_calls)
+                self._circuits[key] = circuit
+            return circuit
+
+    def state(self, host, route):
+        """
+        Returns: The CircuitState of the given host and route.
+        """
+        return self._circuit(host, route).state
+
+    def attempt(self, host, route):
+        """
+        Returns a context manager around a request to the given host and route. Entering it raises CircuitOpenError
+        if the circuit is open. The response status is reported with its record() method, and connection errors
+        raised inside it are counted as failures.
+        """
+        return _CircuitAttempt(self._circuit(host, route), self.failure_statuses)
+
+
+def circuit_attempt(circuit_breaker, host, route):
+    """
+    Returns CircuitBreaker.attempt(), or a context manager that does nothing if there is no circuit breaker.
+    """
+    if circuit_breaker is None:
+        return _NO_CIRCUIT
+    return circuit_breaker.attempt(host, route)
@@ -1,20 +1,32 @@
 # -*- coding: utf-8 -*-
-import http.client
+import copy
 import logging
-import json
 import os
+import time
 import urllib.parse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from neterr import StrictHTTPErrors
 
 from jwplatform.version import __version__
+from jwplatform.connection import HTTPConnectionPool, DEFAULT_POOL_SIZE, DEFAULT_IDLE_TIMEOUT
+from jwplatform.bulk import bulk_upload, DEFAULT_BULK_WORKERS
+from jwplatform.circuit import circuit_attempt
+from jwplatform.codec import default_codec
 from jwplatform.errors import APIError
-from jwplatform.response import APIResponse, ResourceResponse, ResourcesResponse
+from jwplatform.pagination import AdaptivePageSizer, PageCursor, last_page_number, next_page_query
+from jwplatform.ratelimit import route_for_url
+from jwplatform.response import APIResponse, ResourceResponse, ResourcesResponse, StreamingResourcesResponse
+from jwplatform.retry import RetryPolicy
 from jwplatform.upload import MultipartUpload, SingleUpload, UploadType, MIN_PART_SIZE, MaxRetriesExceededError, \
-    UploadContext, MAX_FILE_SIZE
+    UploadContext, UploadJournal, UploadPlan, UploadStats, PartHashManifest, plan_upload
 
 JWPLATFORM_API_HOST = 'api.jwplayer.com'
 JWPLATFORM_API_PORT = 443
 USER_AGENT = f"jwplatform_client-python/{__version__}"
+ACCEPT_ENCODING = "gzip, deflate"
 UPLOAD_RETRY_ATTEMPTS = 3
 
 __all__ = (
@@ -32,19 +44,56 @@ class JWPlatformClient:
         secret (str): Secret value for your API key
         host (str, optional): API server host name.
                               Default is 'api.jwplayer.com'.
+        max_connections (int, optional): Maximum number of connections kept open to the API host.
+                                         Default is 10.
+        pool_block (bool, optional): Whether a request waits for a free connection when all of them are in use.
+                                     When False, PoolExhaustedError is raised instead. Default is True.
+        pool_timeout (float, optional): Maximum number of seconds to wait for a free connection.
+                                        Default is to wait forever.
+        idle_timeout (float, optional): Number of seconds after which an idle connection is closed.
+                                        Default is 60.
+        rate_limiter (RateLimiter, optional): Paces the requests of the client. It can be shared between clients.
+                                              Default is to send requests without pacing.
+        retry_policy (RetryPolicy, optional): Decides which failed requests are retried and when.
+                                              Default retries idempotent requests up to 3 times.
+        circuit_breaker (CircuitBreaker, optional): Fails requests fast while the API host or an upload host keeps
+                                                    failing. It can be shared between clients.
+                                                    Default is to always send requests.
+        response_cache (ResponseCache, optional): Serves repeated GET requests from memory. Default is to send
+                                                  every request.
+        conditional_cache (ConditionalCache, optional): Sends GET requests again as conditional requests, and serves
+                                                        304 Not Modified responses from the stored response.
+        json_codec (optional): Encodes request bodies and decodes response bodies. Default is an OrjsonCodec if
+                               orjson is installed, or a JSONCodec otherwise.
+        lean_responses (bool, optional): Whether responses decode their body right away and then drop the raw body
+                                         and the http.client response, keeping only the decoded body, the status and
+                                         the headers. Default is False.
 
     Examples:
         jwplatform_client = jwplatform.client.Client('API_KEY')
     """
 
-    def __init__(self, secret=None, host=None):
+    def __init__(self, secret=None, host=None, max_connections=DEFAULT_POOL_SIZE, pool_block=True, pool_timeout=None,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, rate_limiter=None, retry_policy=None, circuit_breaker=None,
+                 response_cache=None, conditional_cache=None, json_codec=None, lean_responses=False):
         if host is None:
             host = JWPLATFORM_API_HOST
 
         self._api_secret = secret
-        self._connection = http.client.HTTPSConnection(
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._circuit_breaker = circuit_breaker
+        self._response_cache = response_cache
+        self._conditional_cache = conditional_cache
+        self._json_codec = json_codec if json_codec is not None else default_codec()
+        self._lean_responses = lean_responses
+        self._pool = self._create_pool(
             host=host,
-            port=JWPLATFORM_API_PORT
+            port=JWPLATFORM_API_PORT,
+            maxsize=max_connections,
+            block=pool_block,
+            timeout=pool_timeout,
+            idle_timeout=idle_timeout
         )
 
         self._logger = logging.getLogger(self.__class__.__name__)
@@ -62,22 +111,37 @@ class JWPlatformClient:
         self.Site = _SiteClient(self)
         self.Thumbnail = _ThumbnailClient(self)
 
+    def _create_pool(self, **kwargs):
+        return HTTPConnectionPool(**kwargs)
+
     def raw_request(self, method, url, body=None, headers=None):
         """
         Exposes http.client.HTTPSConnection.request without modifying the request.
+        The request is sent over a connection checked out of the client's connection pool.
 
-        Either returns an APIResponse or raises an APIError.
+        Either returns an APIResponse or raises an APIError. A 304 Not Modified response to a conditional request is
+        returned rather than raised.
         """
         if headers is None:
             headers = {}
 
-        self._connection.request(method, url, body, headers)
-        response = self._connection.getresponse()
+        with circuit_attempt(self._circuit_breaker, self._pool.host, route_for_url(url)) as circuit:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(url)
+            with self._pool.request(method, url, body, headers) as response:
+                circuit.record(response.status)
+                if self._rate_limiter is not None:
+                    self._rate_limiter.update(url, response.status, response)
+                if 200 <= response.status <= 299 or response.status == 304:
+                    return APIResponse(response, codec=self._json_codec, lean=self._lean_responses)
 
-        if 200 <= response.status <= 299:
-            return APIResponse(response)
+                raise APIError.from_response(response, codec=self._json_codec, lean=self._lean_responses)
 
-        raise APIError.from_response(response)
+    def close(self):
+        """
+        Closes the idle connections held by the client.
+        """
+        self._pool.close()
 
     def request(self, method, path, body=None, headers=None, query_params=None):
         """
@@ -90,6 +154,42 @@ class JWPlatformClient:
             headers (dict): Any additional HTTP headers
             query_params (dict): Any additional query parameters to add to the URI
         """
+        path, body, headers = self._prepare_request(path, body=body, headers=headers, query_params=query_params)
+        return self._send_request(method, path, body, headers)
+
+    def _send_request(self, method, url, body, headers, max_attempts=None):
+        """
+        Sends a prepared request with the client's retry policy, going through the response cache if any.
+        """
+        raw_request = self.raw_request
+        if self._conditional_cache is not None and method.upper() == "GET":
+            raw_request = self._conditional_request
+        send = partial(self._retry_policy.call, method, partial(raw_request, method=method, url=url, body=body,
+                                                                headers=headers), max_attempts=max_attempts)
+        if self._response_cache is None:
+            return send()
+        if method.upper() == "GET":
+            return self._response_cache.fetch(method, url, headers, send)
+        try:
+            return send()
+        finally:
+            self._response_cache.invalidate(url)
+
+    def _conditional_request(self, method, url, body=None, headers=None):
+        """
+        Sends a GET request with the validators of the last response to it, and returns that response again if the
+        server answers 304 Not Modified.
+        """
+        key, stored, headers = self._conditional_cache.prepare(url, headers)
+        response = self.raw_request(method=method, url=url, body=body, headers=headers)
+        return self._conditional_cache.resolve(key, stored, response)
+
+    def _prepare_request(self, path, body=None, headers=None, query_params=None):
+        """
+        Applies the client's configuration to a request.
+
+        Returns: A tuple of the URL, the encoded body and the headers to send.
+        """
         if headers is None:
             headers = {}
 
@@ -99,18 +199,120 @@ class JWPlatformClient:
             headers["Authorization"] = f"Bearer {self._api_secret}"
         if "Content-Type" not in headers:
             headers["Content-Type"] = "application/json"
+        if "Accept-Encoding" not in headers:
+            headers["Accept-Encoding"] = ACCEPT_ENCODING
 
         if body is not None:
-            body = json.dumps(body)
+            body = self._json_codec.dumps(body)
         if query_params is not None:
             path += "?" + urllib.parse.urlencode(query_params)
 
-        return self.raw_request(method=method, url=path, body=body, headers=headers)
+        return path, body, headers
+
+    def _send(self, response_factory, **kwargs):
+        """
+        Sends a request and converts the APIResponse with the given factory.
+
+        Scoped clients go through this method so that they work unchanged with AsyncJWPlatformClient.
+        """
+        return response_factory(self.request(**kwargs))
+
+    def _stream_resources(self, resource_name, method, path, query_params=None):
+        """
+        Sends a request and returns a StreamingResourcesResponse that parses the resources under `resource_name` as
+        they are read. Only sending the request is retried, since the resources are consumed as they arrive.
+        """
+        path, body, headers = self._prepare_request(path, query_params=query_params)
+        return self._retry_policy.call(method, partial(self._open_stream, method, path, headers, resource_name))
+
+    def _open_stream(self, method, url, headers, resource_name):
+        with circuit_attempt(self._circuit_breaker, self._pool.host, route_for_url(url)) as circuit:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(url)
+            connection, response = self._pool.urlopen(method, url, headers=headers)
+            circuit.record(response.status)
+        if self._rate_limiter is not None:
+            self._rate_limiter.update(url, response.status, response)
+
+        def release():
+            if response.isclosed():
+                self._pool.put(connection)
+            else:
+                self._pool.discard(connection)
+
+        if 200 <= response.status <= 299:
+            return StreamingResourcesResponse(response, resource_name, release=release)
+        try:
+            raise APIError.from_response(response, codec=self._json_codec, lean=self._lean_responses)
+        finally:
+            release()
+
+    def _paginate(self, fetch_page, query_params=None, cursor=None):
+        """
+        Yields the pages returned by fetch_page, starting at the requested page and stopping after the last one.
+        """
+        if cursor is None:
+            cursor = PageCursor(query_params)
+        while True:
+            started = time.monotonic()
+            response = fetch_page(query_params=cursor.next_query())
+            is_last = cursor.advance(response, time.monotonic() - started)
+            yield response
+            if is_last:
+                return
+
+    def _prefetch_pages(self, fetch_page, query_params=None, prefetch=1):
+        """
+        Yields the pages returned by fetch_page in order, while the next `prefetch` pages are fetched in the
+        background. Falls back to fetching one page at a time if the first page does not report a total.
+        """
+        cursor = PageCursor(query_params)
+        first_page = fetch_page(query_params=cursor.next_query())
+        yield first_page
+        if cursor.advance(first_page, 0):
+            return
+
+        last_page = last_page_number(first_page)
+        if last_page is None:
+            yield from self._paginate(fetch_page, cursor=cursor)
+            return
+
+        pages = iter(range(cursor.page + 1, last_page + 1))
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=prefetch)
+        try:
+            for page in islice(pages, prefetch):
+                pending.append(executor.submit(fetch_page, query_params=next_page_query(
+                    query_params, page, cursor.page_length)))
+            while pending:
+                response = pending.popleft().result()
+                for page in islice(pages, 1):
+                    pending.append(executor.submit(fetch_page, query_params=next_page_query(
+                        query_params, page, cursor.page_length)))
+                yield response
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _iterate_resources(self, fetch_page, query_params=None, page_sizer=None, prefetch=0):
+        """
+        Yields the resources of every page returned by fetch_page, one page in memory at a time
+        or `prefetch` more pages when prefetching.
+        """
+        if prefetch:
+            for page in self._prefetch_pages(fetch_page, query_params, prefetch):
+                yield from page
+            return
+
+        cursor = PageCursor(query_params, page_sizer)
+        for page in self._paginate(fetch_page, cursor=cursor):
+            yield from islice(page, cursor.skip, None)
 
     def request_with_retry(self, method, path, body=None, headers=None, query_params=None,
                            retry_attempts=3):
         """
-        Sends a request using the client's configuration.
+        Sends a request using the client's configuration, retrying it with the client's retry policy.
 
         Args:
             method (str): HTTP request method
@@ -120,21 +322,16 @@ class JWPlatformClient:
             query_params (dict): Any additional query parameters to add to the URI
             retry_attempts: The number of retry attempts that should be made for the request.
         """
-        retry_count = 0
-        for _ in range(retry_attempts):
-            try:
-                response = self.request(method, path, body=body, headers=headers, query_params=query_params)
-                return response
-            except StrictHTTPErrors as http_error:
-                self._logger.warning(http_error, exc_info=True)
-                retry_count = retry_count + 1
-                if retry_count >= retry_attempts:
-                    self._logger.error(f"Exceeded maximum number of retries {retry_attempts}"
-                                       f"while connecting to the host.")
-                    raise
+        path, body, headers = self._prepare_request(path, body=body, headers=headers, query_params=query_params)
+        try:
+            return self._send_request(method, path, body, headers, max_attempts=retry_attempts)
+        except StrictHTTPErrors:
+            self._logger.error(f"Exceeded maximum number of retries {retry_attempts}"
+                               f"while connecting to the host.")
+            raise
 
     def query_usage(self, body=None, query_params=None):
-        return self._client.request(
+        return self.request(
             method="PUT",
             path=f"/v2/query_usage/",
             body=body,
@@ -147,6 +344,15 @@ class _ScopedClient:
     def __init__(self, client: JWPlatformClient):
         self._client = client
 
+    def _request_resource(self, **kwargs):
+        return self._client._send(partial(ResourceResponse.from_client, resource_class=self.__class__), **kwargs)
+
+    def _request_resources(self, resource_name, **kwargs):
+        return self._client._send(
+            partial(ResourcesResponse.from_client, resource_name=resource_name, resource_class=self.__class__),
+            **kwargs
+        )
+
 
 class _ResourceClient(_ScopedClient):
     _resource_name = None
@@ -155,42 +361,92 @@ class _ResourceClient(_ScopedClient):
     _singular_path = "/v2/{resource_name}/{resource_id}/"
 
     def list(self, site_id, query_params=None):
-        response = self._client.request(
+        return self._request_resources(
+            self._resource_name,
+            method="GET",
+            path=self._collection_path.format(site_id=site_id, resource_name=self._resource_name),
+            query_params=query_params
+        )
+
+    def stream(self, site_id, query_params=None):
+        """
+        Fetches a page of the collection and yields its resources as they are parsed from the connection, which
+        lowers the time to the first resource and the memory held for large pages. With AsyncJWPlatformClient, the
+        page is read in full and the response is an asynchronous context manager and iterator.
+
+        Args:
+            site_id: The site ID
+            query_params: The query parameters, such as `page` and `page_length`.
+
+        Returns: A StreamingResourcesResponse, to be used as a context manager or iterated to the end.
+        """
+        return self._client._stream_resources(
+            self._resource_name,
             method="GET",
             path=self._collection_path.format(site_id=site_id, resource_name=self._resource_name),
             query_params=query_params
         )
-        return ResourcesResponse.from_client(response, self._resource_name, self.__class__)
+
+    def list_pages(self, site_id, query_params=None, prefetch=0):
+        """
+        Iterates over the pages of the collection, fetching each page when the previous one has been consumed.
+        With AsyncJWPlatformClient this is an asynchronous iterator.
+
+        Args:
+            site_id: The site ID
+            query_params: The query parameters. `page` sets the first page to fetch.
+            prefetch: Number of pages to fetch concurrently ahead of the page being consumed. Pages are still
+                      returned in order. Prefetching starts once the first page reports the total.
+
+        Returns: An iterator of ResourcesResponse pages.
+        """
+        if prefetch:
+            return self._client._prefetch_pages(partial(self.list, site_id), query_params, prefetch)
+        return self._client._paginate(partial(self.list, site_id), query_params)
+
+    def iter_all(self, site_id, query_params=None, adaptive_page_length=True, prefetch=0):
+        """
+        Iterates over every resource of the collection, fetching pages only as they are needed.
+        With AsyncJWPlatformClient this is an asynchronous iterator.
+
+        Args:
+            site_id: The site ID
+            query_params: The query parameters. `page` and `page_length` set where to start.
+            adaptive_page_length: Whether to adjust the page length between pages, up to the API maximum, based
+                                  on the latency and size of the pages fetched so far. Ignored when prefetching.
+            prefetch: Number of pages to fetch concurrently ahead of the page being consumed.
+
+        Returns: An iterator of resources.
+        """
+        page_sizer = AdaptivePageSizer() if adaptive_page_length else None
+        return self._client._iterate_resources(partial(self.list, site_id), query_params, page_sizer, prefetch)
 
     def create(self, site_id, body=None, query_params=None):
-        response = self._client.request(
+        return self._request_resource(
             method="POST",
             path=self._collection_path.format(site_id=site_id, resource_name=self._resource_name),
             body=body,
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def get(self, site_id, query_params=None, **kwargs):
         resource_id = kwargs[self._id_name]
-        response = self._client.request(
+        return self._request_resource(
             method="GET",
             path=self._singular_path.format(site_id=site_id, resource_name=self._resource_name,
                                             resource_id=resource_id),
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def update(self, site_id, body, query_params=None, **kwargs):
         resource_id = kwargs[self._id_name]
-        response = self._client.request(
+        return self._request_resource(
             method="PATCH",
             path=self._singular_path.format(site_id=site_id, resource_name=self._resource_name,
                                             resource_id=resource_id),
             body=body,
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def delete(self, site_id, query_params=None, **kwargs):
         resource_id = kwargs[self._id_name]
@@ -235,20 +491,19 @@ class _ChannelClient(_SiteResourceClient):
 class _ChannelEventClient(_ScopedClient):
 
     def list(self, site_id, channel_id, query_params=None):
-        response = self._client.request(
+        return self._request_resources(
+            "events",
             method="GET",
             path=f"/v2/sites/{site_id}/channels/{channel_id}/events/",
             query_params=query_params
         )
-        return ResourcesResponse.from_client(response, "events", self.__class__)
 
     def get(self, site_id, channel_id, event_id, query_params=None):
-        response = self._client.request(
+        return self._request_resource(
             method="GET",
             path=f"/v2/sites/{site_id}/channels/{channel_id}/events/{event_id}/",
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def request_master(self, site_id, channel_id, event_id, query_params=None):
         return self._client.request(
@@ -269,29 +524,27 @@ class _ChannelEventClient(_ScopedClient):
 class _MediaRenditionClient(_ScopedClient):
 
     def list(self, site_id, media_id, query_params=None):
-        response = self._client.request(
+        return self._request_resources(
+            "media_renditions",
             method="GET",
             path=f"/v2/sites/{site_id}/media/{media_id}/media_renditions/",
             query_params=query_params
         )
-        return ResourcesResponse.from_client(response, "media_renditions", self.__class__)
 
     def create(self, site_id, media_id, body=None, query_params=None):
-        response = self._client.request(
+        return self._request_resource(
             method="POST",
             path=f"/v2/sites/{site_id}/media/{media_id}/media_renditions/",
             body=body,
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def get(self, site_id, media_id, rendition_id, query_params=None):
-        response = self._client.request(
+        return self._request_resource(
             method="GET",
             path=f"/v2/sites/{site_id}/media/{media_id}/media_renditions/{rendition_id}/",
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def delete(self, site_id, media_id, rendition_id, query_params=None):
         return self._client.request(
@@ -304,38 +557,35 @@ class _MediaRenditionClient(_ScopedClient):
 class _OriginalClient(_ScopedClient):
 
     def list(self, site_id, media_id, query_params=None):
-        response = self._client.request(
+        return self._request_resources(
+            "originals",
             method="GET",
             path=f"/v2/sites/{site_id}/media/{media_id}/originals/",
             query_params=query_params
         )
-        return ResourcesResponse.from_client(response, "originals", self.__class__)
 
     def create(self, site_id, media_id, body=None, query_params=None):
-        response = self._client.request(
+        return self._request_resource(
             method="POST",
             path=f"/v2/sites/{site_id}/media/{media_id}/originals/",
             body=body,
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def get(self, site_id, media_id, original_id, query_params=None):
-        response = self._client.request(
+        return self._request_resource(
             method="GET",
             path=f"/v2/sites/{site_id}/media/{media_id}/originals/{original_id}/",
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def update(self, site_id, media_id, original_id, body, query_params=None):
-        response = self._client.request(
+        return self._request_resource(
             method="PATCH",
             path=f"/v2/sites/{site_id}/media/{media_id}/originals/{original_id}/",
             body=body,
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def delete(self, site_id, media_id, original_id, query_params=None):
         return self._client.request(
@@ -348,38 +598,35 @@ class _OriginalClient(_ScopedClient):
 class _TextTrackClient(_ScopedClient):
 
     def list(self, site_id, media_id, query_params=None):
-        response = self._client.request(
+        return self._request_resources(
+            "text_tracks",
             method="GET",
             path=f"/v2/sites/{site_id}/media/{media_id}/text_tracks/",
             query_params=query_params
         )
-        return ResourcesResponse.from_client(response, "text_tracks", self.__class__)
 
     def create(self, site_id, media_id, body=None, query_params=None):
-        response = self._client.request(
+        return self._request_resource(
             method="POST",
             path=f"/v2/sites/{site_id}/media/{media_id}/text_tracks/",
             body=body,
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def get(self, site_id, media_id, track_id, query_params=None):
-        response = self._client.request(
+        return self._request_resource(
             method="GET",
             path=f"/v2/sites/{site_id}/media/{media_id}/text_tracks/{track_id}/",
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def update(self, site_id, media_id, track_id, body, query_params=None):
-        response = self._client.request(
+        return self._request_resource(
             method="PATCH",
             path=f"/v2/sites/{site_id}/media/{media_id}/text_tracks/{track_id}/",
             body=body,
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def delete(self, site_id, media_id, track_id, query_params=None):
         return self._client.request(
@@ -389,22 +636,20 @@ class _TextTrackClient(_ScopedClient):
         )
 
     def publish(self, site_id, media_id, track_id, body=None, query_params=None):
-        response = self._client.request(
+        return self._request_resource(
             method="PUT",
             path=f"/v2/sites/{site_id}/media/{media_id}/text_tracks/{track_id}/publish/",
             body=body,
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def unpublish(self, site_id, media_id, track_id, body=None, query_params=None):
-        response = self._client.request(
+        return self._request_resource(
             method="PUT",
             path=f"/v2/sites/{site_id}/media/{media_id}/text_tracks/{track_id}/unpublish/",
             body=body,
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
 
 CREATE_MEDIA_PAYLOAD = {
@@ -437,13 +682,10 @@ class _MediaClient(_SiteResourceClient):
             query_params=query_params
         )
 
-    def _determine_upload_method(self, file, target_part_size) -> str:
+    def _plan_upload(self, file, target_part_size=None, **kwargs) -> UploadPlan:
         file_size = os.stat(file.name).st_size
-        if file_size > MAX_FILE_SIZE:
-            raise NotImplementedError('File size greater than 25 GB is not supported.')
-        if file_size <= target_part_size:
-            return UploadType.direct.value
-        return UploadType.multipart.value
+        return plan_upload(file_size, target_part_size=target_part_size, max_workers=kwargs.get('max_workers'),
+                           memory_budget=kwargs.get('memory_budget'))
 
     def create_media_and_get_upload_context(self, file, body=None, query_params=None, **kwargs) -> UploadContext:
         """
@@ -460,11 +702,17 @@ class _MediaClient(_SiteResourceClient):
         if not kwargs:
             kwargs = {}
         site_id = kwargs['site_id']
-        # Determine the upload type - Single or multi-part
-        target_part_size = int(kwargs.get('target_part_size', MIN_PART_SIZE))
-        upload_method = self._determine_upload_method(file, target_part_size)
+        # Determine the upload type - Single or multi-part - and the part size
+        upload_plan = self._plan_upload(file, **kwargs)
+        body = self._build_create_payload(body, upload_plan.upload_method)
+
+        # Create the media
+        resp = self.create(site_id, body, query_params)
+        return self._upload_context_from_response(resp, upload_plan)
+
+    def _build_create_payload(self, body, upload_method):
         if not body:
-            body = CREATE_MEDIA_PAYLOAD.copy()
+            body = copy.deepcopy(CREATE_MEDIA_PAYLOAD)
 
         if 'upload' not in body:
             body['upload'] = {}
@@ -473,19 +721,18 @@ class _MediaClient(_SiteResourceClient):
             raise ValueError("Invalid payload structure. The upload element needs to be dictionary.")
 
         body["upload"]["method"] = upload_method
+        return body
 
-        # Create the media
-        resp = self.create(site_id, body, query_params)
-
+    def _upload_context_from_response(self, resp, upload_plan):
         result = resp.json_body
         upload_id = result.get("upload_id")
         upload_token = result.get("upload_token")
         direct_link = result.get("upload_link")
 
-        upload_context = UploadContext(upload_method, upload_id, upload_token, direct_link)
-        return upload_context
+        return UploadContext(upload_plan.upload_method, upload_id, upload_token, direct_link,
+                             part_size=upload_plan.part_size, media_id=result.get("id"))
 
-    def upload(self, file, upload_context: UploadContext, **kwargs) -> None:
+    def upload(self, file, upload_context: UploadContext, **kwargs) -> UploadStats:
         """
         Uploads the media file.
         Args:
@@ -493,17 +740,17 @@ class _MediaClient(_SiteResourceClient):
             upload_context: The query parameters.
             **kwargs: The upload parameters.
 
-        Returns: None
+        Returns: The UploadStats of the upload.
 
         """
         upload_handler = self._get_upload_handler_for_upload_type(upload_context, file, **kwargs)
         try:
-            upload_handler.upload()
+            return upload_handler.upload()
         except Exception:
             file.seek(0, 0)
             raise
 
-    def resume(self, file, upload_context: UploadContext, **kwargs) -> None:
+    def resume(self, file, upload_context: UploadContext, **kwargs) -> UploadStats:
         """
         Resumes the upload of the media file.
         Args:
@@ -511,7 +758,7 @@ class _MediaClient(_SiteResourceClient):
             upload_context: The query parameters.
             **kwargs: The upload parameters.
 
-        Returns: None
+        Returns: The UploadStats of the upload.
         """
         if not upload_context:
             raise ValueError("The provided context is None. Cannot resume the upload.")
@@ -519,35 +766,74 @@ class _MediaClient(_SiteResourceClient):
             upload_context = self.create_media_and_get_upload_context(file, **kwargs)
         upload_handler = self._get_upload_handler_for_upload_type(upload_context, file, **kwargs)
         try:
-            upload_handler.upload()
+            return upload_handler.upload()
         except Exception:
             file.seek(0, 0)
             raise
 
+    def bulk_upload(self, site_id, files, max_workers=DEFAULT_BULK_WORKERS, state_path=None, **kwargs):
+        """
+        Creates a media for each of the given files and uploads it, several files at a time.
+        Args:
+            site_id: The site ID.
+            files: An iterable of file paths or of dictionaries with a `path` and an optional `body` for the media
+                   creation, or the path of a manifest file with one of those per line.
+            max_workers: The number of files uploaded at the same time.
+            state_path: The path of a state file that lets a later run skip the files already uploaded and retry the
+                        ones that failed.
+            **kwargs: The upload parameters.
+
+        Returns: A list of BulkUploadResult, in the order of the files.
+        """
+        return bulk_upload(self, site_id, files, max_workers=max_workers, state_path=state_path, **kwargs)
+
     def _get_upload_handler_for_upload_type(self, context: UploadContext, file, **kwargs):
         upload_method = context.upload_method
         base_url = kwargs.get('base_url', JWPLATFORM_API_HOST)
-        target_part_size = int(kwargs.get('target_part_size', MIN_PART_SIZE))
         retry_count = int(kwargs.get('retry_count', UPLOAD_RETRY_ATTEMPTS))
+        max_in_flight_bytes = kwargs.get('max_in_flight_bytes')
+        journal_path = kwargs.get('journal_path')
+        manifest_path = kwargs.get('manifest_path')
+        scheduler = kwargs.get('scheduler')
+        bandwidth = scheduler.share(kwargs.get('priority', 1)) if scheduler is not None else None
+        progress_callback = kwargs.get('progress_callback')
 
         if upload_method == UploadType.direct.value:
             direct_link = context.direct_link
-            upload_handler = SingleUpload(direct_link, file, retry_count, context)
+            upload_handler = SingleUpload(direct_link, file, retry_count, context, bandwidth=bandwidth,
+                                          progress_callback=progress_callback,
+                                          retry_policy=self._client._retry_policy,
+                                          circuit_breaker=self._client._circuit_breaker)
         else:
             upload_token = context.upload_token
-            upload_client = _UploadClient(api_secret=upload_token, base_url=base_url)
-            upload_handler = MultipartUpload(upload_client, file, target_part_size,
-                                             retry_count, context)
+            upload_client = _UploadClient(api_secret=upload_token, base_url=base_url,
+                                          rate_limiter=self._client._rate_limiter,
+                                          retry_policy=self._client._retry_policy,
+                                          circuit_breaker=self._client._circuit_breaker)
+            # The part size of an upload cannot change once its parts have been created.
+            target_part_size = context.part_size or int(kwargs.get('target_part_size', MIN_PART_SIZE))
+            upload_plan = self._plan_upload(file, target_part_size=target_part_size,
+                                            max_workers=kwargs.get('max_workers'),
+                                            memory_budget=kwargs.get('memory_budget'))
+            upload_handler = MultipartUpload(upload_client, file, upload_plan.part_size,
+                                             retry_count, context, max_workers=upload_plan.max_workers,
+                                             max_in_flight_bytes=max_in_flight_bytes,
+                                             journal=UploadJournal(journal_path) if journal_path else None,
+                                             manifest=PartHashManifest(manifest_path) if manifest_path else None,
+                                             bandwidth=bandwidth, progress_callback=progress_callback,
+                                             retry_policy=self._client._retry_policy,
+                                             circuit_breaker=self._client._circuit_breaker)
         return upload_handler
 
 
 class _UploadClient(_ScopedClient):
     _collection_path = "/v2/uploads/{resource_id}"
 
-    def __init__(self, api_secret, base_url):
+    def __init__(self, api_secret, base_url, rate_limiter=None, retry_policy=None, circuit_breaker=None):
         if base_url is None:
             base_url = JWPLATFORM_API_HOST
-        client = JWPlatformClient(secret=api_secret, host=base_url)
+        client = JWPlatformClient(secret=api_secret, host=base_url, rate_limiter=rate_limiter,
+                                  retry_policy=retry_policy, circuit_breaker=circuit_breaker)
         super().__init__(client)
 
     def list(self, upload_id, query_params=None):
@@ -708,21 +994,19 @@ class _PlaylistClient(_ResourceClient):
 class _SiteProtectionRuleClient(_ScopedClient):
 
     def get(self, site_id, query_params=None):
-        response = self._client.request(
+        return self._request_resource(
             method="GET",
             path=f"/v2/sites/{site_id}/site_protection_rule/",
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
     def update(self, site_id, body, query_params=None, **kwargs):
-        response = self._client.request(
+        return self._request_resource(
             method="PATCH",
             path=f"/v2/sites/{site_id}/site_protection_rule/",
             body=body,
             query_params=query_params
         )
-        return ResourceResponse.from_client(response, self.__class__)
 
 
 class _SiteClient(_ScopedClient):
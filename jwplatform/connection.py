@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+import http.client
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_IDLE_TIMEOUT = 60
+
+# Errors raised by http.client when a kept-alive socket has been closed by the server while it sat idle in the pool.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+
+class HTTPConnectionPool:
+    """
+    A thread-safe pool of keep-alive connections to a single host.
+
+    Args:
+        host (str): Host name to connect to.
+        port (int, optional): Port to connect to. Defaults to the scheme's default port.
+        secure (bool, optional): Whether to use HTTPS. Default is True.
+        maxsize (int, optional): Maximum number of connections that can be open at the same time.
+        block (bool, optional): Whether checking out a connection waits for one to be released when `maxsize`
+                                connections are already in use. When False, PoolExhaustedError is raised instead.
+        timeout (float, optional): Maximum number of seconds a blocking checkout waits. None waits forever.
+        idle_timeout (float, optional): Number of seconds after which an idle connection is closed rather than
+                                        reused. None keeps idle connections forever.
+        connection_timeout (float, optional): Socket timeout passed to each connection.
+        blocksize (int, optional): Size of the blocks in which file-like request bodies are sent.
+    """
+
+    def __init__(self, host, port=None, secure=True, maxsize=DEFAULT_POOL_SIZE, block=True, timeout=None,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, connection_timeout=None, blocksize=None):
+        if maxsize < 1:
+            raise ValueError("The pool size has to be at least 1.")
+
+        self.host = host
+        self.port = port
+        self.secure = secure
+        self.maxsize = maxsize
+        self.block = block
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.connection_timeout = connection_timeout
+        self.blocksize = blocksize
+
+        self._idle = []
+        self._in_use = set()
+        # Connections that were in use when the pool was closed, and are closed when they are returned.
+        self._closed_in_use = set()
+        self._num_connections = 0
+        self._condition = threading.Condition()
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def _new_connection(self):
+        connection_class = http.client.HTTPSConnection if self.secure else http.client.HTTPConnection
+        kwargs = {'host': self.host, 'port': self.port}
+        if self.connection_timeout is not None:
+            kwargs['timeout'] = self.connection_timeout
+        if self.blocksize is not None:
+            kwargs['blocksize'] = self.blocksize
+        return connection_class(**kwargs)
+
+    def _evict_idle_connections(self):
+        if self.idle_timeout is None:
+            return
+        expired_before = time.monotonic() - self.idle_timeout
+        # Idle connections are kept oldest first, so the expired ones are always at the front of the list.
+        while self._idle and self._idle[0][1] < expired_before:
+            connection, _ = self._idle.pop(0)
+            connection.close()
+            self._num_connections -= 1
+
+    def get(self):
+        """
+        Checks out a connection, reusing an idle one when possible.
+
+        Returns: A tuple of the connection and whether it was reused from the pool.
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        with self._condition:
+            while True:
+                self._evict_idle_connections()
+                if self._idle:
+                    connection, _ = self._idle.pop()
+                    self._in_use.add(connection)
+                    return connection, True
+                if self._num_connections < self.maxsize:
+                    self._num_connections += 1
+                    break
+                if not self.block:
+                    raise PoolExhaustedError(f"All {self.maxsize} connections to {self.host} are in use.")
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolExhaustedError(f"Timed out waiting for a connection to {self.host}.")
+                self._condition.wait(remaining)
+
+        try:
+            connection = self._new_connection()
+        except Exception:
+            with self._condition:
+                self._num_connections -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._in_use.add(connection)
+        return connection, False
+
+    def put(self, connection):
+        """
+        Returns a connection to the pool so that it can be reused, or closes it if the pool was closed while it was
+        checked out.
+        """
+        with self._condition:
+            self._in_use.discard(connection)
+            if connection not in self._closed_in_use:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+                return
+        self.discard(connection)
+
+    def discard(self, connection):
+        """
+        Closes a connection that cannot be reused and frees its slot in the pool.
+        """
+        connection.close()
+        with self._condition:
+            self._in_use.discard(connection)
+            self._closed_in_use.discard(connection)
+            self._num_connections -= 1
+            self._condition.notify()
+
+    def close(self):
+        """
+        Closes all idle connections. Connections that are checked out are closed when they are returned.
+        """
+        with self._condition:
+            while self._idle:
+                connection, _ = self._idle.pop()
+                connection.close()
+                self._num_connections -= 1
+            self._closed_in_use.update(self._in_use)
+            self._in_use.clear()
+            self._condition.notify_all()
+
+    def urlopen(self, method, url, body=None, headers=None):
+        """
+        Sends a request over a pooled connection.
+
+        A reused connection that turns out to have been closed by the server is replaced by a new connection and the
+        request is sent again, as long as the body can be replayed.
+
+        Returns: A tuple of the connection and the http.client.HTTPResponse. The caller hands the connection back with
+        put() once the response has been read, or with discard() otherwise.
+        """
+        if headers is None:
+            headers = {}
+
+        while True:
+            connection, reused = self.get()
+            try:
+                connection.request(method, url, body, headers)
+                return connection, connection.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                self.discard(connection)
+                if not reused or hasattr(body, 'read'):
+                    raise
+                self._logger.debug(f"Reconnecting to {self.host} after a stale pooled connection.")
+            except BaseException:
+                self.discard(connection)
+                raise
+
+    @contextmanager
+    def request(self, method, url, body=None, headers=None):
+        """
+        Sends a request over a pooled connection and yields the http.client.HTTPResponse.
+
+        The connection goes back to the pool on exit if the response has been read to the end, and is closed otherwise.
+        """
+        connection, response = self.urlopen(method, url, body=body, headers=headers)
+        try:
+            yield response
+        finally:
+            if response.isclosed():
+                self.put(connection)
+            else:
+                self.discard(connection)
+
+
+class PoolManager:
+    """
+    Keeps one HTTPConnectionPool per scheme, host and port, for requests to URLs on arbitrary hosts.
+
+    Args:
+        **pool_kwargs: Arguments passed to every HTTPConnectionPool that is created.
+    """
+
+    def __init__(self, **pool_kwargs):
+        self._pool_kwargs = pool_kwargs
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def connection_from_url(self, url):
+        """
+        Returns the pool for the host of the given URL, creating it if needed.
+        """
+        url_metadata = urlparse(url)
+        secure = url_metadata.scheme != 'http'
+        key = (secure, url_metadata.hostname, url_metadata.port)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = HTTPConnectionPool(url_metadata.hostname, port=url_metadata.port, secure=secure,
+                                          **self._pool_kwargs)
+                self._pools[key] = pool
+            return pool
+
+    def close(self):
+        """
+        Closes the idle connections of every pool.
+        """
+        with self._lock:
+            for pool in self._pools.values():
+                pool.close()
+
+
+class PoolExhaustedError(Exception):
+    """
+    This class is used to signal that no connection could be checked out of a pool.
+    """
+    pass
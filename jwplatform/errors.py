@@ -8,8 +8,9 @@ class APIError(APIResponse, Exception):
     """
     Class returned when an error happens while JWPlatformClient is used to make an API request.
     """
-    def __init__(self, response):
-        super().__init__(response)
+    def __init__(self, response, codec=None, lean=False):
+        self.reason = getattr(response, "reason", None)
+        super().__init__(response, codec=codec, lean=lean)
         self.errors = None
         if self.json_body is not None and isinstance(self.json_body, dict) and "errors" in self.json_body and isinstance(self.json_body["errors"], list):
             self.errors = self.json_body["errors"]
@@ -21,14 +22,14 @@ class APIError(APIResponse, Exception):
                         self._error_code_map[error["code"]].append(error)
 
     @classmethod
-    def from_response(cls, response):
+    def from_response(cls, response, codec=None, lean=False):
         if response.status in ERROR_MAP:
-            return ERROR_MAP[response.status](response)
+            return ERROR_MAP[response.status](response, codec=codec, lean=lean)
         if response.status >= 400 and response.status <= 499:
-            return ClientError(response)
+            return ClientError(response, codec=codec, lean=lean)
         if response.status >= 500 and response.status <= 599:
-            return ServerError(response)
-        return UnexpectedStatusError(response)
+            return ServerError(response, codec=codec, lean=lean)
+        return UnexpectedStatusError(response, codec=codec, lean=lean)
 
     def has_error_code(self, code):
         if self.errors is None:
@@ -44,7 +45,7 @@ class APIError(APIResponse, Exception):
         msg = "JWPlatform API Error:\n\n"
         # If self.errors is None, construct message from response
         if self.errors is None:
-            msg += f"code: {self.response.status}, description: {self.response.reason}"
+            msg += f"code: {self.status}, description: {self.reason}"
         else:
             for error in self.errors:
                 msg += "{code}: {desc}\n".format(code=error["code"], desc=error["description"])
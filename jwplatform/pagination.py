@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+import math
+
+from jwplatform.upload import MAX_PAGE_SIZE
+
+DEFAULT_PAGE_LENGTH = 10
+TARGET_PAGE_LATENCY = 1.0
+MAX_PAGE_BYTES = 8 * 1024 * 1024
+
+
+def is_last_page(response, page_length=DEFAULT_PAGE_LENGTH):
+    """
+    Determines whether a ResourcesResponse is the last page of its collection.
+
+    Args:
+        response (ResourcesResponse): The page that was just fetched.
+        page_length (int): The page length that was requested, used when the response does not report a total.
+
+    Returns: True if no further page needs to be fetched.
+    """
+    body = response.json_body if isinstance(response.json_body, dict) else {}
+    page = body.get("page")
+    total = body.get("total")
+    page_length = body.get("page_length", page_length)
+    if page is not None and total is not None and page_length:
+        return page * page_length >= total
+    return len(response) < page_length
+
+
+def next_page_query(query_params, page, page_length=None):
+    """
+    Returns a copy of the query parameters that requests the given page.
+    """
+    query_params = dict(query_params) if query_params else {}
+    query_params["page"] = page
+    if page_length is not None:
+        query_params["page_length"] = page_length
+    return query_params
+
+
+def last_page_number(response):
+    """
+    Returns the number of the last page of the collection, or None if the response does not report a total.
+    """
+    body = response.json_body if isinstance(response.json_body, dict) else {}
+    total = body.get("total")
+    page_length = body.get("page_length")
+    if total is None or not page_length:
+        return None
+    return max(1, math.ceil(total / page_length))
+
+
+class AdaptivePageSizer:
+    """
+    Picks the length of the next page from the latency and size of the previous one.
+
+    The page length doubles while pages come back faster than `target_latency` and smaller than `max_page_bytes`,
+    up to `max_page_length`, and halves when a page takes more than twice `target_latency`.
+
+    Args:
+        min_page_length (int): Smallest page length to use.
+        max_page_length (int): Largest page length to use. Default is the API maximum of 1000.
+        target_latency (float): Number of seconds a page is expected to take.
+        max_page_bytes (int): Size of a page body above which the page length stops growing.
+    """
+
+    def __init__(self, min_page_length=DEFAULT_PAGE_LENGTH, max_page_length=MAX_PAGE_SIZE,
+                 target_latency=TARGET_PAGE_LATENCY, max_page_bytes=MAX_PAGE_BYTES):
+        self.min_page_length = min_page_length
+        self.max_page_length = max_page_length
+        self.target_latency = target_latency
+        self.max_page_bytes = max_page_bytes
+
+    def next_page_length(self, page_length, latency, size):
+        """
+        Args:
+            page_length (int): Length of the page that was just fetched.
+            latency (float): Number of seconds it took to fetch it.
+            size (int): Size of its body in bytes.
+
+        Returns: The page length to request next.
+        """
+        if latency > 2 * self.target_latency:
+            return max(self.min_page_length, page_length // 2)
+        if latency < self.target_latency and size * 2 <= self.max_page_bytes:
+            return min(self.max_page_length, page_length * 2)
+        return page_length
+
+
+class PageCursor:
+    """
+    Tracks the position of a walk over the pages of a collection.
+
+    Pages are addressed by number, so after the page length changes the next page may start before the position
+    reached so far. `skip` is the number of resources at the start of that page that were already seen. The page length
+    only grows to a length that starts a page at the position reached so far, so that no resource is fetched twice
+    while it grows.
+
+    Args:
+        query_params (dict): The query parameters of the list call. `page` and `page_length` set where to start.
+        page_sizer (AdaptivePageSizer, optional): Adjusts the page length between pages.
+    """
+
+    def __init__(self, query_params=None, page_sizer=None):
+        self._query_params = dict(query_params) if query_params else {}
+        self.page_length = min(int(self._query_params.get("page_length", DEFAULT_PAGE_LENGTH)), MAX_PAGE_SIZE)
+        self.offset = (int(self._query_params.get("page", 1)) - 1) * self.page_length
+        self.page = None
+        self.skip = 0
+        self._page_sizer = page_sizer
+
+    def next_query(self):
+        """
+        Returns the query parameters of the next page.
+        """
+        self.page = self.offset // self.page_length + 1
+        self.skip = self.offset - (self.page - 1) * self.page_length
+        return next_page_query(self._query_params, self.page, self.page_length)
+
+    def advance(self, response, latency):
+        """
+        Moves past a fetched page.
+
+        Args:
+            response (ResourcesResponse): The page that was just fetched.
+            latency (float): Number of seconds it took to fetch it.
+
+        Returns: True if it was the last page.
+        """
+        if is_last_page(response, self.page_length):
+            return True
+        if isinstance(response.json_body, dict) and response.json_body.get("page_length"):
+            # The API may serve a different page length than requested, such as when it exceeds the maximum.
+            self.page_length = response.json_body["page_length"]
+        self.offset = (self.page - 1) * self.page_length + len(response)
+        if self._page_sizer is not None:
+            page_length = self._page_sizer.next_page_length(self.page_length, latency, len(response.body or b""))
+            self.page_length = self._aligned_page_length(page_length)
+        return False
+
+    def _aligned_page_length(self, page_length):
+        """
+        Lowers a page length larger than the current one to the largest length that divides the offset, or keeps the
+        current page length if there is none. Smaller page lengths are returned as they are.
+        """
+        for length in range(page_length, self.page_length, -1):
+            if self.offset % length == 0:
+                return length
+        return min(page_length, self.page_length)
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+ROUTE_MANAGEMENT = "management"
+ROUTE_ANALYTICS = "analytics"
+ROUTE_UPLOADS = "uploads"
+
+# Header values above this are timestamps rather than a number of seconds.
+_EPOCH_THRESHOLD = 10 ** 9
+
+
+@dataclass
+class RateLimit:
+    """
+    A request budget: `requests` requests per `period` seconds, of which up to `burst` can be sent at once.
+    """
+    requests: int
+    period: float = 60.0
+    burst: int = None
+
+    @property
+    def rate(self):
+        return self.requests / self.period
+
+
+DEFAULT_RATE_LIMITS = {
+    ROUTE_MANAGEMENT: RateLimit(60, 60.0, burst=10),
+    ROUTE_ANALYTICS: RateLimit(10, 60.0, burst=2),
+    ROUTE_UPLOADS: RateLimit(120, 60.0, burst=20),
+}
+
+
+def route_for_url(url):
+    """
+    Returns the route family of an API URL or path: uploads, analytics or management.
+    """
+    path = urlparse(url).path
+    if path.startswith("/v2/uploads"):
+        return ROUTE_UPLOADS
+    if "/analytics/" in path:
+        return ROUTE_ANALYTICS
+    return ROUTE_MANAGEMENT
+
+
+def _parse_seconds(value, now):
+    """
+    Parses a Retry-After or X-RateLimit-Reset header into a number of seconds from now.
+    """
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    if seconds > _EPOCH_THRESHOLD:
+        seconds -= now
+    return max(0.0, seconds)
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that refills at `rate` tokens per second up to `capacity`.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """
+        Takes a token if one is available.
+
+        Returns: 0 if a token was taken, or the number of seconds to wait before trying again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def sync(self, limit=None, remaining=None, pause=None):
+        """
+        Adjusts the bucket to the budget reported by the server.
+
+        Args:
+            limit (int, optional): Number of requests the server allows per window. It becomes the burst size.
+            remaining (int, optional): Number of requests left in the current window. The bucket never holds more.
+            pause (float, optional): Number of seconds during which no request should be sent.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit is not None and limit > 0:
+                self.capacity = limit
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+            if pause:
+                self._tokens = 0
+                self._paused_until = max(self._paused_until, now + pause)
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    A token bucket whose state is kept in a file, so that it is shared by every process that uses the same path.
+
+    The file is locked with fcntl while the bucket is updated, which is only available on POSIX systems.
+    """
+
+    def __init__(self, path, rate, capacity):
+        if fcntl is None:
+            raise RuntimeError("Sharing a rate limit between processes requires fcntl, which is only available on POSIX "
+                               "systems.")
+        super().__init__(rate, capacity)
+        self.path = path
+
+    def _locked_state(self, update):
+        with self._lock, open(self.path, "a+") as state_file:
+            fcntl.flock(state_file, fcntl.LOCK_EX)
+            try:
+                state_file.seek(0)
+                try:
+                    state = json.loads(state_file.read())
+                except ValueError:
+                    state = {"tokens": self.capacity, "updated": time.time(), "paused_until": 0.0}
+                # Wall clock time is used because monotonic clocks are not comparable between processes.
+                now = time.time()
+                self._tokens = state["tokens"]
+                self._updated = state["updated"]
+                self._paused_until = state["paused_until"]
+                result = update(now)
+                state_file.seek(0)
+                state_file.truncate()
+                state_file.write(json.dumps({"tokens": self._tokens, "updated": self._updated,
+                                             "paused_until": self._paused_until}))
+                state_file.flush()
+                return result
+            finally:
+                fcntl.flock(state_file, fcntl.LOCK_UN)
+
+    def reserve(self):
+        def update(now):
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+        return self._locked_state(update)
+
+    def sync(self, limit=None, remaining=None, pause=None):
+        def update(now):
+            self._refill(now)
+            if limit is not None and limit > 0:
+                self.capacity = limit
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+            if pause:
+                self._tokens = 0
+                self._paused_until = max(self._paused_until, now + pause)
+        self._locked_state(update)
+
+
+class RateLimiter:
+    """
+    Paces API requests with one token bucket per route family: management, analytics and uploads.
+
+    Requests wait for a token of their route before being sent, so that bulk jobs stay under the API rate limits
+    instead of running into 429 responses. The buckets follow the X-RateLimit-Limit, X-RateLimit-Remaining and
+    X-RateLimit-Reset headers of the responses, and a 429 response with a Retry-After header pauses its route.
+
+    A rate limiter can be shared by any number of clients and threads. With `shared_dir`, the budgets are kept in
+    files in that directory and are shared with other processes using the same directory.
+
+    Args:
+        limits (dict, optional): RateLimit by route, overriding DEFAULT_RATE_LIMITS.
+        shared_dir (str, optional): Directory in which the budgets are shared between processes.
+
+    Examples:
+        rate_limiter = RateLimiter({'management': RateLimit(120, 60.0)})
+        jwplatform_client = JWPlatformClient('API_SECRET', rate_limiter=rate_limiter)
+    """
+
+    def __init__(self, limits=None, shared_dir=None):
+        limits = dict(DEFAULT_RATE_LIMITS, **(limits or {}))
+        self._buckets = {}
+        for route, limit in limits.items():
+            capacity = limit.burst or limit.requests
+            if shared_dir is not None:
+                self._buckets[route] = FileTokenBucket(os.path.join(shared_dir, f"{route}.ratelimit"), limit.rate,
+                                                       capacity)
+            else:
+                self._buckets[route] = TokenBucket(limit.rate, capacity)
+
+    def _bucket(self, url):
+        return self._buckets.get(route_for_url(url), self._buckets[ROUTE_MANAGEMENT])
+
+    def acquire(self, url):
+        """
+        Waits until a request to the given URL may be sent.
+        """
+        bucket = self._bucket(url)
+        while True:
+            delay = bucket.reserve()
+            if not delay:
+                return
+            time.sleep(delay)
+
+    async def acquire_async(self, url):
+        """
+        Waits without blocking the event loop until a request to the given URL may be sent.
+        """
+        bucket = self._bucket(url)
+        while True:
+            delay = bucket.reserve()
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+    def update(self, url, status, headers):
+        """
+        Adjusts the budget of the route from the status and headers of a response.
+
+        Args:
+            url (str): URL or path of the request.
+            status (int): Status code of the response.
+            headers: A mapping or an object with a getheader method, such as http.client.HTTPResponse.
+        """
+        getheader = headers.getheader if hasattr(headers, "getheader") else headers.get
+        now = time.time()
+        limit = getheader("X-RateLimit-Limit")
+        remaining = getheader("X-RateLimit-Remaining")
+        pause = None
+        if status == 429:
+            pause = _parse_seconds(getheader("Retry-After"), now)
+        if pause is None and remaining is not None and remaining.strip() == "0":
+            pause = _parse_seconds(getheader("X-RateLimit-Reset"), now)
+        if limit is None and remaining is None and pause is None:
+            return
+        self._bucket(url).sync(
+            limit=int(limit) if limit is not None and limit.strip().isdigit() else None,
+            remaining=int(remaining) if remaining is not None and remaining.strip().isdigit() else None,
+            pause=pause,
+        )
@@ -1,42 +1,235 @@
 # -*- coding: utf-8 -*-
+import codecs
 import json
+import zlib
+
+from jwplatform.codec import default_codec
+
+# Size of the compressed chunks read from a response.
+READ_CHUNK_SIZE = 64 * 1024
+
+# Accepts a zlib or a gzip header.
+_ZLIB_OR_GZIP_WBITS = 32 + zlib.MAX_WBITS
+CONTENT_ENCODINGS = ("gzip", "deflate")
+
+_DEFAULT_CODEC = default_codec()
+# Marks a body that has not been decoded yet.
+_NOT_DECODED = object()
+
+
+def _iter_body(response, content_encoding, read=None):
+    """
+    Yields the body of a response in chunks as they are read, decompressing them if the body is gzip or deflate
+    encoded.
+    """
+    read = read or response.read
+    encoding = content_encoding.strip().lower() if content_encoding is not None else None
+    decompressor = zlib.decompressobj(_ZLIB_OR_GZIP_WBITS) if encoding in CONTENT_ENCODINGS else None
+    started = False
+    while True:
+        chunk = read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        if decompressor is None:
+            yield chunk
+            continue
+        try:
+            data = decompressor.decompress(chunk)
+        except zlib.error:
+            if started or encoding != "deflate":
+                raise
+            # Some servers send raw deflate data without the zlib header.
+            decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            data = decompressor.decompress(chunk)
+        started = True
+        if data:
+            yield data
+    if decompressor is not None:
+        data = decompressor.flush()
+        if data:
+            yield data
+
+
+def _read_body(response, content_encoding):
+    """
+    Reads the body of a response, decompressing it chunk by chunk if it is gzip or deflate encoded.
+    """
+    if content_encoding is None or content_encoding.strip().lower() not in CONTENT_ENCODINGS:
+        return response.read()
+    return b"".join(_iter_body(response, content_encoding))
+
+
+class _JSONStream:
+    """
+    Parses a JSON document from text chunks, reading more chunks only when the next value is incomplete.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            return
+        # Drop the part of the buffer that has been parsed.
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+
+    def _peek(self):
+        """
+        Returns the next character that is not whitespace, or an empty string at the end of the document.
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer) or self._eof:
+                return self._buffer[self._pos:self._pos + 1]
+            self._fill()
+
+    def _expect(self, expected):
+        char = self._peek()
+        if char not in expected:
+            raise ValueError(f"Expected one of {expected!r} at {self._pos} but found {char!r}.")
+        self._pos += 1
+        return char
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A value that ends with the buffer, such as a number, may continue in the next chunk.
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def iter_array(self, key, fields):
+        """
+        Yields the items of the array under `key` in the top-level object, and stores the other fields of the object
+        in `fields` as they are parsed.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            name = self._value()
+            self._expect(":")
+            if name == key and self._peek() == "[":
+                self._pos += 1
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._value()
+                        if self._expect(",]") == "]":
+                            break
+            else:
+                fields[name] = self._value()
+            if self._expect(",}") == "}":
+                return
 
 
 class APIResponse:
     """
     Class returned when JWPlatformClient is used to make an API request.
+
+    The body is decoded with the given JSON codec the first time `json_body` is read, so that responses nobody reads
+    are never decoded. Copies of a response share its decoded body, so that the body is decoded once however many
+    copies read it. A lean response decodes the body right away instead, and then lets go of the http.client
+    response and of the raw body, unless it is not JSON.
     """
-    def __init__(self, response):
+
+    def __init__(self, response, codec=None, lean=False):
         self.response = response
         self.status = response.status
+        self.headers = getattr(response, "headers", None)
         self.body = None
-        self.json_body = None
+        self._codec = codec if codec is not None else _DEFAULT_CODEC
+        self._json_body = None
+        self._original = None
 
-        body = response.read()
+        body = _read_body(response, self.getheader("Content-Encoding"))
 
         if body and len(body) > 0:
             self.body = body
+            self._json_body = _NOT_DECODED
 
-            try:
-                self.json_body = json.loads(self.body.decode("utf-8"))
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                pass
+        if lean:
+            if self.json_body is not None:
+                self.body = None
+            self.response = None
+
+    @property
+    def json_body(self):
+        if self._json_body is _NOT_DECODED:
+            if self._original is not None:
+                self._json_body = self._original.json_body
+                self._original = None
+            else:
+                try:
+                    self._json_body = self._codec.loads(self.body)
+                except ValueError:
+                    self._json_body = None
+        return self._json_body
+
+    @json_body.setter
+    def json_body(self, value):
+        self._json_body = value
+
+    def getheader(self, name, default=None):
+        """
+        Returns the value of a response header, or `default` if the response does not have it.
+        """
+        if self.headers is None:
+            return default
+        return self.headers.get(name, default)
 
     @classmethod
     def from_copy(cls, original_response):
-        copy_response = cls(original_response.response)
+        # The original response has already been read, so the copy takes its fields instead of reading it again.
+        copy_response = cls.__new__(cls)
+        copy_response.response = original_response.response
+        copy_response.status = original_response.status
+        copy_response.headers = original_response.headers
         copy_response.body = original_response.body
-        copy_response.json_body = original_response.json_body
+        copy_response._codec = original_response._codec
+        copy_response._json_body = original_response._json_body
+        # A body that is not decoded yet is decoded by the original, which keeps it for the other copies.
+        copy_response._original = original_response if original_response._json_body is _NOT_DECODED else None
         return copy_response
 
 
+# Response types by response class and resource client class, created once instead of on every call.
+_client_response_types = {}
+
+
+def _client_response_type(cls, resource_class):
+    """
+    Returns a subclass of both the response class and the resource client class, so that responses are instances of
+    the client that returned them.
+    """
+    key = (cls, resource_class)
+    response_type = _client_response_types.get(key)
+    if response_type is None:
+        response_type = type("ClientResponse", (cls, resource_class), {})
+        response_type = _client_response_types.setdefault(key, response_type)
+    return response_type
+
+
 class ResourceResponse(APIResponse):
 
     @classmethod
     def from_client(cls, response, resource_class):
-        class ClientResponse(cls, resource_class):
-            pass
-        return ClientResponse.from_copy(response)
+        return _client_response_type(cls, resource_class).from_copy(response)
 
 
 class ResourcesResponse(APIResponse):
@@ -51,8 +244,73 @@ class ResourcesResponse(APIResponse):
 
     @classmethod
     def from_client(cls, response, resource_name, resource_class):
-        class ClientResponse(cls, resource_class):
-            pass
-        client_response = ClientResponse.from_copy(response)
+        client_response = _client_response_type(cls, resource_class).from_copy(response)
         client_response._resources = client_response.json_body[resource_name]
         return client_response
+
+
+class StreamingResourcesResponse:
+    """
+    A page of a collection whose resources are parsed from the connection as they arrive, instead of after the whole
+    page has been read. The resources can be iterated over once.
+
+    `json_body` holds the other fields of the page, such as `page` and `total`, as they are parsed. Fields that come
+    after the resources are only available once they have all been read.
+
+    The connection is held until the page has been read to the end or the response is closed, so the response should
+    be used as a context manager or iterated to the end.
+    """
+
+    def __init__(self, response, resource_name, release=None):
+        self.response = response
+        self.status = response.status
+        self.headers = getattr(response, "headers", None)
+        self.json_body = {}
+        self._release = release
+        self._count = 0
+        self._resources = self._parse(resource_name)
+
+    def _parse(self, resource_name):
+        content_encoding = self.headers.get("Content-Encoding") if self.headers is not None else None
+        body = _iter_body(self.response, content_encoding, read=getattr(self.response, "read1", None))
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        text = (decoder.decode(chunk) for chunk in body)
+        for resource in _JSONStream(text).iter_array(resource_name, self.json_body):
+            self._count += 1
+            yield resource
+        # Read the rest of the body so that the connection can be reused. read1() leaves a response with a
+        # Content-Length open once its body has been read, and read() then closes it.
+        for _ in body:
+            pass
+        self.response.read()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._resources)
+        except BaseException:
+            self.close()
+            raise
+
+    def __len__(self):
+        """
+        Returns the number of resources read so far.
+        """
+        return self._count
+
+    def close(self):
+        """
+        Releases the connection, which is closed if the page has not been read to the end.
+        """
+        self._resources.close()
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
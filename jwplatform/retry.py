@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+import random
+import threading
+import time
+
+from neterr import StrictHTTPErrors
+
+from jwplatform.errors import APIError
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+RETRYABLE_STATUSES = frozenset((429, 502, 503, 504))
+
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 30.0
+DEFAULT_MAX_RETRY_AFTER = 120.0
+
+_logger = logging.getLogger(__name__)
+
+
+class RetryBudget:
+    """
+    Bounds the number of retries relative to the number of requests, so that retries cannot multiply the load on a
+    service that is failing.
+
+    Every request deposits `ratio` of a retry into the budget and every retry withdraws one, on top of a floor of
+    `min_per_second` retries per second. The balance is capped at `max_balance`, so that quiet periods do not build up
+    a large reserve.
+
+    Args:
+        ratio (float, optional): Number of retries allowed per request. Default is 0.2.
+        min_per_second (float, optional): Number of retries per second allowed regardless of the ratio. Default is 1.
+        max_balance (float, optional): Maximum number of retries that can be saved up. Default is 10.
+    """
+
+    def __init__(self, ratio=0.2, min_per_second=1.0, max_balance=10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max_balance
+        self._balance = max_balance
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, amount):
+        now = time.monotonic()
+        self._balance = min(self.max_balance,
+                            self._balance + amount + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def record_request(self):
+        with self._lock:
+            self._refill(self.ratio)
+
+    def try_withdraw(self):
+        """
+        Returns: True if a retry may be attempted.
+        """
+        with self._lock:
+            self._refill(0)
+            if self._balance >= 1:
+                self._balance -= 1
+                return True
+            return False
+
+
+def _retry_after(error):
+    """
+    Returns the number of seconds in the Retry-After header of an error response, if any.
+    """
+    getheader = getattr(error, "getheader", None)
+    if getheader is None:
+        return None
+    value = getheader("Retry-After")
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to wait before the next attempt.
+
+    Connection errors and responses with a status in `retry_statuses` are retried for methods in `retry_methods`,
+    which are the idempotent methods by default. The delay before each retry is drawn uniformly between 0 and an
+    exponentially growing cap (full jitter), unless the response carries a Retry-After header. All retries draw from
+    a shared RetryBudget.
+
+    Args:
+        max_attempts (int, optional): Maximum number of attempts, including the first one. Default is 3.
+        backoff_base (float, optional): Cap of the delay before the first retry, in seconds. Default is 0.5.
+        backoff_max (float, optional): Maximum delay between attempts, in seconds. Default is 30.
+        retry_methods (iterable, optional): HTTP methods that may be retried.
+        retry_statuses (iterable, optional): Response statuses that are retried.
+        max_retry_after (float, optional): Maximum number of seconds to wait for a Retry-After header. A longer
+                                           Retry-After fails the request instead. Default is 120.
+        budget (RetryBudget, optional): Budget shared by all retries. Default is a new RetryBudget.
+    """
+
+    def __init__(self, max_attempts=DEFAULT_RETRY_ATTEMPTS, backoff_base=DEFAULT_BACKOFF_BASE,
+                 backoff_max=DEFAULT_BACKOFF_MAX, retry_methods=IDEMPOTENT_METHODS, retry_statuses=RETRYABLE_STATUSES,
+                 max_retry_after=DEFAULT_MAX_RETRY_AFTER, budget=None):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_methods = frozenset(method.upper() for method in retry_methods)
+        self.retry_statuses = frozenset(retry_statuses)
+        self.max_retry_after = max_retry_after
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def is_retryable(self, method, error):
+        """
+        Returns: True if a request with the given method that failed with the given error may be retried.
+        """
+        if method is not None and method.upper() not in self.retry_methods:
+            return False
+        if isinstance(error, APIError):
+            return error.status in self.retry_statuses
+        return isinstance(error, StrictHTTPErrors)
+
+    def backoff(self, attempt, error=None):
+        """
+        Returns: The number of seconds to wait after the given failed attempt, starting at 1.
+        """
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def next_delay(self, method, attempt, error, max_attempts=None):
+        """
+        Decides whether to retry after a failed attempt.
+
+        Returns: The number of seconds to wait before retrying, or None if the error should be raised.
+        """
+        max_attempts = self.max_attempts if max_attempts is None else max_attempts
+        if attempt >= max_attempts or not self.is_retryable(method, error):
+            return None
+        return self.retry_delay(attempt, error)
+
+    def retry_delay(self, attempt, error=None):
+        """
+        Draws a retry from the budget for an attempt the caller has decided to retry.
+
+        Returns: The number of seconds to wait before retrying, or None if the retry budget is exhausted or the
+        Retry-After header asks for too long a wait.
+        """
+        delay = self.backoff(attempt, error)
+        if delay > self.max_retry_after:
+            return None
+        if not self.budget.try_withdraw():
+            _logger.warning("The retry budget is exhausted. Not retrying.")
+            return None
+        return delay
+
+    def call(self, method, send, max_attempts=None):
+        """
+        Calls `send` until it succeeds or the policy gives up, sleeping between attempts.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self.budget.record_request()
+            try:
+                return send()
+            except Exception as error:
+                delay = self.next_delay(method, attempt, error, max_attempts)
+                if delay is None:
+                    raise
+                _logger.warning(f"Attempt {attempt} failed with {error!r}. Retrying in {delay:.2f}s.")
+                time.sleep(delay)
+
+    async def call_async(self, method, send, max_attempts=None):
+        """
+        Awaits `send()` until it succeeds or the policy gives up, sleeping between attempts without blocking the loop.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self.budget.record_request()
+            try:
+                return await send()
+            except Exception as error:
+                delay = self.next_delay(method, attempt, error, max_attempts)
+                if delay is None:
+                    raise
+                _logger.warning(f"Attempt {attempt} failed with {error!r}. Retrying in {delay:.2f}s.")
+                await asyncio.sleep(delay)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import heapq
+import itertools
+import threading
+import time
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class UploadScheduler:
+    """
+    Shares a global upload bandwidth between concurrent uploads.
+
+    Bytes are handed out from a token bucket that refills at `max_bytes_per_second`. Uploads that wait for bandwidth
+    at the same time are served in weighted fair order: an upload with priority 4 is granted four times as many bytes
+    as an upload with priority 1, so small urgent files are not stuck behind large ones.
+
+    A scheduler can be shared by any number of uploads and threads.
+
+    Args:
+        max_bytes_per_second (int): Maximum number of bytes sent per second by all uploads together.
+        burst (int, optional): Number of bytes that can be sent at once after a pause. Defaults to a tenth of a second
+                               of bandwidth, and is never smaller than `chunk_size`.
+        chunk_size (int, optional): Number of bytes granted at a time. Default is 64 KB.
+
+    Examples:
+        scheduler = UploadScheduler(max_bytes_per_second=50 * 1024 * 1024)
+        client.Media.upload(file, upload_context, scheduler=scheduler, priority=4)
+    """
+
+    def __init__(self, max_bytes_per_second, burst=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        if max_bytes_per_second <= 0:
+            raise ValueError("The bandwidth has to be greater than 0.")
+
+        self.max_bytes_per_second = max_bytes_per_second
+        self.chunk_size = chunk_size
+        self.burst = max(burst or max_bytes_per_second // 10, chunk_size)
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._virtual_time = 0.0
+        self._waiting = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+
+    def share(self, priority=1):
+        """
+        Returns the share of the bandwidth used by a single upload.
+
+        Args:
+            priority (float, optional): Weight of the upload relative to the other uploads. Default is 1.
+        """
+        if priority <= 0:
+            raise ValueError("The priority has to be greater than 0.")
+        return _UploadShare(self, priority)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.max_bytes_per_second)
+        self._updated = now
+
+    def _acquire(self, share, size):
+        with self._condition:
+            # Requests are served in order of their virtual finish time, which advances more slowly for uploads with
+            # a higher priority.
+            share.finish_time = max(self._virtual_time, share.finish_time) + size / share.priority
+            ticket = (share.finish_time, next(self._counter))
+            heapq.heappush(self._waiting, ticket)
+            while True:
+                self._refill()
+                if self._waiting[0] == ticket:
+                    if self._tokens >= size:
+                        heapq.heappop(self._waiting)
+                        self._tokens -= size
+                        self._virtual_time = ticket[0]
+                        self._condition.notify_all()
+                        return
+                    self._condition.wait((size - self._tokens) / self.max_bytes_per_second)
+                else:
+                    self._condition.wait()
+
+
+class _UploadShare:
+    """
+    The bandwidth share of a single upload. The threads of a multi-part upload draw from the same share.
+    """
+
+    def __init__(self, scheduler, priority):
+        self.priority = priority
+        self.finish_time = 0.0
+        self._scheduler = scheduler
+
+    def acquire(self, size):
+        """
+        Waits until `size` bytes may be sent.
+        """
+        chunk_size = self._scheduler.chunk_size
+        for offset in range(0, size, chunk_size):
+            self._scheduler._acquire(self, min(chunk_size, size - offset))
+
+    def throttle(self, body):
+        """
+        Wraps a request body so that it is sent no faster than the share allows. The body can be a bytes-like object
+        or a file-like object.
+        """
+        return _ThrottledBody(body, self)
+
+
+class _ThrottledBody:
+    """
+    A readable request body that acquires bandwidth before handing out each chunk.
+    """
+
+    def __init__(self, body, share):
+        self._share = share
+        self._chunk_size = share._scheduler.chunk_size
+        if hasattr(body, "read"):
+            self._file = body
+            self._view = None
+        else:
+            self._file = None
+            self._view = memoryview(body).cast("B")
+            self._offset = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self._chunk_size:
+            size = self._chunk_size
+        if self._file is not None:
+            data = self._file.read(size)
+        else:
+            data = self._view[self._offset:self._offset + size]
+            self._offset += len(data)
+        if data:
+            self._share.acquire(len(data))
+        return data
@@ -1,15 +1,33 @@
-import http.client
+import io
+import json
 import logging
 import math
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from enum import Enum
+from functools import partial
 from hashlib import md5
-from urllib.parse import urlparse
+
+from jwplatform.circuit import ROUTE_STORAGE, circuit_attempt
+from jwplatform.connection import PoolManager
 
 MAX_PAGE_SIZE = 1000
 MIN_PART_SIZE = 5 * 1024 * 1024
 MAX_FILE_SIZE = 25 * 1000 * 1024 * 1024
+MAX_PART_COUNT = 10000
+MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+MAX_UPLOAD_WORKERS = 8
+UPLOAD_MEMORY_BUDGET = 128 * 1024 * 1024
+TARGET_PART_DURATION = 10
+UPLOAD_BLOCK_SIZE = 1024 * 1024
+UPLOAD_POOL_SIZE = 64
+
+# Connections to the upload hosts are shared by all uploads, so that parts reuse them instead of opening a new
+# connection each.
+_upload_pools = PoolManager(maxsize=UPLOAD_POOL_SIZE, blocksize=UPLOAD_BLOCK_SIZE)
 
 
 class UploadType(Enum):
@@ -26,11 +44,13 @@ class UploadContext:
     This class stores the structure for an upload context so that it can be resumed later.
     """
 
-    def __init__(self, upload_method, upload_id, upload_token, direct_link):
+    def __init__(self, upload_method, upload_id, upload_token, direct_link, part_size=None, media_id=None):
         self.upload_method = upload_method
         self.upload_id = upload_id
         self.upload_token = upload_token
         self.direct_link = direct_link
+        self.part_size = part_size
+        self.media_id = media_id
 
     """
     This method evaluates whether an upload can be resumed based on the upload context state
@@ -40,36 +60,527 @@ class UploadContext:
                and self.upload_method == UploadType.multipart.value \
                and self.upload_id is not None
 
+    def to_dict(self):
+        """
+        Returns the upload context as a dictionary that can be serialized to JSON.
+        """
+        return {
+            "upload_method": self.upload_method,
+            "upload_id": self.upload_id,
+            "upload_token": self.upload_token,
+            "direct_link": self.direct_link,
+            "part_size": self.part_size,
+            "media_id": self.media_id,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Creates an upload context from a dictionary returned by to_dict().
+        """
+        return cls(data["upload_method"], data.get("upload_id"), data.get("upload_token"), data.get("direct_link"),
+                   part_size=data.get("part_size"), media_id=data.get("media_id"))
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, value):
+        return cls.from_dict(json.loads(value))
+
+
+@dataclass
+class UploadPlan:
+    """
+    How a file is uploaded: the upload method, the size of its parts and the number of parts uploaded concurrently.
+    """
+    upload_method: str
+    part_size: int
+    max_workers: int
+
+
+class _ThroughputEstimate:
+    """
+    A moving average of the rate at which single parts are uploaded, in bytes per second.
+    """
+
+    def __init__(self, weight=0.2):
+        self._weight = weight
+        self._value = None
+        self._lock = threading.Lock()
+
+    @property
+    def value(self):
+        return self._value
+
+    def record(self, size, duration):
+        if duration <= 0:
+            return
+        with self._lock:
+            rate = size / duration
+            self._value = rate if self._value is None else self._weight * rate + (1 - self._weight) * self._value
+
+
+# Part upload rates observed in this process, used to size the parts of later uploads.
+_upload_throughput = _ThroughputEstimate()
+
+
+def _round_up(value, multiple):
+    return math.ceil(value / multiple) * multiple
+
 
-def _upload_to_s3(bytes_chunk, upload_link):
-    url_metadata = urlparse(upload_link)
-    if url_metadata.scheme in 'https':
-        connection = http.client.HTTPSConnection(host=url_metadata.hostname)
+def plan_upload(file_size, target_part_size=None, max_workers=None, memory_budget=None, throughput=None):
+    """
+    Picks how to upload a file of the given size.
+
+    Without `max_workers`, up to MAX_UPLOAD_WORKERS parts are uploaded concurrently. Without a `target_part_size`,
+    parts are then sized so that each takes about TARGET_PART_DURATION seconds at the observed upload throughput,
+    within the share of the memory budget of each worker, which holds two buffers. The part size is always large
+    enough to keep the file within MAX_PART_COUNT parts, and the number of workers is lowered if the parts do not fit
+    in the memory budget.
+
+    Args:
+        file_size (int): Size of the file in bytes.
+        target_part_size (int, optional): Preferred part size. It is raised if the file would need too many parts.
+        max_workers (int, optional): Number of parts to upload concurrently.
+        memory_budget (int, optional): Number of bytes the part buffers may take. Default is 128 MB.
+        throughput (float, optional): Expected upload rate of a single part in bytes per second. Defaults to the rate
+                                      observed by earlier uploads in this process.
+
+    Returns: An UploadPlan.
+    """
+    if file_size > MAX_FILE_SIZE:
+        raise NotImplementedError('File size greater than 25 GB is not supported.')
+    if memory_budget is None:
+        memory_budget = UPLOAD_MEMORY_BUDGET
+    if throughput is None:
+        throughput = _upload_throughput.value
+
+    min_part_size = max(MIN_PART_SIZE, _round_up(math.ceil(file_size / MAX_PART_COUNT), UPLOAD_BLOCK_SIZE))
+    workers = MAX_UPLOAD_WORKERS if max_workers is None else max(1, int(max_workers))
+    if target_part_size is not None:
+        part_size = max(int(target_part_size), min_part_size)
+    elif throughput:
+        preferred_part_size = _round_up(throughput * TARGET_PART_DURATION, UPLOAD_BLOCK_SIZE)
+        worker_budget = memory_budget // (2 * workers) // UPLOAD_BLOCK_SIZE * UPLOAD_BLOCK_SIZE
+        part_size = max(min(preferred_part_size, worker_budget, MAX_PART_SIZE), min_part_size)
     else:
-        connection = http.client.HTTPConnection(host=url_metadata.hostname)
+        part_size = min_part_size
+
+    if file_size <= part_size:
+        return UploadPlan(UploadType.direct.value, part_size, 1)
+
+    if max_workers is None:
+        part_count = math.ceil(file_size / part_size)
+        workers = min(workers, part_count, memory_budget // (2 * part_size))
+    return UploadPlan(UploadType.multipart.value, part_size, max(1, workers))
+
+
+class UploadEventType(Enum):
+    """
+    This class stores the enum values for the events reported while uploading.
+    """
+    part_started = "part_started"
+    part_completed = "part_completed"
+    part_skipped = "part_skipped"
+    part_retried = "part_retried"
+    upload_completed = "upload_completed"
+
+
+@dataclass
+class UploadEvent:
+    """
+    An event reported to the progress callback of an upload.
+
+    `part_number` is the number of the part within the whole file, starting at 1. A direct upload is reported as a
+    single part. `duration` is the number of seconds the part took, `attempt` the number of the attempt that failed
+    for a retried part, and `stats` holds the statistics of the upload so far.
+    """
+    type: UploadEventType
+    stats: "UploadStats"
+    part_number: int = None
+    size: int = 0
+    duration: float = None
+    attempt: int = None
+    error: Exception = None
+
+
+class UploadStats:
+    """
+    Statistics of a single upload, updated as its parts are uploaded.
+
+    Args:
+        total_bytes (int): Size of the file being uploaded.
+    """
+
+    def __init__(self, total_bytes):
+        self.total_bytes = total_bytes
+        self.bytes_uploaded = 0
+        self.bytes_skipped = 0
+        self.parts_completed = 0
+        self.parts_skipped = 0
+        self.retries = 0
+        self.part_durations = []
+        self.started = time.monotonic()
+        self.finished = None
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self):
+        """
+        Number of seconds since the upload started, or that the upload took once it is complete.
+        """
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def throughput(self):
+        """
+        Number of bytes sent per second. Parts that were already uploaded are not counted.
+        """
+        elapsed = self.elapsed
+        return self.bytes_uploaded / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        """
+        Estimated number of seconds until the upload completes, or None before the first part completes.
+        """
+        remaining = self.total_bytes - self.bytes_uploaded - self.bytes_skipped
+        throughput = self.throughput
+        if remaining <= 0:
+            return 0.0
+        return remaining / throughput if throughput else None
+
+    @property
+    def mean_part_duration(self):
+        return sum(self.part_durations) / len(self.part_durations) if self.part_durations else None
+
+    def _record(self, event):
+        with self._lock:
+            if event.type == UploadEventType.part_completed:
+                self.parts_completed += 1
+                self.bytes_uploaded += event.size
+                self.part_durations.append(event.duration)
+            elif event.type == UploadEventType.part_skipped:
+                self.parts_skipped += 1
+                self.bytes_skipped += event.size
+            elif event.type == UploadEventType.part_retried:
+                self.retries += 1
+            elif event.type == UploadEventType.upload_completed:
+                self.finished = time.monotonic()
+
+
+class _UploadProgress:
+    """
+    Updates the statistics of an upload and reports its events to the progress callback, if any.
+    """
+
+    def __init__(self, callback=None):
+        self.stats = UploadStats(0)
+        self._callback = callback
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def start(self, total_bytes):
+        self.stats = UploadStats(total_bytes)
+
+    def emit(self, event_type, **kwargs):
+        event = UploadEvent(event_type, self.stats, **kwargs)
+        self.stats._record(event)
+        if self._callback is not None:
+            try:
+                self._callback(event)
+            except Exception:
+                # A failing progress callback must not fail the upload.
+                self._logger.exception(f"The progress callback failed on {event_type.value}.")
+
+
+class UploadJournal:
+    """
+    A file that records the context of a multi-part upload and the parts the server has confirmed, so that a restarted
+    process can resume the upload from the first unconfirmed part without reading the parts before it again.
+
+    The first line of the journal holds the upload context and identifies the file by its size and modification time.
+    Every following line records one confirmed part. Each line is a JSON object that is synced to disk once written.
+
+    Args:
+        path (str): Path of the journal file. It is created when the upload starts if it does not exist.
+
+    Examples:
+        journal = UploadJournal('video.mp4.journal')
+        upload_context = journal.upload_context or client.Media.create_media_and_get_upload_context(file, ...)
+        client.Media.resume(file, upload_context, journal_path='video.mp4.journal', ...)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._header = None
+        self._parts = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as journal_file:
+                lines = journal_file.readlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # The last line may have been cut short when the process died while writing it.
+                break
+            if self._header is None:
+                self._header = record
+            else:
+                self._parts[record["part"]] = record
+
+    @property
+    def upload_context(self):
+        """
+        The upload context recorded in the journal, or None if the journal is empty.
+        """
+        if self._header is None:
+            return None
+        return UploadContext.from_dict(self._header["context"])
+
+    def start(self, upload_context, file_size, file_mtime, part_size):
+        """
+        Starts recording an upload. The parts recorded so far are kept if they belong to the same upload of the same
+        file with the same part size, and discarded otherwise.
 
-    connection.request('PUT', upload_link, body=bytes_chunk)
-    response = connection.getresponse()
-    if 200 <= response.status <= 299:
-        return response
+        Returns: A dictionary of the confirmed parts by part number.
+        """
+        header = {
+            "context": upload_context.to_dict(),
+            "file_size": file_size,
+            "file_mtime": file_mtime,
+            "part_size": part_size,
+        }
+        with self._lock:
+            if header != self._header:
+                self._header = header
+                self._parts = {}
+                self._write([header], mode="w")
+            return dict(self._parts)
+
+    def record_part(self, part_number, offset, length, md5_hash):
+        """
+        Records a part that the server has confirmed.
+        """
+        record = {"part": part_number, "offset": offset, "length": length, "md5": md5_hash}
+        with self._lock:
+            self._parts[part_number] = record
+            self._write([record], mode="a")
 
-    raise S3UploadError(response)
+    def remove(self):
+        """
+        Deletes the journal, once the upload it records is complete.
+        """
+        with self._lock:
+            self._header = None
+            self._parts = {}
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _write(self, records, mode):
+        with open(self.path, mode) as journal_file:
+            for record in records:
+                journal_file.write(json.dumps(record) + "\n")
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+
+def _upload_to_s3(bytes_chunk, upload_link, content_length=None, circuit_breaker=None):
+    # A file-like body is streamed by http.client, which needs the length up front to avoid a chunked upload.
+    headers = {} if content_length is None else {'Content-Length': str(content_length)}
+    pool = _upload_pools.connection_from_url(upload_link)
+    with circuit_attempt(circuit_breaker, pool.host, ROUTE_STORAGE) as circuit, \
+            pool.request('PUT', upload_link, body=bytes_chunk, headers=headers) as response:
+        circuit.record(response.status)
+        # Read the response to the end so that the connection can be reused for the next part.
+        response.read()
+        if 200 <= response.status <= 299:
+            return response
+
+        raise S3UploadError(response)
+
+
+def _retry_delay(retry_policy, attempt, error):
+    """
+    Returns the number of seconds to wait before retrying with the retry policy, if any, or None if the retry budget of
+    the policy is exhausted and the upload should not be retried.
+    """
+    if retry_policy is None:
+        return 0
+    return retry_policy.retry_delay(attempt, error)
 
 
 def _get_bytes_hash(bytes_chunk):
     return md5(bytes_chunk).hexdigest()
 
 
+def _get_file_hash(file):
+    """
+    Computes the MD5 hash of the file from its current position to its end, one block at a time.
+
+    Returns: A tuple of the hex digest and the number of bytes hashed.
+    """
+    file_hash = md5()
+    size = 0
+    while True:
+        block = file.read(UPLOAD_BLOCK_SIZE)
+        if not block:
+            return file_hash.hexdigest(), size
+        file_hash.update(block)
+        size += len(block)
+
+
+def _get_part_hash(file_path, part_size, part_index):
+    """
+    Computes the MD5 hash of one part of a file, reading it from its own file handle.
+    """
+    part_hash = md5()
+    with open(file_path, "rb") as file:
+        file.seek(part_index * part_size)
+        remaining = part_size
+        while remaining > 0:
+            block = file.read(min(remaining, UPLOAD_BLOCK_SIZE))
+            if not block:
+                break
+            part_hash.update(block)
+            remaining -= len(block)
+    return part_hash.hexdigest()
+
+
+class _FileSlice:
+    """
+    A read-only view over the next `length` bytes of a file, used to stream a request body from the file.
+    """
+
+    def __init__(self, file, length):
+        self._file = file
+        self._remaining = length
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+
 def _get_returned_hash(response):
     return response.headers['ETag']
 
 
+class _BufferPool:
+    """
+    A set of reusable part buffers. Buffers are allocated on first use, up to `count`. Once they are all in use,
+    acquiring a buffer waits for one to be released, which bounds the memory held by parts that are read but not
+    yet uploaded.
+    """
+
+    def __init__(self, buffer_size, count):
+        self._buffer_size = buffer_size
+        self._count = count
+        self._allocated = 0
+        self._free = []
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            self._condition.wait_for(lambda: self._free or self._allocated < self._count)
+            if self._free:
+                return self._free.pop()
+            self._allocated += 1
+        return bytearray(self._buffer_size)
+
+    def release(self, buffer):
+        with self._condition:
+            self._free.append(buffer)
+            self._condition.notify()
+
+
+class PartHashManifest:
+    """
+    A file that stores the MD5 hash of every part of a media file at a given part size.
+
+    The hashes are computed once, in parallel, and are reused for as long as the size and modification time of the
+    media file and the part size stay the same. Parts the server reports as uploaded can then be verified against the
+    stored hashes without being read again.
+
+    Args:
+        path (str): Path of the manifest file.
+        max_workers (int, optional): Number of threads that hash parts. Defaults to the number of CPUs.
+    """
+
+    def __init__(self, path, max_workers=None):
+        self.path = path
+        self._max_workers = max_workers or os.cpu_count() or 1
+
+    def part_hashes(self, file_path, part_size):
+        """
+        Returns the hashes of the parts of the given file, computing and storing them if the manifest is missing or
+        was made for a different file or part size.
+        """
+        file_stat = os.stat(file_path)
+        key = {"file_size": file_stat.st_size, "file_mtime": file_stat.st_mtime_ns, "part_size": part_size}
+        manifest = self._load()
+        if manifest is not None and all(manifest.get(name) == value for name, value in key.items()):
+            return manifest["hashes"]
+
+        part_count = math.ceil(file_stat.st_size / part_size)
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            hashes = list(executor.map(partial(_get_part_hash, file_path, part_size), range(part_count)))
+        self._save(dict(key, hashes=hashes))
+        return hashes
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as manifest_file:
+                return json.load(manifest_file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _save(self, manifest):
+        # Write to a temporary file first, so that an interrupted write does not leave a truncated manifest.
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(temporary_path, self.path)
+
+
 class MultipartUpload:
     """
     This class manages the multi-part upload.
+
+    Parts are uploaded one at a time unless `max_workers` is greater than 1, in which case up to `max_workers` parts
+    are uploaded concurrently. `max_in_flight_bytes` then bounds the memory held by parts that have been read but not
+    yet uploaded. It defaults to two parts per worker.
+
+    With an UploadJournal, every part the server confirms is recorded, and parts the journal already records are
+    skipped without being read. With a PartHashManifest, parts the server reports as uploaded are verified against
+    the hashes in the manifest instead of being read and hashed again.
+
+    `bandwidth` is a share of an UploadScheduler that limits how fast the parts are sent.
+
+    `progress_callback` is called with an UploadEvent as parts start, complete, are skipped or retried, and when the
+    upload completes. With concurrent uploads it is called from the worker threads.
+
+    With a RetryPolicy, failed parts are retried after the backoff of the policy, and only while its retry budget
+    lasts. With a CircuitBreaker, the upload fails fast with a CircuitOpenError while the upload host keeps failing.
+
+    Parts are read into a fixed set of reusable buffers, and hashed and sent from views of those buffers without
+    being copied. When parts are uploaded one at a time, the next part is read and hashed while the current one is
+    being sent.
     """
 
-    def __init__(self, client, file, target_part_size, retry_count, upload_context: UploadContext):
+    def __init__(self, client, file, target_part_size, retry_count, upload_context: UploadContext, max_workers=1,
+                 max_in_flight_bytes=None, journal=None, manifest=None, bandwidth=None, progress_callback=None,
+                 retry_policy=None, circuit_breaker=None):
         self._upload_id = upload_context.upload_id
         self._target_part_size = target_part_size
         self._upload_retry_count = retry_count
@@ -77,6 +588,19 @@ class MultipartUpload:
         self._client = client
         self._logger = logging.getLogger(self.__class__.__name__)
         self._upload_context = upload_context
+        self._max_workers = max(1, max_workers)
+        if max_in_flight_bytes is None:
+            max_in_flight_bytes = 2 * self._max_workers * target_part_size
+        self._max_in_flight_bytes = max(max_in_flight_bytes, target_part_size)
+        self._journal = journal
+        self._confirmed_parts = {}
+        self._manifest = manifest
+        self._part_hashes = None
+        self._file_size = None
+        self._bandwidth = bandwidth
+        self._progress = _UploadProgress(progress_callback)
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker
 
     @property
     def upload_context(self):
@@ -86,22 +610,34 @@ class MultipartUpload:
     def upload_context(self, value):
         self._upload_context = value
 
+    @property
+    def stats(self):
+        return self._progress.stats
+
     def upload(self):
         """
         This methods uploads the parts for the multi-part upload.
-        Returns:
+        Returns: The UploadStats of the upload.
 
         """
         if self._target_part_size < MIN_PART_SIZE:
             raise ValueError(f"The part size has to be at least greater than {MIN_PART_SIZE} bytes.")
 
         filename = self._file.name
-        file_size = os.stat(filename).st_size
+        file_stat = os.stat(filename)
+        file_size = self._file_size = file_stat.st_size
         part_count = math.ceil(file_size / self._target_part_size)
 
-        if part_count > 10000:
-            raise ValueError("The given file cannot be divided into more than 10000 parts. Please try increasing the "
-                             "target part size.")
+        if part_count > MAX_PART_COUNT:
+            raise ValueError(f"The given file cannot be divided into more than {MAX_PART_COUNT} parts. Please try "
+                             f"increasing the target part size.")
+
+        self._progress.start(file_size)
+        if self._journal is not None:
+            self._confirmed_parts = self._journal.start(self._upload_context, file_size, file_stat.st_mtime_ns,
+                                                        self._target_part_size)
+        if self._manifest is not None:
+            self._part_hashes = self._manifest.part_hashes(filename, self._target_part_size)
 
         # Upload the parts
         self._upload_parts(part_count)
@@ -109,62 +645,227 @@ class MultipartUpload:
         # Mark upload as complete
         self._mark_upload_completion()
 
+        if self._journal is not None:
+            self._journal.remove()
+
+        self._progress.emit(UploadEventType.upload_completed, size=file_size, duration=self.stats.elapsed)
+        return self.stats
+
     def _upload_parts(self, part_count):
         try:
-            filename = self._file.name
-            remaining_parts_count = part_count
-            total_page_count = math.ceil(part_count / MAX_PAGE_SIZE)
-            for page_number in range(1, total_page_count + 1):
-                batch_size = min(remaining_parts_count, MAX_PAGE_SIZE)
-                page_length = MAX_PAGE_SIZE
-                remaining_parts_count = remaining_parts_count - batch_size
-                query_params = {'page_length': page_length, 'page': page_number}
-                self._logger.debug(
-                    f'calling list method with page_number:{page_number} and page_length:{page_length}.')
-                body = self._retrieve_part_links(query_params)
-                upload_links = body['parts']
-                for returned_part in upload_links[:batch_size]:
-                    part_number = returned_part['id']
-                    bytes_chunk = self._file.read(self._target_part_size)
-                    if part_number < batch_size and len(bytes_chunk) != self._target_part_size:
-                        raise IOError("Failed to read enough bytes")
-                    retry_count = 0
-                    for _ in range(self._upload_retry_count):
-                        try:
-                            self._upload_part(bytes_chunk, part_number, returned_part)
-                            self._logger.debug(
-                                f"Successfully uploaded part {(page_number - 1) * MAX_PAGE_SIZE + part_number} "
-                                f"of {part_count} for upload id {self._upload_id}")
-                            break
-                        except (DataIntegrityError, PartUploadError, OSError) as err:
-                            self._logger.warning(err)
-                            retry_count = retry_count + 1
-                            self._logger.warning(
-                                f"Encountered error upload part {(page_number - 1) * MAX_PAGE_SIZE + part_number} "
-                                f"of {part_count} for file {filename}.")
-                            if retry_count >= self._upload_retry_count:
-                                self._file.seek(0, 0)
-                                raise MaxRetriesExceededError(
-                                    f"Max retries ({self._upload_retry_count}) exceeded while uploading part"
-                                    f" {part_number} of {part_count} for file {filename}.") from err
+            if self._max_workers > 1:
+                self._upload_parts_concurrently(part_count)
+            else:
+                self._upload_parts_pipelined(part_count)
         except Exception as ex:
             self._file.seek(0, 0)
             self._logger.exception(ex)
             raise
 
+    def _upload_parts_pipelined(self, part_count):
+        # While a part is being sent, the next part is read and hashed on a worker thread. hashlib releases the GIL
+        # while hashing, so the hash is computed in parallel with the upload.
+        buffers = _BufferPool(self._target_part_size, 2)
+        pending = None
+        with ThreadPoolExecutor(max_workers=1) as hasher:
+            try:
+                for part_index, returned_part, is_full_part in self._iter_part_links(part_count):
+                    buffer = buffers.acquire()
+                    try:
+                        bytes_chunk = self._read_part(buffer, is_full_part)
+                    except BaseException:
+                        buffers.release(buffer)
+                        raise
+                    # Parts whose hash is in the manifest are not hashed again.
+                    computed_hash = hasher.submit(_get_bytes_hash, bytes_chunk) if self._part_hashes is None else None
+                    part = (buffer, bytes_chunk, computed_hash, part_index, returned_part)
+                    if pending is not None:
+                        self._upload_pending_part(pending, part_count, buffers)
+                    pending = part
+                if pending is not None:
+                    part, pending = pending, None
+                    self._upload_pending_part(part, part_count, buffers)
+            finally:
+                if pending is not None:
+                    buffers.release(pending[0])
+
+    def _upload_pending_part(self, part, part_count, buffers):
+        buffer, bytes_chunk, computed_hash, part_index, returned_part = part
+        try:
+            self._upload_part_with_retry(bytes_chunk, part_index, part_count, returned_part,
+                                         computed_hash=computed_hash.result() if computed_hash is not None else None)
+        finally:
+            buffers.release(buffer)
+
+    def _upload_parts_concurrently(self, part_count):
+        buffers = _BufferPool(self._target_part_size, max(1, self._max_in_flight_bytes // self._target_part_size))
+        failed = threading.Event()
+        futures = []
+
+        def upload_part(buffer, bytes_chunk, part_index, returned_part):
+            try:
+                self._upload_part_with_retry(bytes_chunk, part_index, part_count, returned_part)
+            except BaseException:
+                failed.set()
+                raise
+            finally:
+                buffers.release(buffer)
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            try:
+                for part_index, returned_part, is_full_part in self._iter_part_links(part_count):
+                    buffer = buffers.acquire()
+                    if failed.is_set():
+                        buffers.release(buffer)
+                        break
+                    try:
+                        bytes_chunk = self._read_part(buffer, is_full_part)
+                    except BaseException:
+                        buffers.release(buffer)
+                        raise
+                    futures.append(executor.submit(upload_part, buffer, bytes_chunk, part_index, returned_part))
+            except BaseException:
+                failed.set()
+                raise
+            finally:
+                if failed.is_set():
+                    for future in futures:
+                        future.cancel()
+                wait(futures)
+
+        # Surface the failure of the earliest part, so that errors match the sequential upload.
+        for future in futures:
+            if not future.cancelled() and future.exception() is not None:
+                raise future.exception()
+
+    def _iter_part_links(self, part_count):
+        remaining_parts_count = part_count
+        total_page_count = math.ceil(part_count / MAX_PAGE_SIZE)
+        for page_number in range(1, total_page_count + 1):
+            batch_size = min(remaining_parts_count, MAX_PAGE_SIZE)
+            page_length = MAX_PAGE_SIZE
+            remaining_parts_count = remaining_parts_count - batch_size
+            first_part_index = (page_number - 1) * MAX_PAGE_SIZE + 1
+            part_indexes = range(first_part_index, first_part_index + batch_size)
+            if all(part_index in self._confirmed_parts for part_index in part_indexes):
+                # Every part of the page is already uploaded, so its links are not needed.
+                for part_index in part_indexes:
+                    self._skip_confirmed_part(part_index)
+                continue
+            query_params = {'page_length': page_length, 'page': page_number}
+            self._logger.debug(
+                f'calling list method with page_number:{page_number} and page_length:{page_length}.')
+            body = self._retrieve_part_links(query_params)
+            upload_links = body['parts']
+            for returned_part in upload_links[:batch_size]:
+                part_number = returned_part['id']
+                part_index = (page_number - 1) * MAX_PAGE_SIZE + part_number
+                if part_index in self._confirmed_parts:
+                    self._skip_confirmed_part(part_index)
+                    continue
+                if self._is_uploaded_part_in_manifest(part_index, returned_part):
+                    continue
+                yield part_index, returned_part, part_number < batch_size
+
+    def _skip_confirmed_part(self, part_index):
+        self._logger.debug(f"Part {part_index} is recorded as uploaded in the journal. Skipping")
+        length = self._confirmed_parts[part_index]["length"]
+        self._progress.emit(UploadEventType.part_skipped, part_number=part_index, size=length)
+        self._file.seek(length, os.SEEK_CUR)
+
+    def _is_uploaded_part_in_manifest(self, part_index, returned_part):
+        if self._part_hashes is None:
+            return False
+        upload_hash = self._get_uploaded_part_hash(returned_part)
+        if not upload_hash:
+            return False
+        part_hash = self._part_hashes[part_index - 1]
+        if upload_hash != part_hash:  # returned hash is not surrounded by '"'
+            raise UnrecoverableError(f'The file part {part_index} has been uploaded but the hash of the uploaded part '
+                                     f'does not match the hash in the manifest. Aborting.')
+
+        self._logger.debug(f"Part number {part_index} already uploaded according to the manifest. Skipping")
+        offset = (part_index - 1) * self._target_part_size
+        length = min(self._target_part_size, self._file_size - offset)
+        if self._journal is not None:
+            self._journal.record_part(part_index, offset, length, part_hash)
+        self._progress.emit(UploadEventType.part_skipped, part_number=part_index, size=length)
+        self._file.seek(length, os.SEEK_CUR)
+        return True
+
+    def _read_part(self, buffer, is_full_part):
+        """
+        Reads the next part into the given buffer when the file supports it, and returns a memoryview of the bytes
+        read. Other file-like objects fall back to read().
+        """
+        if isinstance(self._file, (io.RawIOBase, io.BufferedIOBase)):
+            view = memoryview(buffer)
+            size = 0
+            while size < len(view):
+                read = self._file.readinto(view[size:])
+                if not read:
+                    break
+                size += read
+            bytes_chunk = view[:size]
+        else:
+            bytes_chunk = self._file.read(self._target_part_size)
+        if is_full_part and len(bytes_chunk) != self._target_part_size:
+            raise IOError("Failed to read enough bytes")
+        return bytes_chunk
+
+    def _upload_part_with_retry(self, bytes_chunk, part_index, part_count, returned_part, computed_hash=None):
+        filename = self._file.name
+        part_number = returned_part['id']
+        if computed_hash is None and self._part_hashes is not None:
+            computed_hash = self._part_hashes[part_index - 1]
+        retry_count = 0
+        self._progress.emit(UploadEventType.part_started, part_number=part_index, size=len(bytes_chunk))
+        for _ in range(self._upload_retry_count):
+            try:
+                started = time.monotonic()
+                computed_hash, uploaded = self._upload_part(bytes_chunk, part_number, returned_part,
+                                                            computed_hash=computed_hash)
+                if self._journal is not None:
+                    self._journal.record_part(part_index, (part_index - 1) * self._target_part_size,
+                                              len(bytes_chunk), computed_hash)
+                if uploaded:
+                    self._progress.emit(UploadEventType.part_completed, part_number=part_index,
+                                        size=len(bytes_chunk), duration=time.monotonic() - started)
+                else:
+                    self._progress.emit(UploadEventType.part_skipped, part_number=part_index, size=len(bytes_chunk))
+                self._logger.debug(
+                    f"Successfully uploaded part {part_index} of {part_count} for upload id {self._upload_id}")
+                return
+            except (DataIntegrityError, PartUploadError, OSError) as err:
+                self._logger.warning(err)
+                retry_count = retry_count + 1
+                duration = time.monotonic() - started
+                self._logger.warning(
+                    f"Encountered error upload part {part_index} of {part_count} for file {filename}.")
+                delay = _retry_delay(self._retry_policy, retry_count, err) \
+                    if retry_count < self._upload_retry_count else None
+                if delay is None:
+                    raise MaxRetriesExceededError(
+                        f"Max retries ({self._upload_retry_count}) exceeded while uploading part"
+                        f" {part_number} of {part_count} for file {filename}.") from err
+                self._progress.emit(UploadEventType.part_retried, part_number=part_index, size=len(bytes_chunk),
+                                    duration=duration, attempt=retry_count, error=err)
+                time.sleep(delay)
+
     def _retrieve_part_links(self, query_params):
         resp = self._client.list(upload_id=self._upload_id, query_params=query_params)
         return resp.json_body
 
-    def _upload_part(self, bytes_chunk, part_number, returned_part):
-        computed_hash = _get_bytes_hash(bytes_chunk)
+    def _upload_part(self, bytes_chunk, part_number, returned_part, computed_hash=None):
+        if computed_hash is None:
+            computed_hash = _get_bytes_hash(bytes_chunk)
 
         # Check if the file has already been uploaded and the hash matches. Return immediately without doing anything
         # if the hash matches.
         upload_hash = self._get_uploaded_part_hash(returned_part)
         if upload_hash and (repr(upload_hash) == repr(f"{computed_hash}")):  # returned hash is not surrounded by '"'
             self._logger.debug(f"Part number {part_number} already uploaded. Skipping")
-            return
+            return computed_hash, False
         if upload_hash:
             raise UnrecoverableError(f'The file part {part_number} has been uploaded but the hash of the uploaded part '
                                      f'does not match the hash of the current part read. Aborting.')
@@ -173,11 +874,18 @@ class MultipartUpload:
             raise KeyError(f"Invalid upload link for part {part_number}.")
 
         returned_part = returned_part["upload_link"]
-        response = _upload_to_s3(bytes_chunk, returned_part)
+        started = time.monotonic()
+        if self._bandwidth is not None:
+            response = _upload_to_s3(self._bandwidth.throttle(bytes_chunk), returned_part,
+                                     content_length=len(bytes_chunk), circuit_breaker=self._circuit_breaker)
+        else:
+            response = _upload_to_s3(bytes_chunk, returned_part, circuit_breaker=self._circuit_breaker)
+        _upload_throughput.record(len(bytes_chunk), time.monotonic() - started)
 
         returned_hash = _get_returned_hash(response)
         if repr(returned_hash) != repr(f"\"{computed_hash}\""):  # The returned hash is surrounded by '"' character
             raise DataIntegrityError("The hash of the uploaded file does not match with the hash on the server.")
+        return computed_hash, True
 
     def _get_uploaded_part_hash(self, upload_link):
         upload_hash = upload_link.get("etag")
@@ -191,14 +899,26 @@ class MultipartUpload:
 class SingleUpload:
     """
     This class manages the operations related to the upload of a media file via a direct link.
+
+    `bandwidth` is a share of an UploadScheduler that limits how fast the file is sent.
+
+    `progress_callback` is called with an UploadEvent as the file is sent, retried, and when the upload completes.
+
+    With a RetryPolicy, the upload is retried after the backoff of the policy, and only while its retry budget lasts.
+    With a CircuitBreaker, the upload fails fast with a CircuitOpenError while the upload host keeps failing.
     """
 
-    def __init__(self, upload_link, file, retry_count, upload_context: UploadContext):
+    def __init__(self, upload_link, file, retry_count, upload_context: UploadContext, bandwidth=None,
+                 progress_callback=None, retry_policy=None, circuit_breaker=None):
         self._upload_link = upload_link
         self._upload_retry_count = retry_count
         self._file = file
         self._logger = logging.getLogger(self.__class__.__name__)
         self._upload_context = upload_context
+        self._bandwidth = bandwidth
+        self._progress = _UploadProgress(progress_callback)
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker
 
     @property
     def upload_context(self):
@@ -208,35 +928,57 @@ class SingleUpload:
     def upload_context(self, value):
         self._upload_context = value
 
+    @property
+    def stats(self):
+        return self._progress.stats
+
     def upload(self):
         """
         Uploads the media file to the actual location as specified in the direct link.
-        Returns:
+        Returns: The UploadStats of the upload.
 
         """
         self._logger.debug(f"Starting to upload file:{self._file.name}")
-        bytes_chunk = self._file.read()
-        computed_hash = _get_bytes_hash(bytes_chunk)
+        start = self._file.tell()
+        computed_hash, size = _get_file_hash(self._file)
+        self._progress.start(size)
+        self._progress.emit(UploadEventType.part_started, part_number=1, size=size)
         retry_count = 0
         for _ in range(self._upload_retry_count):
             try:
-                response = _upload_to_s3(bytes_chunk, self._upload_link)
+                started = time.monotonic()
+                # Rewind to the start of the file instead of holding a copy of its content in memory.
+                self._file.seek(start, 0)
+                body = _FileSlice(self._file, size)
+                if self._bandwidth is not None:
+                    body = self._bandwidth.throttle(body)
+                response = _upload_to_s3(body, self._upload_link, content_length=size,
+                                         circuit_breaker=self._circuit_breaker)
                 returned_hash = _get_returned_hash(response)
                 # The returned hash is surrounded by '"' character
                 if repr(returned_hash) != repr(f"\"{computed_hash}\""):
                     raise DataIntegrityError(
                         "The hash of the uploaded file does not match with the hash on the server.")
                 self._logger.debug(f"Successfully uploaded file {self._file.name}.")
-                return
+                self._progress.emit(UploadEventType.part_completed, part_number=1, size=size,
+                                    duration=time.monotonic() - started)
+                self._progress.emit(UploadEventType.upload_completed, size=size, duration=self.stats.elapsed)
+                return self.stats
             except (IOError, PartUploadError, DataIntegrityError, OSError) as err:
                 self._logger.warning(err)
                 self._logger.exception(err, stack_info=True)
                 self._logger.warning(f"Encountered error uploading file {self._file.name}.")
                 retry_count = retry_count + 1
-                if retry_count >= self._upload_retry_count:
+                duration = time.monotonic() - started
+                delay = _retry_delay(self._retry_policy, retry_count, err) \
+                    if retry_count < self._upload_retry_count else None
+                if delay is None:
                     self._file.seek(0, 0)
                     raise MaxRetriesExceededError(f"Max retries exceeded while uploading file {self._file.name}") \
                         from err
+                self._progress.emit(UploadEventType.part_retried, part_number=1, size=size, duration=duration,
+                                    attempt=retry_count, error=err)
+                time.sleep(delay)
 
             except Exception as ex:
                 self._file.seek(0, 0)
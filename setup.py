@@ -57,6 +57,9 @@ setup(
         'requests>=2.24.0',
         'neterr~=1.1.1',
     ],
+    extras_require={
+        'orjson': ['orjson>=3.0'],
+    },
     setup_requires=[
         'pytest-runner',
     ],
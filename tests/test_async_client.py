@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+
+import pytest
+
+from jwplatform.async_client import AsyncJWPlatformClient
+from jwplatform.async_connection import AsyncHTTPConnectionPool
+from jwplatform.errors import NotFoundError
+
+
+def _media_page(page, page_length=2, total=3):
+    first = (page - 1) * page_length
+    media = [{"id": f"mediaid{index + 1}", "type": "media"} for index in range(first, min(first + page_length, total))]
+    return {"media": media, "page": page, "page_length": page_length, "total": total}
+
+
+async def _handle_request(method, target):
+    path, _, query = target.partition("?")
+    if path == "/v2/sites/testsite/media/mediaid1/":
+        return 200, {"id": "mediaid1", "type": "media"}
+    if path == "/v2/sites/testsite/media/":
+        params = dict(param.split("=") for param in query.split("&") if param)
+        return 200, _media_page(int(params.get("page", 1)))
+    return 404, {"errors": [{"code": "not_found", "description": "Not found."}]}
+
+
+class _Server:
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = []
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *args):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        self.connections += 1
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode().partition(":")
+                headers[name.lower()] = value.strip()
+            await reader.readexactly(int(headers.get("content-length", 0)))
+
+            method, target, _ = request_line.decode().split(" ")
+            self.requests.append((method, target))
+            status, body = await _handle_request(method, target)
+            payload = json.dumps(body).encode()
+            # Alternate between chunked and sized bodies to exercise both code paths.
+            if len(self.requests) % 2:
+                writer.write(f"HTTP/1.1 {status} OK\r\nContent-Length: {len(payload)}\r\n\r\n".encode() + payload)
+            else:
+                writer.write(f"HTTP/1.1 {status} OK\r\nTransfer-Encoding: chunked\r\n\r\n".encode()
+                             + f"{len(payload):x}\r\n".encode() + payload + b"\r\n0\r\n\r\n")
+            await writer.drain()
+        writer.close()
+
+
+def _make_client(port, **kwargs):
+    client = AsyncJWPlatformClient(secret="test_secret", host="127.0.0.1")
+    client._pool = AsyncHTTPConnectionPool("127.0.0.1", port=port, secure=False, **kwargs)
+    return client
+
+
+def test_async_resource_response():
+    async def run():
+        async with _Server() as server:
+            async with _make_client(server.port) as client:
+                return client, await client.Media.get(site_id="testsite", media_id="mediaid1")
+
+    client, response = asyncio.run(run())
+
+    assert response.status == 200
+    assert response.json_body["id"] == "mediaid1"
+    assert isinstance(response, client.Media.__class__), response.__class__.__name__
+
+def test_async_error_response():
+    async def run():
+        async with _Server() as server:
+            async with _make_client(server.port) as client:
+                await client.Media.get(site_id="testsite", media_id="badmedia")
+
+    with pytest.raises(NotFoundError):
+        asyncio.run(run())
+
+def test_async_list_pages():
+    async def run():
+        async with _Server() as server:
+            async with _make_client(server.port) as client:
+                return [page async for page in client.Media.list_pages(site_id="testsite")]
+
+    pages = asyncio.run(run())
+
+    assert len(pages) == 2
+    assert [media["id"] for page in pages for media in page] == ["mediaid1", "mediaid2", "mediaid3"]
+
+def test_async_list_pages_prefetch():
+    async def run():
+        async with _Server() as server:
+            async with _make_client(server.port) as client:
+                return [page async for page in client.Media.list_pages(site_id="testsite", prefetch=2)]
+
+    pages = asyncio.run(run())
+
+    assert [page.json_body["page"] for page in pages] == [1, 2]
+    assert [media["id"] for page in pages for media in page] == ["mediaid1", "mediaid2", "mediaid3"]
+
+def test_async_stream():
+    async def run():
+        async with _Server() as server:
+            async with _make_client(server.port) as client:
+                async with client.Media.stream(site_id="testsite") as page:
+                    resources = [media async for media in page]
+                first_page = [media async for media in client.Media.stream(site_id="testsite")]
+        return page, resources, first_page
+
+    page, resources, first_page = asyncio.run(run())
+
+    assert [media["id"] for media in resources] == ["mediaid1", "mediaid2"]
+    assert first_page == resources
+    assert page.status == 200
+    assert len(page) == 2
+    assert page.json_body == {"page": 1, "page_length": 2, "total": 3}
+
+def test_async_concurrent_requests_share_pool():
+    async def run():
+        async with _Server() as server:
+            async with _make_client(server.port, maxsize=5) as client:
+                responses = await asyncio.gather(*[
+                    client.Media.get(site_id="testsite", media_id="mediaid1") for _ in range(50)
+                ])
+            return server, responses
+
+    server, responses = asyncio.run(run())
+
+    assert len(responses) == 50
+    assert all(response.json_body["id"] == "mediaid1" for response in responses)
+    assert server.connections <= 5
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import time
+from unittest.mock import Mock
+
+from jwplatform.bulk import BulkUploadStatus, bulk_upload
+from jwplatform.client import CREATE_MEDIA_PAYLOAD, JWPlatformClient
+from jwplatform.upload import MIN_PART_SIZE, UploadContext, UploadType
+
+
+def _write_files(directory, count):
+    paths = []
+    for index in range(count):
+        path = os.path.join(str(directory), f"video{index}.mp4")
+        with open(path, "wb") as file:
+            file.write(b"x" * 10)
+        paths.append(path)
+    return paths
+
+
+def _media_client(failing_paths=()):
+    media_client = Mock()
+    media_client.in_flight = 0
+    media_client.max_in_flight = 0
+    lock = threading.Lock()
+
+    def create_media_and_get_upload_context(file, body=None, **kwargs):
+        media_id = os.path.basename(file.name).split(".")[0]
+        return UploadContext(UploadType.multipart.value, f"upload_{media_id}", "token", None, media_id=media_id)
+
+    def upload(file, upload_context, **kwargs):
+        with lock:
+            media_client.in_flight += 1
+            media_client.max_in_flight = max(media_client.max_in_flight, media_client.in_flight)
+        time.sleep(0.01)
+        with lock:
+            media_client.in_flight -= 1
+        if file.name in failing_paths:
+            raise IOError("Connection lost")
+
+    media_client.create_media_and_get_upload_context.side_effect = create_media_and_get_upload_context
+    media_client.upload.side_effect = upload
+    return media_client
+
+
+def test_bulk_upload_reports_result_per_file(tmp_path):
+    paths = _write_files(tmp_path, 20)
+    media_client = _media_client(failing_paths={paths[3]})
+
+    results = bulk_upload(media_client, "testsite", paths, max_workers=4)
+
+    assert [result.path for result in results] == paths
+    assert [result.media_id for result in results] == [f"video{index}" for index in range(20)]
+    assert results[3].status == BulkUploadStatus.failed
+    assert results[3].error == "Connection lost"
+    assert all(result.status == BulkUploadStatus.completed for result in results if result.path != paths[3])
+    assert 1 < media_client.max_in_flight <= 4
+    assert media_client.upload.call_args[1]["max_workers"] == 1
+
+def test_bulk_upload_resumes_from_state_file(tmp_path):
+    paths = _write_files(tmp_path, 3)
+    state_path = str(tmp_path / "state.jsonl")
+    bulk_upload(_media_client(failing_paths={paths[1]}), "testsite", paths, state_path=state_path)
+    media_client = _media_client()
+
+    results = bulk_upload(media_client, "testsite", paths, state_path=state_path)
+
+    assert [result.skipped for result in results] == [True, False, True]
+    assert all(result.status == BulkUploadStatus.completed for result in results)
+    # The failed multi-part upload is resumed with its upload context instead of creating a new media.
+    media_client.create_media_and_get_upload_context.assert_not_called()
+    media_client.upload.assert_called_once()
+    assert media_client.upload.call_args[0][1].upload_id == "upload_video1"
+
+def test_bulk_upload_reads_manifest(tmp_path):
+    paths = _write_files(tmp_path, 2)
+    manifest_path = tmp_path / "manifest.jsonl"
+    manifest_path.write_text(json.dumps({"path": paths[0], "body": {"metadata": {"title": "First"}}}) + "\n"
+                             + paths[1] + "\n")
+    media_client = _media_client()
+
+    results = bulk_upload(media_client, "testsite", str(manifest_path))
+
+    assert [result.path for result in results] == paths
+    bodies = {call[0][0].name: call[1]["body"]
+              for call in media_client.create_media_and_get_upload_context.call_args_list}
+    assert bodies == {paths[0]: {"metadata": {"title": "First"}}, paths[1]: None}
+
+def test_media_client_bulk_upload(tmp_path):
+    paths = _write_files(tmp_path, 1)
+    media_client = JWPlatformClient().Media
+    media_client.create_media_and_get_upload_context = _media_client().create_media_and_get_upload_context
+    media_client.upload = Mock()
+
+    results = media_client.bulk_upload("testsite", paths, part_workers=2)
+
+    assert results[0].status == BulkUploadStatus.completed
+    assert media_client.upload.call_args[1]["max_workers"] == 2
+
+def test_bulk_upload_creates_media_with_upload_method_per_file(tmp_path):
+    paths = _write_files(tmp_path, 8)
+    for path in paths[::2]:
+        os.truncate(path, MIN_PART_SIZE + 1)
+    media_client = JWPlatformClient().Media
+    uploads = []
+
+    def create(site_id, body, query_params=None):
+        method = body["upload"]["method"]
+        time.sleep(0.01)
+        result = {"id": "media_id", "upload_link": "https://s3/direct"} if method == "direct" \
+            else {"id": "media_id", "upload_id": "upload_id", "upload_token": "token"}
+        return Mock(json_body=result)
+
+    def upload(file, upload_context, **kwargs):
+        uploads.append((file.name, upload_context))
+
+    media_client.create = Mock(side_effect=create)
+    media_client.upload = upload
+
+    results = bulk_upload(media_client, "testsite", paths, max_workers=4)
+
+    assert all(result.status == BulkUploadStatus.completed for result in results)
+    for path, upload_context in uploads:
+        large = os.stat(path).st_size > MIN_PART_SIZE
+        assert upload_context.upload_method == ("multipart" if large else "direct")
+        assert (upload_context.upload_id if large else upload_context.direct_link) is not None
+    bodies = [call[0][1] for call in media_client.create.call_args_list]
+    assert len({id(body["upload"]) for body in bodies}) == len(paths)
+    assert CREATE_MEDIA_PAYLOAD == {"upload": {}, "metadata": {}}
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+from jwplatform.async_client import AsyncJWPlatformClient
+from jwplatform.cache import ConditionalCache, ResponseCache, resource_for_path
+from jwplatform.client import JWPlatformClient
+from jwplatform.codec import JSONCodec
+
+
+def _http_response(status, body=b"", headers=None):
+    response = Mock(status=status, headers=headers or {})
+    response.read.return_value = body
+    return response
+
+def test_resource_for_path():
+    assert resource_for_path("/v2/sites/testsite/media/media_id/") == "media"
+    assert resource_for_path("/v2/sites/testsite/players/?page=1") == "players"
+    assert resource_for_path("/v2/sites/testsite/playlists/manual_playlist/") == "playlists"
+    assert resource_for_path("/v2/sites/testsite/") == "sites"
+    assert resource_for_path("/v2/webhooks/webhook_id/") == "webhooks"
+
+def test_get_is_served_from_cache():
+    client = JWPlatformClient(response_cache=ResponseCache())
+
+    with patch.object(client, "raw_request", side_effect=lambda **kwargs: Mock(status=200)) as mock_raw_request:
+        first = client.request("GET", "/v2/sites/testsite/media/media_id/")
+        second = client.request("GET", "/v2/sites/testsite/media/media_id/")
+        other = client.request("GET", "/v2/sites/testsite/media/media_id/", query_params={"format": "json"})
+
+    assert first is second
+    assert other is not first
+    assert mock_raw_request.call_count == 2
+
+def test_least_recently_used_response_is_evicted():
+    client = JWPlatformClient(response_cache=ResponseCache(max_entries=2))
+
+    with patch.object(client, "raw_request", side_effect=lambda **kwargs: Mock(status=200)) as mock_raw_request:
+        for media_id in ("a", "b", "a", "c", "a", "b"):
+            client.request("GET", f"/v2/sites/testsite/media/{media_id}/")
+
+    # "b" was evicted when "c" was cached, and fetched again.
+    assert mock_raw_request.call_count == 4
+
+def test_per_resource_ttl():
+    client = JWPlatformClient(response_cache=ResponseCache(ttl=60, ttls={"media": 0, "players": 0.05}))
+
+    with patch.object(client, "raw_request", side_effect=lambda **kwargs: Mock(status=200)) as mock_raw_request:
+        client.request("GET", "/v2/sites/testsite/media/media_id/")
+        client.request("GET", "/v2/sites/testsite/media/media_id/")
+        client.request("GET", "/v2/sites/testsite/players/player_id/")
+        client.request("GET", "/v2/sites/testsite/players/player_id/")
+        assert mock_raw_request.call_count == 3
+        time.sleep(0.06)
+        client.request("GET", "/v2/sites/testsite/players/player_id/")
+
+    assert mock_raw_request.call_count == 4
+
+def test_stale_response_is_refreshed_in_background():
+    response_cache = ResponseCache(ttl=0.05, stale_ttl=60)
+    client = JWPlatformClient(response_cache=response_cache)
+    responses = [Mock(status=200), Mock(status=200)]
+
+    with patch.object(client, "raw_request", side_effect=responses):
+        assert client.request("GET", "/v2/sites/testsite/players/player_id/") is responses[0]
+        time.sleep(0.06)
+        assert client.request("GET", "/v2/sites/testsite/players/player_id/") is responses[0]
+        response_cache._executor.shutdown(wait=True)
+
+    assert client.request("GET", "/v2/sites/testsite/players/player_id/") is responses[1]
+
+def test_updates_invalidate_resource_and_collection():
+    response_cache = ResponseCache()
+    client = JWPlatformClient(response_cache=response_cache)
+
+    with patch.object(client, "raw_request", side_effect=lambda **kwargs: Mock(status=200)) as mock_raw_request:
+        client.request("GET", "/v2/sites/testsite/media/media_id/")
+        client.request("GET", "/v2/sites/testsite/media/", query_params={"page": 1})
+        client.request("GET", "/v2/sites/testsite/media/other_id/")
+        client.request("PATCH", "/v2/sites/testsite/media/media_id/", body={"metadata": {}})
+        assert len(response_cache) == 1
+        client.request("GET", "/v2/sites/testsite/media/media_id/")
+        client.request("GET", "/v2/sites/testsite/media/other_id/")
+
+    assert mock_raw_request.call_count == 5
+
+def test_async_get_is_served_from_cache():
+    client = AsyncJWPlatformClient(response_cache=ResponseCache())
+    calls = []
+
+    async def raw_request(**kwargs):
+        calls.append(kwargs)
+        return Mock(status=200)
+
+    async def run():
+        with patch.object(client, "raw_request", raw_request):
+            first = await client.request("GET", "/v2/sites/testsite/players/player_id/")
+            second = await client.request("GET", "/v2/sites/testsite/players/player_id/")
+            await client.request("DELETE", "/v2/sites/testsite/players/player_id/")
+            third = await client.request("GET", "/v2/sites/testsite/players/player_id/")
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first is second
+    assert third is not first
+    assert len(calls) == 3
+
+def test_not_modified_response_is_served_from_stored_body():
+    client = JWPlatformClient(conditional_cache=ConditionalCache())
+    pool_request = MagicMock()
+    pool_request.return_value.__enter__.side_effect = [
+        _http_response(200, b'{"id": "player_id"}', {"ETag": '"v1"'}),
+        _http_response(304),
+    ]
+
+    with patch.object(client._pool, "request", pool_request):
+        first = client.Player.get(site_id="testsite", player_id="player_id")
+        second = client.Player.get(site_id="testsite", player_id="player_id")
+
+    assert "If-None-Match" not in pool_request.call_args_list[0][0][3]
+    assert pool_request.call_args_list[1][0][3]["If-None-Match"] == '"v1"'
+    assert second.status == 200
+    assert second.json_body == first.json_body == {"id": "player_id"}
+
+def test_changed_response_replaces_stored_response():
+    conditional_cache = ConditionalCache()
+    client = JWPlatformClient(conditional_cache=conditional_cache)
+    pool_request = MagicMock()
+    pool_request.return_value.__enter__.side_effect = [
+        _http_response(200, b'{"title": "a"}', {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        _http_response(200, b'{"title": "b"}', {"ETag": '"v2"'}),
+        _http_response(200, b'{"title": "c"}'),
+    ]
+
+    with patch.object(client._pool, "request", pool_request):
+        client.request("GET", "/v2/sites/testsite/media/media_id/")
+        second = client.request("GET", "/v2/sites/testsite/media/media_id/")
+        assert len(conditional_cache) == 1
+        client.request("GET", "/v2/sites/testsite/media/media_id/")
+
+    assert pool_request.call_args_list[1][0][3]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert pool_request.call_args_list[2][0][3]["If-None-Match"] == '"v2"'
+    assert second.json_body == {"title": "b"}
+    # A response without validators is not stored.
+    assert len(conditional_cache) == 0
+
+def test_cached_responses_are_decoded_once():
+    codec = Mock(wraps=JSONCodec())
+    client = JWPlatformClient(response_cache=ResponseCache(), json_codec=codec)
+    pool_request = MagicMock()
+    pool_request.return_value.__enter__.side_effect = [_http_response(200, b'{"id": "media_id"}')]
+
+    with patch.object(client._pool, "request", pool_request):
+        responses = [client.Media.get(site_id="testsite", media_id="media_id") for _ in range(5)]
+
+    assert all(response.json_body == {"id": "media_id"} for response in responses)
+    assert codec.loads.call_count == 1
+
+def test_not_modified_responses_are_decoded_once():
+    codec = Mock(wraps=JSONCodec())
+    client = JWPlatformClient(conditional_cache=ConditionalCache(), json_codec=codec)
+    pool_request = MagicMock()
+    pool_request.return_value.__enter__.side_effect = \
+        [_http_response(200, b'{"id": "media_id"}', {"ETag": '"v1"'})] + [_http_response(304) for _ in range(4)]
+
+    with patch.object(client._pool, "request", pool_request):
+        responses = [client.Media.get(site_id="testsite", media_id="media_id") for _ in range(5)]
+
+    assert all(response.json_body == {"id": "media_id"} for response in responses)
+    assert codec.loads.call_count == 1
+
+def test_not_modified_response_to_caller_validators_is_not_stored():
+    conditional_cache = ConditionalCache()
+    client = JWPlatformClient(conditional_cache=conditional_cache, response_cache=ResponseCache())
+    pool_request = MagicMock()
+    pool_request.return_value.__enter__.side_effect = [
+        _http_response(304, headers={"ETag": '"v1"'}),
+        _http_response(200, b'{"id": "media_id"}', {"ETag": '"v1"'}),
+    ]
+
+    with patch.object(client._pool, "request", pool_request):
+        not_modified = client.request("GET", "/v2/sites/testsite/media/media_id/", headers={"If-None-Match": '"v1"'})
+        assert len(conditional_cache) == 0
+        response = client.Media.get(site_id="testsite", media_id="media_id")
+
+    assert not_modified.status == 304
+    assert "If-None-Match" not in pool_request.call_args_list[1][0][3]
+    assert response.status == 200
+    assert response.json_body == {"id": "media_id"}
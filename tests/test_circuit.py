@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import time
+
+import pytest
+
+from jwplatform.circuit import CircuitBreaker, CircuitOpenError, CircuitState
+from jwplatform.client import JWPlatformClient, JWPLATFORM_API_HOST
+from jwplatform.errors import ServerError
+from .mock import JWPlatformMock
+
+
+def _fail(circuit_breaker, host="host", route="route", status=503):
+    with circuit_breaker.attempt(host, route) as circuit:
+        circuit.record(status)
+
+
+def test_circuit_opens_after_consecutive_failures():
+    circuit_breaker = CircuitBreaker(failure_threshold=3)
+
+    for _ in range(3):
+        _fail(circuit_breaker)
+
+    assert circuit_breaker.state("host", "route") == CircuitState.open
+    with pytest.raises(CircuitOpenError):
+        _fail(circuit_breaker)
+
+def test_success_resets_failure_count():
+    circuit_breaker = CircuitBreaker(failure_threshold=2)
+
+    _fail(circuit_breaker)
+    _fail(circuit_breaker, status=200)
+    _fail(circuit_breaker)
+
+    assert circuit_breaker.state("host", "route") == CircuitState.closed
+
+def test_client_errors_and_connection_errors():
+    circuit_breaker = CircuitBreaker(failure_threshold=1)
+
+    _fail(circuit_breaker, status=404)
+    assert circuit_breaker.state("host", "route") == CircuitState.closed
+
+    with pytest.raises(ConnectionError):
+        with circuit_breaker.attempt("host", "route"):
+            raise ConnectionError()
+    assert circuit_breaker.state("host", "route") == CircuitState.open
+
+def test_circuits_are_keyed_by_host_and_route():
+    circuit_breaker = CircuitBreaker(failure_threshold=1)
+
+    _fail(circuit_breaker, route="analytics")
+
+    assert circuit_breaker.state("host", "analytics") == CircuitState.open
+    assert circuit_breaker.state("host", "management") == CircuitState.closed
+    assert circuit_breaker.state("other_host", "analytics") == CircuitState.closed
+
+def test_half_open_probe():
+    circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    _fail(circuit_breaker)
+    time.sleep(0.06)
+
+    with circuit_breaker.attempt("host", "route") as probe:
+        assert circuit_breaker.state("host", "route") == CircuitState.half_open
+        # Only one probe is let through at a time.
+        with pytest.raises(CircuitOpenError):
+            _fail(circuit_breaker, status=200)
+        probe.record(200)
+
+    assert circuit_breaker.state("host", "route") == CircuitState.closed
+
+def test_failed_probe_reopens_circuit():
+    circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    _fail(circuit_breaker)
+    time.sleep(0.06)
+
+    _fail(circuit_breaker)
+
+    assert circuit_breaker.state("host", "route") == CircuitState.open
+    with pytest.raises(CircuitOpenError):
+        _fail(circuit_breaker, status=200)
+
+def test_client_fails_fast_while_circuit_is_open():
+    circuit_breaker = CircuitBreaker(failure_threshold=2, failure_statuses=[599])
+    client = JWPlatformClient(circuit_breaker=circuit_breaker)
+
+    with JWPlatformMock() as mock_api:
+        for _ in range(2):
+            with pytest.raises(ServerError):
+                client.request(method="POST", path="/v2/test_server_error/")
+        with pytest.raises(CircuitOpenError):
+            client.request(method="POST", path="/v2/test_server_error/")
+
+    assert mock_api.testServerError.request_mock.call_count == 2
+    assert circuit_breaker.state(JWPLATFORM_API_HOST, "management") == CircuitState.open
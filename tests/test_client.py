@@ -3,6 +3,7 @@ from unittest.mock import patch
 
 from jwplatform.version import __version__
 from jwplatform.client import JWPlatformClient
+from jwplatform.codec import JSONCodec
 
 from .mock import JWPlatformMock
 
@@ -24,7 +25,7 @@ def test_request_sends():
     mock_api.testRequest.request_mock.assert_called_once()
 
 def test_request_modifies_input():
-    client = JWPlatformClient(secret="test_secret")
+    client = JWPlatformClient(secret="test_secret", json_codec=JSONCodec())
 
     with patch.object(client, 'raw_request') as mock_raw_request:
         client.request(
@@ -41,3 +42,12 @@ def test_request_modifies_input():
     assert kwargs["headers"]["User-Agent"] == f"jwplatform_client-python/{__version__}"
     assert kwargs["headers"]["Content-Type"] == "application/json"
     assert kwargs["headers"]["Authorization"] == "Bearer test_secret"
+
+def test_list_pages_stops_after_last_page():
+    client = JWPlatformClient()
+
+    with JWPlatformMock() as mock_api:
+        pages = list(client.Media.list_pages(site_id="testsite"))
+
+    assert len(pages) == 1
+    mock_api.listMedia.request_mock.assert_called_once()
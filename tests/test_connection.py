@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import http.client
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from jwplatform.client import JWPlatformClient
+from jwplatform.connection import HTTPConnectionPool, PoolExhaustedError, PoolManager
+from jwplatform.upload import _upload_to_s3
+
+from .mock import S3Mock
+
+
+def _make_pool(**kwargs):
+    pool = HTTPConnectionPool("example.com", **kwargs)
+    pool._new_connection = MagicMock(side_effect=lambda: MagicMock())
+    return pool
+
+
+def _make_connection():
+    connection = MagicMock()
+    connection.getresponse.return_value.status = 200
+    connection.getresponse.return_value.read.return_value = b'{"field": "value"}'
+    connection.getresponse.return_value.isclosed.return_value = True
+    return connection
+
+
+def test_pool_reuses_released_connection():
+    pool = _make_pool()
+
+    connection, reused = pool.get()
+    assert not reused
+    pool.put(connection)
+
+    assert pool.get() == (connection, True)
+    assert pool._new_connection.call_count == 1
+
+def test_pool_non_blocking_raises_when_exhausted():
+    pool = _make_pool(maxsize=1, block=False)
+    pool.get()
+
+    with pytest.raises(PoolExhaustedError):
+        pool.get()
+
+def test_pool_blocking_times_out_when_exhausted():
+    pool = _make_pool(maxsize=1, timeout=0.01)
+    pool.get()
+
+    with pytest.raises(PoolExhaustedError):
+        pool.get()
+
+def test_pool_blocking_waits_for_released_connection():
+    pool = _make_pool(maxsize=1)
+    connection, _ = pool.get()
+
+    threading.Timer(0.05, pool.put, args=(connection,)).start()
+
+    assert pool.get() == (connection, True)
+
+def test_pool_discard_frees_slot():
+    pool = _make_pool(maxsize=1, block=False)
+    connection, _ = pool.get()
+    pool.discard(connection)
+
+    connection.close.assert_called_once()
+    new_connection, reused = pool.get()
+    assert new_connection is not connection
+    assert not reused
+
+def test_pool_close_closes_connections_in_use_when_returned():
+    pool = _make_pool()
+    idle_connection, _ = pool.get()
+    connection, _ = pool.get()
+    pool.put(idle_connection)
+
+    pool.close()
+    idle_connection.close.assert_called_once()
+    connection.close.assert_not_called()
+    pool.put(connection)
+
+    connection.close.assert_called_once()
+    assert pool._idle == []
+    assert pool._num_connections == 0
+    # The pool can still be used after it was closed.
+    new_connection, reused = pool.get()
+    pool.put(new_connection)
+    assert not reused
+    assert len(pool._idle) == 1
+
+def test_pool_evicts_idle_connections():
+    pool = _make_pool(idle_timeout=0)
+    connection, _ = pool.get()
+    pool.put(connection)
+
+    new_connection, reused = pool.get()
+
+    connection.close.assert_called_once()
+    assert new_connection is not connection
+    assert not reused
+
+def test_pool_replaces_stale_connection():
+    pool = _make_pool()
+    stale_connection, _ = pool.get()
+    stale_connection.request.side_effect = http.client.RemoteDisconnected()
+    pool.put(stale_connection)
+
+    connection, response = pool.urlopen("GET", "/")
+
+    stale_connection.close.assert_called_once()
+    assert connection is not stale_connection
+    assert response is connection.getresponse.return_value
+
+def test_client_shared_across_threads():
+    client = JWPlatformClient(max_connections=4)
+    client._pool._new_connection = MagicMock(side_effect=_make_connection)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(
+            lambda _: client.raw_request("POST", "/v2/test_request/"), range(32)
+        ))
+
+    assert all(response.json_body == {"field": "value"} for response in responses)
+    assert client._pool._new_connection.call_count <= 4
+    assert len(client._pool._idle) == client._pool._new_connection.call_count
+
+def test_pool_manager_keeps_one_pool_per_host():
+    manager = PoolManager(maxsize=2)
+
+    pool = manager.connection_from_url("https://upload.example.com/part?1")
+
+    assert manager.connection_from_url("https://upload.example.com/part?2") is pool
+    assert manager.connection_from_url("http://upload.example.com/part?1") is not pool
+    assert manager.connection_from_url("https://other.example.com/part?1") is not pool
+    assert pool.secure and pool.maxsize == 2
+
+def test_upload_to_s3_reuses_connection():
+    with patch("jwplatform.upload._upload_pools", PoolManager()) as manager, S3Mock() as s3_api:
+        _upload_to_s3(b"first part", "http://s3server/upload-link?partNumber=1")
+        _upload_to_s3(b"second part", "http://s3server/upload-link?partNumber=2")
+        pool = manager.connection_from_url("http://s3server/upload-link")
+
+    assert s3_api.uploadToS3.request_mock.call_count == 2
+    assert pool._num_connections == 1
+    assert len(pool._idle) == 1
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from unittest.mock import patch
+
+from jwplatform.client import JWPlatformClient
+from jwplatform.pagination import AdaptivePageSizer, PageCursor
+
+
+class _Page:
+
+    def __init__(self, resources, page, page_length, total):
+        self._resources = resources
+        self.json_body = {"media": resources, "page": page, "page_length": page_length, "total": total}
+        self.body = b"x" * 100 * len(resources)
+
+    def __iter__(self):
+        return iter(self._resources)
+
+    def __len__(self):
+        return len(self._resources)
+
+
+def _fake_list(total):
+    requests = []
+
+    def list_media(query_params=None):
+        requests.append(dict(query_params))
+        page, page_length = query_params["page"], query_params["page_length"]
+        first = (page - 1) * page_length
+        return _Page([{"id": index} for index in range(first, min(first + page_length, total))],
+                     page, page_length, total)
+
+    return list_media, requests
+
+
+def test_sizer_grows_fast_small_pages():
+    sizer = AdaptivePageSizer(target_latency=1.0)
+
+    assert sizer.next_page_length(100, latency=0.1, size=1024) == 200
+    assert sizer.next_page_length(800, latency=0.1, size=1024) == 1000
+
+def test_sizer_shrinks_slow_pages():
+    sizer = AdaptivePageSizer(target_latency=1.0)
+
+    assert sizer.next_page_length(100, latency=5, size=1024) == 50
+    assert sizer.next_page_length(10, latency=5, size=1024) == 10
+
+def test_sizer_keeps_large_pages():
+    sizer = AdaptivePageSizer(target_latency=1.0, max_page_bytes=1024)
+
+    assert sizer.next_page_length(100, latency=0.1, size=1024) == 100
+
+def test_cursor_skips_resources_seen_before_page_length_change():
+    cursor = PageCursor({"page": 2, "page_length": 10}, AdaptivePageSizer())
+    list_media, _ = _fake_list(100)
+
+    assert cursor.next_query() == {"page": 2, "page_length": 10}
+    cursor.advance(list_media(query_params=cursor.next_query()), latency=0)
+    # 20 resources were seen, so page 2 of length 20 starts right after them
+    assert cursor.next_query() == {"page": 2, "page_length": 20}
+    assert cursor.skip == 0
+
+def test_cursor_grows_page_length_at_aligned_offset():
+    cursor = PageCursor({"page_length": 10}, AdaptivePageSizer())
+    list_media, _ = _fake_list(100)
+
+    cursor.advance(list_media(query_params=cursor.next_query()), latency=0)
+    # 10 resources were seen, which does not start a page of length 20
+    assert cursor.next_query() == {"page": 2, "page_length": 10}
+    cursor.advance(list_media(query_params=cursor.next_query()), latency=0)
+    assert cursor.next_query() == {"page": 2, "page_length": 20}
+    assert cursor.skip == 0
+
+def test_cursor_refetches_unaligned_page_after_shrinking():
+    cursor = PageCursor({"page": 2, "page_length": 15}, AdaptivePageSizer(min_page_length=1))
+    list_media, _ = _fake_list(100)
+
+    cursor.advance(list_media(query_params=cursor.next_query()), latency=5)
+    # 30 resources were seen, so page 5 of length 7 starts with 2 resources that were already seen
+    assert cursor.next_query() == {"page": 5, "page_length": 7}
+    assert cursor.skip == 2
+
+def test_iter_all_yields_every_resource_once():
+    client = JWPlatformClient()
+    list_media, requests = _fake_list(2500)
+
+    with patch.object(client.Media, "list", side_effect=lambda site_id, query_params=None: list_media(query_params)):
+        ids = [media["id"] for media in client.Media.iter_all("testsite")]
+
+    assert ids == list(range(2500))
+    assert requests[0]["page_length"] == 10
+    assert max(request["page_length"] for request in requests) > 500
+
+def test_iter_all_does_not_fetch_resources_again_while_page_length_grows():
+    client = JWPlatformClient()
+    list_media, requests = _fake_list(5000)
+
+    with patch.object(client.Media, "list", side_effect=lambda site_id, query_params=None: list_media(query_params)):
+        ids = [media["id"] for media in client.Media.iter_all("testsite")]
+
+    assert ids == list(range(5000))
+    starts = [(request["page"] - 1) * request["page_length"] for request in requests]
+    assert starts == sorted(set(starts))
+    assert sum(min(request["page_length"], 5000 - start) for request, start in zip(requests, starts)) == 5000
+
+def test_iter_all_without_adaptive_page_length():
+    client = JWPlatformClient()
+    list_media, requests = _fake_list(25)
+
+    with patch.object(client.Media, "list", side_effect=lambda site_id, query_params=None: list_media(query_params)):
+        ids = [media["id"] for media in client.Media.iter_all("testsite", {"page_length": 10},
+                                                               adaptive_page_length=False)]
+
+    assert ids == list(range(25))
+    assert [request["page"] for request in requests] == [1, 2, 3]
+
+def test_list_pages_prefetch_keeps_page_order():
+    client = JWPlatformClient()
+    list_media, requests = _fake_list(95)
+    in_flight = []
+    max_in_flight = []
+    lock = threading.Lock()
+
+    def slow_list_media(site_id, query_params=None):
+        with lock:
+            in_flight.append(1)
+            max_in_flight.append(len(in_flight))
+        # Later pages return faster so that they complete out of order.
+        time.sleep(0.05 / query_params["page"])
+        with lock:
+            in_flight.pop()
+        return list_media(query_params)
+
+    with patch.object(client.Media, "list", side_effect=slow_list_media):
+        pages = list(client.Media.list_pages("testsite", {"page_length": 10}, prefetch=4))
+
+    assert [page.json_body["page"] for page in pages] == list(range(1, 11))
+    assert [media["id"] for page in pages for media in page] == list(range(95))
+    assert len(requests) == 10
+    assert 1 < max(max_in_flight) <= 4
+
+def test_iter_all_prefetch_yields_every_resource_once():
+    client = JWPlatformClient()
+    list_media, _ = _fake_list(250)
+
+    with patch.object(client.Media, "list", side_effect=lambda site_id, query_params=None: list_media(query_params)):
+        ids = [media["id"] for media in client.Media.iter_all("testsite", {"page_length": 20}, prefetch=3)]
+
+    assert ids == list(range(250))
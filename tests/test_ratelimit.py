@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from jwplatform.client import JWPlatformClient
+from jwplatform.ratelimit import FileTokenBucket, RateLimit, RateLimiter, TokenBucket, route_for_url, \
+    ROUTE_ANALYTICS, ROUTE_MANAGEMENT, ROUTE_UPLOADS
+from .mock import JWPlatformMock
+
+
+def test_route_for_url():
+    assert route_for_url("/v2/sites/testsite/media/?page=1") == ROUTE_MANAGEMENT
+    assert route_for_url("/v2/sites/testsite/analytics/queries/") == ROUTE_ANALYTICS
+    assert route_for_url("/v2/uploads/upload_id/parts?page=1") == ROUTE_UPLOADS
+    assert route_for_url("https://api.jwplayer.com/v2/uploads/upload_id/complete") == ROUTE_UPLOADS
+
+def test_token_bucket_paces_requests():
+    rate_limiter = RateLimiter({ROUTE_MANAGEMENT: RateLimit(20, 1.0, burst=1)})
+    started = time.monotonic()
+
+    for _ in range(5):
+        rate_limiter.acquire("/v2/sites/testsite/media/")
+
+    assert time.monotonic() - started >= 0.19
+
+def test_routes_have_separate_budgets():
+    rate_limiter = RateLimiter({ROUTE_MANAGEMENT: RateLimit(1, 60.0), ROUTE_ANALYTICS: RateLimit(1, 60.0)})
+
+    rate_limiter.acquire("/v2/sites/testsite/media/")
+    started = time.monotonic()
+    rate_limiter.acquire("/v2/sites/testsite/analytics/queries/")
+
+    assert time.monotonic() - started < 0.1
+
+def test_retry_after_pauses_route():
+    rate_limiter = RateLimiter()
+
+    rate_limiter.update("/v2/sites/testsite/media/", 429, {"Retry-After": "30"})
+
+    assert rate_limiter._bucket("/v2/sites/testsite/media/").reserve() > 29
+    assert rate_limiter._bucket("/v2/uploads/upload_id/parts").reserve() == 0
+
+def test_rate_limit_headers_limit_remaining_tokens():
+    bucket = TokenBucket(rate=1.0, capacity=100)
+
+    bucket.sync(limit=50, remaining=1)
+
+    assert bucket.capacity == 50
+    assert bucket.reserve() == 0
+    assert bucket.reserve() > 0
+
+def test_exhausted_window_pauses_until_reset():
+    rate_limiter = RateLimiter()
+
+    rate_limiter.update("/v2/sites/testsite/media/", 200, {"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "0",
+                                                          "X-RateLimit-Reset": str(time.time() + 10)})
+
+    assert 9 < rate_limiter._bucket("/v2/sites/testsite/media/").reserve() <= 10
+
+def test_shared_rate_limit_between_limiters(tmp_path):
+    limits = {ROUTE_MANAGEMENT: RateLimit(2, 60.0)}
+    first = RateLimiter(limits, shared_dir=str(tmp_path))
+    second = RateLimiter(limits, shared_dir=str(tmp_path))
+
+    first.acquire("/v2/sites/testsite/media/")
+    second.acquire("/v2/sites/testsite/media/")
+
+    assert first._bucket("/v2/sites/testsite/media/").reserve() > 0
+    assert second._bucket("/v2/sites/testsite/media/").reserve() > 0
+
+def test_async_acquire_waits_for_token():
+    rate_limiter = RateLimiter({ROUTE_MANAGEMENT: RateLimit(20, 1.0, burst=1)})
+
+    async def run():
+        started = time.monotonic()
+        await asyncio.gather(*[rate_limiter.acquire_async("/v2/sites/testsite/media/") for _ in range(3)])
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.09
+
+def test_client_requests_go_through_rate_limiter():
+    rate_limiter = Mock()
+    client = JWPlatformClient(rate_limiter=rate_limiter)
+
+    with JWPlatformMock():
+        client.request(method="POST", path="/v2/test_request/")
+
+    rate_limiter.acquire.assert_called_once_with("/v2/test_request/")
+    assert rate_limiter.update.call_args[0][:2] == ("/v2/test_request/", 200)
+
+def test_file_token_bucket_requires_fcntl(tmp_path):
+    with patch("jwplatform.ratelimit.fcntl", None):
+        with pytest.raises(RuntimeError):
+            FileTokenBucket(str(tmp_path / "bucket.json"), rate=10, capacity=10)
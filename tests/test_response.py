@@ -1,11 +1,31 @@
 # -*- coding: utf-8 -*-
-from unittest.mock import patch
+import gzip
+import io
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
 
 from jwplatform.client import JWPlatformClient
+from jwplatform.codec import JSONCodec, OrjsonCodec, orjson
+from jwplatform.connection import HTTPConnectionPool
+from jwplatform.errors import ClientError
+from jwplatform.response import APIResponse, StreamingResourcesResponse
 
 from .mock import JWPlatformMock
 
 
+class _CompressedResponse(io.BytesIO):
+
+    def __init__(self, body, content_encoding):
+        super().__init__(body)
+        self.status = 200
+        self.headers = {"Content-Encoding": content_encoding}
+
+
 def test_success_response_object():
     client = JWPlatformClient()
 
@@ -39,3 +59,188 @@ def test_resources_response():
         assert media["id"] == "mediaid1"
         assert media["type"] == "media"
     assert isinstance(response, client.Media.__class__), response.__class__.__name__
+
+def test_compressed_responses_are_decoded():
+    payload = {"media": [{"id": f"media{index}", "title": "x" * 100} for index in range(1000)]}
+    body = json.dumps(payload).encode("utf-8")
+    raw_deflate = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+
+    for compressed, content_encoding in [
+        (gzip.compress(body), "gzip"),
+        (zlib.compress(body), "deflate"),
+        (raw_deflate.compress(body) + raw_deflate.flush(), "deflate"),
+    ]:
+        response = APIResponse(_CompressedResponse(compressed, content_encoding))
+
+        assert response.body == body
+        assert response.json_body == payload
+
+def test_requests_accept_compressed_responses():
+    client = JWPlatformClient()
+
+    with patch.object(client, 'raw_request') as mock_raw_request:
+        client.request("GET", "/v2/test_request/")
+
+    assert mock_raw_request.call_args[1]["headers"]["Accept-Encoding"] == "gzip, deflate"
+
+def test_json_body_is_decoded_on_first_access():
+    codec = Mock(wraps=JSONCodec())
+    response = APIResponse(_CompressedResponse(gzip.compress(b'{"field": "value"}'), "gzip"), codec=codec)
+
+    codec.loads.assert_not_called()
+    assert response.json_body == {"field": "value"}
+    assert response.json_body == {"field": "value"}
+    codec.loads.assert_called_once()
+
+def test_codecs_encode_and_decode():
+    codecs = [JSONCodec()]
+    if orjson is not None:
+        codecs.append(OrjsonCodec())
+
+    for codec in codecs:
+        body = codec.dumps({"field": "value", 1: [1.5, None]})
+
+        assert codec.loads(body if isinstance(body, bytes) else body.encode("utf-8")) == \
+            {"field": "value", "1": [1.5, None]}
+
+def test_orjson_codec_requires_orjson():
+    with patch("jwplatform.codec.orjson", None):
+        with pytest.raises(ImportError, match=r"jwplatform\[orjson\]"):
+            OrjsonCodec()
+
+def test_client_encodes_requests_with_its_codec():
+    codec = Mock(wraps=JSONCodec())
+    client = JWPlatformClient(json_codec=codec)
+
+    with JWPlatformMock():
+        response = client.request("POST", "/v2/test_request/", body={"field": "value"})
+
+    codec.dumps.assert_called_once_with({"field": "value"})
+    assert response.json_body == {"field": "value"}
+    codec.loads.assert_called_once()
+
+def test_response_types_are_created_once():
+    client = JWPlatformClient()
+
+    with JWPlatformMock():
+        first = client.Media.get(site_id="testsite", media_id="mediaid1")
+        second = client.Media.get(site_id="testsite", media_id="mediaid2")
+        first_list = client.Media.list(site_id="testsite")
+        second_list = client.Media.list(site_id="testsite")
+
+    assert type(first) is type(second)
+    assert type(first_list) is type(second_list)
+    assert type(first) is not type(first_list)
+    assert second.json_body["id"] == "mediaid2"
+    assert issubclass(ClientError, APIResponse)
+
+class _ChunkedResponse:
+
+    def __init__(self, body, chunk_size, content_encoding=None):
+        self.status = 200
+        self.headers = {"Content-Encoding": content_encoding} if content_encoding else {}
+        self.chunks = [body[index:index + chunk_size] for index in range(0, len(body), chunk_size)]
+        self.chunks_read = 0
+
+    def read1(self, amt=None):
+        if self.chunks_read == len(self.chunks):
+            return b""
+        self.chunks_read += 1
+        return self.chunks[self.chunks_read - 1]
+
+    read = read1
+
+
+def test_streaming_response_yields_resources_as_they_arrive():
+    media = [{"id": f"media{index}", "title": "ü" * 50, "duration": index / 3} for index in range(100)]
+    body = json.dumps({"page": 1, "media": media, "total": 100}).encode("utf-8")
+
+    for response in [_ChunkedResponse(body, 7), _ChunkedResponse(body, 1)]:
+        release = Mock()
+        with StreamingResourcesResponse(response, "media", release=release) as streaming_response:
+            first = next(streaming_response)
+            assert first == media[0]
+            assert response.chunks_read < len(response.chunks)
+            assert streaming_response.json_body == {"page": 1}
+            assert [first] + list(streaming_response) == media
+
+        assert len(streaming_response) == 100
+        assert streaming_response.json_body == {"page": 1, "total": 100}
+        release.assert_called_once()
+
+def test_streaming_response_decompresses_body():
+    body = json.dumps({"media": [{"id": "media1"}, {"id": "media2"}], "page_length": 2}).encode("utf-8")
+    response = _ChunkedResponse(gzip.compress(body), 5, content_encoding="gzip")
+
+    with StreamingResourcesResponse(response, "media") as streaming_response:
+        assert [resource["id"] for resource in streaming_response] == ["media1", "media2"]
+
+    assert streaming_response.json_body == {"page_length": 2}
+
+def test_stream_returns_connection_to_pool():
+    client = JWPlatformClient()
+
+    with JWPlatformMock():
+        with client.Media.stream(site_id="testsite") as response:
+            resources = list(response)
+
+    assert resources == [{"id": "mediaid1", "type": "media"}]
+    assert response.status == 200
+    assert len(client._pool._idle) == 1
+
+class _MediaPageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"media": [{"id": "media1"}, {"id": "media2"}], "page": 1}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_stream_reuses_connection_of_body_with_content_length():
+    server = HTTPServer(("127.0.0.1", 0), _MediaPageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = JWPlatformClient()
+    client._pool = HTTPConnectionPool("127.0.0.1", port=server.server_address[1], secure=False)
+
+    try:
+        for _ in range(3):
+            with client.Media.stream(site_id="testsite") as response:
+                assert [resource["id"] for resource in response] == ["media1", "media2"]
+            assert len(client._pool._idle) == 1
+    finally:
+        client._pool.close()
+        server.shutdown()
+        server.server_close()
+
+    assert client._pool._num_connections == 0
+
+def test_lean_responses_keep_only_decoded_body():
+    client = JWPlatformClient(lean_responses=True)
+
+    with JWPlatformMock():
+        response = client.Media.get(site_id="testsite", media_id="mediaid1")
+        with pytest.raises(ClientError) as error:
+            client.raw_request("POST", "/v2/test_bad_request/")
+
+    assert response.json_body == {"id": "mediaid1", "type": "media"}
+    assert response.status == 200
+    assert response.response is None
+    assert response.body is None
+    assert response.headers is not None
+    assert error.value.response is None
+    assert error.value.has_error_code("invalid_body")
+    assert "invalid_body" in str(error.value)
+
+def test_lean_response_keeps_body_that_is_not_json():
+    response = APIResponse(_CompressedResponse(gzip.compress(b"not json"), "gzip"), lean=True)
+
+    assert response.json_body is None
+    assert response.body == b"not json"
+    assert response.response is None
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from jwplatform.async_client import AsyncJWPlatformClient
+from jwplatform.client import JWPlatformClient
+from jwplatform.errors import APIError
+from jwplatform.retry import RetryBudget, RetryPolicy
+
+
+def _error_response(status, headers=None):
+    response = Mock(status=status, reason="Error", headers=headers or {})
+    response.read.return_value = b""
+    return response
+
+
+def test_backoff_uses_full_jitter():
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=4.0)
+
+    delays = [policy.backoff(attempt) for attempt in (1, 2, 3, 4, 5) for _ in range(50)]
+
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert max(policy.backoff(1) for _ in range(50)) <= 1.0
+    assert len(set(delays)) > 1
+
+def test_backoff_honors_retry_after():
+    policy = RetryPolicy()
+    error = APIError.from_response(_error_response(429, {"Retry-After": "7"}))
+
+    assert policy.backoff(1, error) == 7.0
+
+def test_retry_after_beyond_maximum_is_not_retried():
+    policy = RetryPolicy(max_retry_after=5)
+    error = APIError.from_response(_error_response(503, {"Retry-After": "60"}))
+
+    assert policy.next_delay("GET", 1, error) is None
+
+def test_only_idempotent_methods_are_retried():
+    policy = RetryPolicy()
+    error = APIError.from_response(_error_response(503))
+
+    assert policy.is_retryable("GET", error)
+    assert policy.is_retryable("PUT", error)
+    assert not policy.is_retryable("POST", error)
+    assert not policy.is_retryable("PATCH", error)
+    assert not policy.is_retryable("GET", APIError.from_response(_error_response(404)))
+    assert policy.is_retryable("GET", ConnectionError())
+
+def test_retry_budget_stops_retries():
+    budget = RetryBudget(ratio=0, min_per_second=0, max_balance=2)
+
+    assert budget.try_withdraw()
+    assert budget.try_withdraw()
+    assert not budget.try_withdraw()
+    budget.record_request()
+    assert not budget.try_withdraw()
+
+def test_request_retries_unavailable_service():
+    client = JWPlatformClient(retry_policy=RetryPolicy(backoff_base=0.001))
+    errors = [APIError.from_response(_error_response(503)), APIError.from_response(_error_response(502))]
+
+    with patch.object(client, "raw_request", side_effect=errors + ["response"]) as mock_raw_request:
+        assert client.request("GET", "/v2/test_request/") == "response"
+
+    assert mock_raw_request.call_count == 3
+
+def test_request_does_not_retry_post():
+    client = JWPlatformClient(retry_policy=RetryPolicy(backoff_base=0.001))
+
+    with patch.object(client, "raw_request", side_effect=APIError.from_response(_error_response(503))) \
+            as mock_raw_request:
+        with pytest.raises(APIError):
+            client.request("POST", "/v2/test_request/")
+
+    assert mock_raw_request.call_count == 1
+
+def test_exhausted_budget_fails_request():
+    budget = RetryBudget(ratio=0, min_per_second=0, max_balance=1)
+    client = JWPlatformClient(retry_policy=RetryPolicy(max_attempts=5, backoff_base=0.001, budget=budget))
+
+    with patch.object(client, "raw_request", side_effect=ConnectionError()) as mock_raw_request:
+        with pytest.raises(ConnectionError):
+            client.request("GET", "/v2/test_request/")
+
+    assert mock_raw_request.call_count == 2
+
+def test_async_request_retries_unavailable_service():
+    client = AsyncJWPlatformClient(retry_policy=RetryPolicy(backoff_base=0.001))
+    calls = []
+
+    async def raw_request(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise APIError.from_response(_error_response(504))
+        return "response"
+
+    async def run():
+        with patch.object(client, "raw_request", raw_request):
+            return await client.request("GET", "/v2/test_request/")
+
+    assert asyncio.run(run()) == "response"
+    assert len(calls) == 2
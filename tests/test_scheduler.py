@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import pytest
+
+from jwplatform.scheduler import UploadScheduler
+
+
+def _read_all(body, size=1024 * 1024):
+    data = []
+    while True:
+        chunk = body.read(size)
+        if not chunk:
+            return b"".join(data)
+        data.append(bytes(chunk))
+
+
+def test_throttled_body_returns_whole_content():
+    scheduler = UploadScheduler(max_bytes_per_second=100 * 1024 * 1024, chunk_size=1024)
+    content = bytes(range(256)) * 100
+
+    assert _read_all(scheduler.share().throttle(content)) == content
+    assert _read_all(scheduler.share().throttle(memoryview(content))) == content
+
+def test_scheduler_enforces_bandwidth_ceiling():
+    scheduler = UploadScheduler(max_bytes_per_second=1024 * 1024, chunk_size=16 * 1024)
+    started = time.monotonic()
+
+    _read_all(scheduler.share().throttle(b"x" * 256 * 1024))
+
+    # The first 102 KB are the burst, the rest is sent at 1 MB/s.
+    assert time.monotonic() - started >= 0.14
+
+def test_scheduler_shares_bandwidth_by_priority():
+    scheduler = UploadScheduler(max_bytes_per_second=1024 * 1024, burst=16 * 1024, chunk_size=16 * 1024)
+    sent = {"high": 0, "low": 0}
+    sent_when_high_finished = []
+    lock = threading.Lock()
+    start = threading.Barrier(2)
+
+    def upload(name, priority):
+        share = scheduler.share(priority)
+        start.wait()
+        for _ in range(16):
+            share.acquire(16 * 1024)
+            with lock:
+                sent[name] += 16 * 1024
+        if name == "high":
+            sent_when_high_finished.append(sent["low"])
+
+    threads = [threading.Thread(target=upload, args=("high", 3)), threading.Thread(target=upload, args=("low", 1))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # While both uploads were waiting, the low priority one got about a third of the bytes of the high priority one.
+    assert sent_when_high_finished[0] <= 256 * 1024 // 2
+
+def test_scheduler_rejects_invalid_arguments():
+    with pytest.raises(ValueError):
+        UploadScheduler(max_bytes_per_second=0)
+    with pytest.raises(ValueError):
+        UploadScheduler(max_bytes_per_second=1024).share(priority=0)
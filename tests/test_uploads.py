@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 import math
+import os
 import sys
+import tempfile
+import threading
 # import mock
 import http.client
 from hashlib import md5
@@ -13,7 +16,10 @@ from jwplatform.client import JWPlatformClient, JWPLATFORM_API_HOST
 import logging
 
 # from .mock import JWPlatformMock
-from jwplatform.upload import UploadType, MaxRetriesExceededError, S3UploadError, UploadContext
+from jwplatform.upload import UploadType, MaxRetriesExceededError, S3UploadError, UploadContext, SingleUpload, \
+    MultipartUpload, UploadJournal, PartHashManifest, UnrecoverableError, plan_upload, _get_bytes_hash, \
+    MAX_PART_COUNT, MIN_PART_SIZE, UPLOAD_BLOCK_SIZE, UploadEventType
+from jwplatform.scheduler import UploadScheduler
 from tests.mock import JWPlatformMock, S3Mock
 
 
@@ -269,7 +275,7 @@ class TestUploads(TestCase):
         retry_count = 3
         with open(file_absolute_path, "rb") as file:
             kwargs = {'target_part_size': 5 * 1024 * 1024, 'retry_count': retry_count, 'base_url': JWPLATFORM_API_HOST,
-                      'site_id': 'siteDEid'}
+                      'site_id': 'siteDEid', 'max_workers': 1}
             with JWPlatformMock() as mock_api, S3Mock() as s3_api:
                 upload_context = media_client_instance.create_media_and_get_upload_context(file, **kwargs)
                 self.assertTrue(upload_context.upload_method == UploadType.multipart.value)
@@ -387,3 +393,446 @@ class TestUploads(TestCase):
                 mock_api.completeUpload.request_mock.assert_not_called()
                 mock_file.assert_called_with(file_absolute_path, "rb")
                 s3_upload_response.assert_called_once()
+
+    @patch("builtins.open", new_callable=mock_open, read_data=file_content_mock_data_large)
+    @patch("os.stat")
+    @patch("jwplatform.upload._get_returned_hash")
+    @patch("jwplatform.upload._upload_to_s3")
+    @patch("jwplatform.upload.MultipartUpload._mark_upload_completion")
+    @patch("jwplatform.upload.MultipartUpload._retrieve_part_links")
+    def test_upload_method_with_concurrent_multipart_upload_success(self, retrieve_part_links, mark_upload_completion,
+                                                                    s3_upload_response, get_returned_hash, os_stat,
+                                                                    mock_file):
+        target_part_size = 5 * 1024 * 1024
+        part_count = math.ceil(len(self.file_content_mock_data_large) / target_part_size)
+        part_hash = md5(self.file_content_mock_data_large[:target_part_size]).hexdigest()
+        get_returned_hash.return_value = f'\"{part_hash}\"'
+        os_stat.return_value.st_size = len(self.file_content_mock_data_large)
+        retrieve_part_links.return_value = _get_parts_responses(part_count)
+        client = JWPlatformClient()
+        media_client_instance = client.Media
+        with open("mock_file_path", "rb") as file:
+            kwargs = {'target_part_size': target_part_size, 'retry_count': 3, 'max_workers': 4,
+                      'max_in_flight_bytes': 3 * target_part_size}
+            upload_context = UploadContext(UploadType.multipart.value, 'NL3OL1JB', 'upload_token', None)
+            media_client_instance.upload(file, upload_context, **kwargs)
+        self.assertEqual(s3_upload_response.call_count, part_count)
+        uploaded_parts = sorted(call.args[0] for call in s3_upload_response.call_args_list)
+        self.assertEqual(b''.join(uploaded_parts), self.file_content_mock_data_large)
+        mark_upload_completion.assert_called_once()
+
+    @patch("builtins.open", new_callable=mock_open, read_data=file_content_mock_data_large)
+    @patch("os.stat")
+    @patch("jwplatform.upload._upload_to_s3")
+    @patch("jwplatform.upload.MultipartUpload._mark_upload_completion")
+    @patch("jwplatform.upload.MultipartUpload._retrieve_part_links")
+    def test_upload_method_with_concurrent_multipart_upload_throws_when_retries_exceeded(self, retrieve_part_links,
+                                                                                         mark_upload_completion,
+                                                                                         s3_upload_response, os_stat,
+                                                                                         mock_file):
+        target_part_size = 5 * 1024 * 1024
+        part_count = math.ceil(len(self.file_content_mock_data_large) / target_part_size)
+        os_stat.return_value.st_size = len(self.file_content_mock_data_large)
+        retrieve_part_links.return_value = _get_parts_responses(part_count)
+        s3_upload_response.side_effect = S3UploadError
+        client = JWPlatformClient()
+        media_client_instance = client.Media
+        with open("mock_file_path", "rb") as file:
+            kwargs = {'target_part_size': target_part_size, 'retry_count': 2, 'max_workers': 4}
+            upload_context = UploadContext(UploadType.multipart.value, 'NL3OL1JB', 'upload_token', None)
+            with self.assertRaises(MaxRetriesExceededError):
+                media_client_instance.upload(file, upload_context, **kwargs)
+        mark_upload_completion.assert_not_called()
+        self.assertLess(s3_upload_response.call_count, part_count * 2)
+
+    @patch("jwplatform.upload._upload_to_s3")
+    def test_direct_upload_streams_file_and_rewinds_on_retry(self, s3_upload_response):
+        content = b'0123456789' * 300 * 1024
+        file_hash = md5(content).hexdigest()
+        sent_bodies = []
+
+        def upload_to_s3(body, upload_link, content_length=None, circuit_breaker=None):
+            sent_bodies.append((body.read(), content_length))
+            if len(sent_bodies) == 1:
+                raise S3UploadError
+            response = Mock()
+            response.headers = {'ETag': f'\"{file_hash}\"'}
+            return response
+
+        s3_upload_response.side_effect = upload_to_s3
+        with tempfile.TemporaryFile() as file:
+            file.write(content)
+            file.seek(0)
+            upload_context = UploadContext(UploadType.direct.value, None, None, 'http://s3server/upload-link')
+            SingleUpload('http://s3server/upload-link', file, 3, upload_context).upload()
+        self.assertEqual(sent_bodies, [(content, len(content)), (content, len(content))])
+
+    @patch("jwplatform.upload._upload_to_s3")
+    @patch("jwplatform.upload.MultipartUpload._mark_upload_completion")
+    @patch("jwplatform.upload.MultipartUpload._retrieve_part_links")
+    def test_multipart_upload_reads_parts_into_reused_buffers(self, retrieve_part_links, mark_upload_completion,
+                                                              s3_upload_response):
+        target_part_size = 5 * 1024 * 1024
+        content = os.urandom(2 * target_part_size + 1024)
+        retrieve_part_links.return_value = _get_parts_responses(3)
+        sent_parts = []
+        buffers = set()
+
+        def upload_to_s3(bytes_chunk, upload_link, circuit_breaker=None):
+            self.assertIsInstance(bytes_chunk, memoryview)
+            buffers.add(id(bytes_chunk.obj))
+            sent_parts.append(bytes(bytes_chunk))
+            response = Mock()
+            response.headers = {'ETag': f'\"{md5(bytes_chunk).hexdigest()}\"'}
+            return response
+
+        s3_upload_response.side_effect = upload_to_s3
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'video.mp4')
+            with open(file_path, 'wb') as file:
+                file.write(content)
+            with open(file_path, 'rb') as file:
+                upload_context = UploadContext(UploadType.multipart.value, 'NL3OL1JB', 'upload_token', None)
+                MultipartUpload(Mock(), file, target_part_size, 3, upload_context).upload()
+        self.assertEqual(b''.join(sent_parts), content)
+        # One buffer holds the part being sent while the next part is read into the other.
+        self.assertEqual(len(buffers), 2)
+        mark_upload_completion.assert_called_once()
+
+    @patch("jwplatform.upload._upload_to_s3")
+    @patch("jwplatform.upload.MultipartUpload._mark_upload_completion")
+    @patch("jwplatform.upload.MultipartUpload._retrieve_part_links")
+    def test_multipart_upload_hashes_next_part_while_sending(self, retrieve_part_links, mark_upload_completion,
+                                                             s3_upload_response):
+        target_part_size = 5 * 1024 * 1024
+        content = os.urandom(2 * target_part_size)
+        retrieve_part_links.return_value = _get_parts_responses(2)
+        hashed_parts = []
+        second_part_hashed = threading.Event()
+
+        def get_bytes_hash(bytes_chunk):
+            hashed_parts.append(bytes(bytes_chunk[:16]))
+            if len(hashed_parts) == 2:
+                second_part_hashed.set()
+            return md5(bytes_chunk).hexdigest()
+
+        def upload_to_s3(bytes_chunk, upload_link, circuit_breaker=None):
+            # The first part is only sent once the second part has been hashed on the worker thread.
+            if len(hashed_parts) == 1:
+                self.assertTrue(second_part_hashed.wait(5))
+            response = Mock()
+            response.headers = {'ETag': f'\"{md5(bytes_chunk).hexdigest()}\"'}
+            return response
+
+        s3_upload_response.side_effect = upload_to_s3
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'video.mp4')
+            with open(file_path, 'wb') as file:
+                file.write(content)
+            with patch("jwplatform.upload._get_bytes_hash", side_effect=get_bytes_hash), open(file_path, 'rb') as file:
+                upload_context = UploadContext(UploadType.multipart.value, 'NL3OL1JB', 'upload_token', None)
+                MultipartUpload(Mock(), file, target_part_size, 3, upload_context).upload()
+        self.assertEqual(hashed_parts, [content[:16], content[target_part_size:target_part_size + 16]])
+        self.assertEqual(s3_upload_response.call_count, 2)
+        mark_upload_completion.assert_called_once()
+
+    def test_upload_context_round_trips_through_json(self):
+        upload_context = UploadContext(UploadType.multipart.value, 'NL3OL1JB', 'upload_token', None)
+
+        restored = UploadContext.from_json(upload_context.to_json())
+
+        self.assertEqual(restored.to_dict(), upload_context.to_dict())
+        self.assertTrue(restored.can_resume())
+
+    @patch("jwplatform.upload._upload_to_s3")
+    @patch("jwplatform.upload.MultipartUpload._mark_upload_completion")
+    @patch("jwplatform.upload.MultipartUpload._retrieve_part_links")
+    def test_multipart_upload_resumes_from_journal(self, retrieve_part_links, mark_upload_completion,
+                                                   s3_upload_response):
+        target_part_size = 5 * 1024 * 1024
+        content = os.urandom(2 * target_part_size + 1024)
+        retrieve_part_links.return_value = _get_parts_responses(3)
+        sent_parts = []
+
+        def upload_to_s3(bytes_chunk, upload_link, circuit_breaker=None):
+            if len(sent_parts) == 2:
+                raise OSError("Connection lost")
+            sent_parts.append(bytes(bytes_chunk))
+            response = Mock()
+            response.headers = {'ETag': f'\"{md5(bytes_chunk).hexdigest()}\"'}
+            return response
+
+        s3_upload_response.side_effect = upload_to_s3
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'video.mp4')
+            journal_path = os.path.join(directory, 'video.mp4.journal')
+            with open(file_path, 'wb') as file:
+                file.write(content)
+            upload_context = UploadContext(UploadType.multipart.value, 'NL3OL1JB', 'upload_token', None)
+            with open(file_path, 'rb') as file, self.assertRaises(MaxRetriesExceededError):
+                MultipartUpload(Mock(), file, target_part_size, 1, upload_context,
+                                journal=UploadJournal(journal_path)).upload()
+
+            # A new process only has the journal to go on.
+            journal = UploadJournal(journal_path)
+            self.assertEqual(journal.upload_context.to_dict(), upload_context.to_dict())
+            self.assertEqual(len(sent_parts), 2)
+            s3_upload_response.reset_mock(side_effect=True)
+            s3_upload_response.return_value.headers = {'ETag': f'\"{md5(content[2 * target_part_size:]).hexdigest()}\"'}
+            with open(file_path, 'rb') as file:
+                MultipartUpload(Mock(), file, target_part_size, 1, journal.upload_context, journal=journal).upload()
+
+            self.assertEqual(bytes(s3_upload_response.call_args[0][0]), content[2 * target_part_size:])
+            self.assertEqual(s3_upload_response.call_count, 1)
+            mark_upload_completion.assert_called_once()
+            self.assertFalse(os.path.exists(journal_path))
+
+    def test_part_hash_manifest_is_computed_once(self):
+        part_size = 1024
+        content = os.urandom(3 * part_size + 10)
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'video.mp4')
+            with open(file_path, 'wb') as file:
+                file.write(content)
+            manifest = PartHashManifest(os.path.join(directory, 'video.mp4.md5'), max_workers=4)
+
+            hashes = manifest.part_hashes(file_path, part_size)
+            with patch("jwplatform.upload._get_part_hash") as get_part_hash:
+                self.assertEqual(manifest.part_hashes(file_path, part_size), hashes)
+                get_part_hash.assert_not_called()
+
+        self.assertEqual(hashes, [md5(content[offset:offset + part_size]).hexdigest()
+                                  for offset in range(0, len(content), part_size)])
+
+    @patch("jwplatform.upload._upload_to_s3")
+    @patch("jwplatform.upload.MultipartUpload._mark_upload_completion")
+    @patch("jwplatform.upload.MultipartUpload._retrieve_part_links")
+    def test_multipart_upload_resume_verifies_uploaded_parts_against_manifest(self, retrieve_part_links,
+                                                                              mark_upload_completion,
+                                                                              s3_upload_response):
+        target_part_size = 5 * 1024 * 1024
+        content = os.urandom(2 * target_part_size + 1024)
+        parts = _get_parts_responses(3)
+        parts['parts'][0]['etag'] = md5(content[:target_part_size]).hexdigest()
+        parts['parts'][1]['etag'] = md5(content[target_part_size:2 * target_part_size]).hexdigest()
+        retrieve_part_links.return_value = parts
+        s3_upload_response.return_value.headers = {'ETag': f'\"{md5(content[2 * target_part_size:]).hexdigest()}\"'}
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'video.mp4')
+            with open(file_path, 'wb') as file:
+                file.write(content)
+            manifest = PartHashManifest(os.path.join(directory, 'video.mp4.md5'))
+            manifest.part_hashes(file_path, target_part_size)
+            upload_context = UploadContext(UploadType.multipart.value, 'NL3OL1JB', 'upload_token', None)
+            with patch("jwplatform.upload._get_bytes_hash", side_effect=_get_bytes_hash) as get_bytes_hash, \
+                    open(file_path, 'rb') as file:
+                MultipartUpload(Mock(), file, target_part_size, 1, upload_context, manifest=manifest).upload()
+
+            get_bytes_hash.assert_not_called()
+            self.assertEqual(bytes(s3_upload_response.call_args[0][0]), content[2 * target_part_size:])
+            mark_upload_completion.assert_called_once()
+
+            parts['parts'][1]['etag'] = 'wrong_hash'
+            with open(file_path, 'rb') as file, self.assertRaises(UnrecoverableError):
+                MultipartUpload(Mock(), file, target_part_size, 1, upload_context, manifest=manifest).upload()
+
+    @patch("jwplatform.upload._upload_to_s3")
+    @patch("jwplatform.upload.MultipartUpload._mark_upload_completion")
+    @patch("jwplatform.upload.MultipartUpload._retrieve_part_links")
+    def test_multipart_upload_uses_part_hashes_of_manifest(self, retrieve_part_links, mark_upload_completion,
+                                                           s3_upload_response):
+        target_part_size = 5 * 1024 * 1024
+        content = os.urandom(2 * target_part_size + 1024)
+        retrieve_part_links.return_value = _get_parts_responses(3)
+
+        def upload_to_s3(bytes_chunk, upload_link, circuit_breaker=None):
+            response = Mock()
+            response.headers = {'ETag': f'\"{md5(bytes_chunk).hexdigest()}\"'}
+            return response
+
+        s3_upload_response.side_effect = upload_to_s3
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'video.mp4')
+            with open(file_path, 'wb') as file:
+                file.write(content)
+            for max_workers in (1, 2):
+                upload_context = UploadContext(UploadType.multipart.value, 'NL3OL1JB', 'upload_token', None)
+                manifest = PartHashManifest(os.path.join(directory, 'video.mp4.md5'))
+                with patch("jwplatform.upload._get_bytes_hash") as get_bytes_hash, open(file_path, 'rb') as file:
+                    MultipartUpload(Mock(), file, target_part_size, 1, upload_context, max_workers=max_workers,
+                                    manifest=manifest).upload()
+
+                get_bytes_hash.assert_not_called()
+                self.assertEqual(s3_upload_response.call_count, 3 * max_workers)
+
+    def test_plan_upload_uses_direct_upload_for_small_files(self):
+        upload_plan = plan_upload(4 * 1024 * 1024)
+
+        self.assertEqual(upload_plan.upload_method, UploadType.direct.value)
+        self.assertEqual(upload_plan.max_workers, 1)
+
+    def test_plan_upload_stays_within_part_count_limit(self):
+        file_size = 24 * 1000 * 1024 * 1024
+        upload_plan = plan_upload(file_size, target_part_size=MIN_PART_SIZE)
+
+        self.assertEqual(upload_plan.upload_method, UploadType.multipart.value)
+        self.assertLessEqual(math.ceil(file_size / upload_plan.part_size), MAX_PART_COUNT)
+        self.assertEqual(upload_plan.part_size % (1024 * 1024), 0)
+
+    def test_plan_upload_sizes_parts_from_throughput_and_memory(self):
+        upload_plan = plan_upload(1024 * 1024 * 1024, throughput=2 * 1024 * 1024, memory_budget=1024 * 1024 * 1024)
+
+        self.assertEqual(upload_plan.part_size, 20 * 1024 * 1024)
+        self.assertEqual(upload_plan.max_workers, 8)
+
+        upload_plan = plan_upload(1024 * 1024 * 1024, throughput=2 * 1024 * 1024, memory_budget=128 * 1024 * 1024)
+
+        self.assertEqual(upload_plan.part_size, 8 * 1024 * 1024)
+        self.assertEqual(upload_plan.max_workers, 8)
+
+    def test_plan_upload_keeps_concurrency_at_high_throughput(self):
+        for throughput in (5 * 1024 * 1024, 50 * 1024 * 1024):
+            for file_size in (1024 * 1024 * 1024, 20 * 1024 * 1024 * 1024):
+                upload_plan = plan_upload(file_size, throughput=throughput, memory_budget=128 * 1024 * 1024)
+
+                self.assertGreater(upload_plan.max_workers, 1)
+                self.assertLessEqual(2 * upload_plan.part_size * upload_plan.max_workers, 128 * 1024 * 1024)
+
+    def test_plan_upload_keeps_requested_workers(self):
+        upload_plan = plan_upload(100 * 1024 * 1024, target_part_size=MIN_PART_SIZE, max_workers=2)
+
+        self.assertEqual(upload_plan.part_size, MIN_PART_SIZE)
+        self.assertEqual(upload_plan.max_workers, 2)
+
+    @patch("os.stat")
+    def test_upload_resumes_with_part_size_of_upload_context(self, os_stat):
+        os_stat.return_value.st_size = 100 * 1024 * 1024
+        upload_context = UploadContext(UploadType.multipart.value, 'NL3OL1JB', 'upload_token', None,
+                                       part_size=8 * 1024 * 1024)
+        file = Mock()
+
+        upload_handler = JWPlatformClient().Media._get_upload_handler_for_upload_type(
+            upload_context, file, target_part_size=MIN_PART_SIZE)
+
+        self.assertEqual(upload_handler._target_part_size, 8 * 1024 * 1024)
+
+    @patch("jwplatform.upload._upload_to_s3")
+    @patch("jwplatform.upload.MultipartUpload._mark_upload_completion")
+    @patch("jwplatform.upload.MultipartUpload._retrieve_part_links")
+    def test_multipart_upload_sends_parts_through_scheduler(self, retrieve_part_links, mark_upload_completion,
+                                                            s3_upload_response):
+        target_part_size = 5 * 1024 * 1024
+        content = os.urandom(target_part_size + 1024)
+        retrieve_part_links.return_value = _get_parts_responses(2)
+        sent_parts = []
+
+        def upload_to_s3(body, upload_link, content_length=None, circuit_breaker=None):
+            data = b''.join(iter(lambda: bytes(body.read(UPLOAD_BLOCK_SIZE)), b''))
+            self.assertEqual(len(data), content_length)
+            sent_parts.append(data)
+            response = Mock()
+            response.headers = {'ETag': f'\"{md5(data).hexdigest()}\"'}
+            return response
+
+        s3_upload_response.side_effect = upload_to_s3
+        scheduler = UploadScheduler(max_bytes_per_second=1024 * 1024 * 1024)
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'video.mp4')
+            with open(file_path, 'wb') as file:
+                file.write(content)
+            with open(file_path, 'rb') as file:
+                upload_context = UploadContext(UploadType.multipart.value, 'NL3OL1JB', 'upload_token', None)
+                MultipartUpload(Mock(), file, target_part_size, 3, upload_context,
+                                bandwidth=scheduler.share(priority=2)).upload()
+        self.assertEqual(b''.join(sent_parts), content)
+        mark_upload_completion.assert_called_once()
+
+    @patch("jwplatform.upload._upload_to_s3")
+    @patch("jwplatform.upload.MultipartUpload._mark_upload_completion")
+    @patch("jwplatform.upload.MultipartUpload._retrieve_part_links")
+    def test_multipart_upload_reports_progress(self, retrieve_part_links, mark_upload_completion, s3_upload_response):
+        target_part_size = 5 * 1024 * 1024
+        content = os.urandom(2 * target_part_size + 1024)
+        parts = _get_parts_responses(3)
+        parts['parts'][0]['etag'] = md5(content[:target_part_size]).hexdigest()
+        retrieve_part_links.return_value = parts
+        attempts = []
+
+        def upload_to_s3(bytes_chunk, upload_link, circuit_breaker=None):
+            attempts.append(len(bytes_chunk))
+            if len(attempts) == 1:
+                raise OSError("Connection reset")
+            response = Mock()
+            response.headers = {'ETag': f'\"{md5(bytes_chunk).hexdigest()}\"'}
+            return response
+
+        s3_upload_response.side_effect = upload_to_s3
+        events = []
+
+        def progress_callback(event):
+            events.append((event.type, event.part_number, event.size))
+            if event.type == UploadEventType.part_started:
+                raise ValueError("A failing callback does not fail the upload")
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'video.mp4')
+            with open(file_path, 'wb') as file:
+                file.write(content)
+            with open(file_path, 'rb') as file:
+                upload_context = UploadContext(UploadType.multipart.value, 'NL3OL1JB', 'upload_token', None)
+                stats = MultipartUpload(Mock(), file, target_part_size, 3, upload_context,
+                                        progress_callback=progress_callback).upload()
+
+        self.assertEqual(events, [
+            (UploadEventType.part_started, 1, target_part_size),
+            (UploadEventType.part_skipped, 1, target_part_size),
+            (UploadEventType.part_started, 2, target_part_size),
+            (UploadEventType.part_retried, 2, target_part_size),
+            (UploadEventType.part_completed, 2, target_part_size),
+            (UploadEventType.part_started, 3, 1024),
+            (UploadEventType.part_completed, 3, 1024),
+            (UploadEventType.upload_completed, None, len(content)),
+        ])
+        self.assertEqual(stats.total_bytes, len(content))
+        self.assertEqual(stats.bytes_uploaded, target_part_size + 1024)
+        self.assertEqual(stats.bytes_skipped, target_part_size)
+        self.assertEqual((stats.parts_completed, stats.parts_skipped, stats.retries), (2, 1, 1))
+        self.assertEqual(len(stats.part_durations), 2)
+        self.assertEqual(stats.eta, 0.0)
+        self.assertIsNotNone(stats.finished)
+
+    @patch("jwplatform.upload._upload_to_s3")
+    def test_direct_upload_reports_progress(self, s3_upload_response):
+        content = os.urandom(1024)
+        s3_upload_response.return_value.headers = {'ETag': f'\"{md5(content).hexdigest()}\"'}
+        events = []
+        with tempfile.TemporaryFile() as file:
+            file.write(content)
+            file.seek(0)
+            upload_context = UploadContext(UploadType.direct.value, None, None, 'http://s3server/upload-link')
+            stats = SingleUpload('http://s3server/upload-link', file, 3, upload_context,
+                                 progress_callback=events.append).upload()
+
+        self.assertEqual([event.type for event in events], [UploadEventType.part_started,
+                                                            UploadEventType.part_completed,
+                                                            UploadEventType.upload_completed])
+        self.assertIs(events[-1].stats, stats)
+        self.assertEqual(stats.bytes_uploaded, len(content))
+        self.assertGreater(stats.throughput, 0)
+
+    @patch("jwplatform.upload._upload_to_s3")
+    def test_failed_upload_reports_only_retried_attempts(self, s3_upload_response):
+        s3_upload_response.side_effect = S3UploadError
+        events = []
+        with tempfile.TemporaryFile() as file:
+            file.write(os.urandom(1024))
+            file.seek(0)
+            upload_context = UploadContext(UploadType.direct.value, None, None, 'http://s3server/upload-link')
+            upload = SingleUpload('http://s3server/upload-link', file, 3, upload_context,
+                                  progress_callback=events.append)
+            with self.assertRaises(MaxRetriesExceededError):
+                upload.upload()
+
+        self.assertEqual(s3_upload_response.call_count, 3)
+        self.assertEqual([event.attempt for event in events if event.type == UploadEventType.part_retried], [1, 2])
+        self.assertEqual(upload.stats.retries, 2)